@@ -0,0 +1 @@
+"""Standalone benchmarks for the Agent API (run with ``python -m``)."""
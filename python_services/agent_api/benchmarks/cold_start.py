@@ -0,0 +1,136 @@
+"""Measure cold-start time: import profile, then time to first successful request.
+
+Usage (from ``python_services/``)::
+
+    python -m agent_api.benchmarks.cold_start --runs 3
+
+    # Scraper API: import profile and readiness only (scraping needs the network)
+    python -m agent_api.benchmarks.cold_start --app scraper_api.main:app --request-path ''
+
+Each run spawns a fresh ``uvicorn`` process (``LLM_PROVIDER=fake`` unless set
+otherwise) and records, from process start, when ``/health`` first answers,
+when ``/health/ready`` reports OK and when the first request succeeds. The
+import profile comes from ``python -X importtime`` and is grouped by
+top-level package.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Any
+
+import httpx
+
+from .load_test import default_payload
+
+
+def import_profile(module: str, top: int) -> dict[str, Any]:
+    """Cumulative import time of ``module`` and self time per top-level package."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    by_package: Counter[str] = Counter()
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if not self_us.isdigit():
+            continue
+        by_package[name.split(".")[0]] += int(self_us)
+        if name == module:
+            total_us = int(cumulative_us)
+    return {
+        "module": module,
+        "total_ms": round(total_us / 1000, 1),
+        "packages_ms": {name: round(us / 1000, 1) for name, us in by_package.most_common(top)},
+    }
+
+
+def cold_start(args: argparse.Namespace) -> dict[str, float | None]:
+    """Spawn one server process and time its way to the first successful request."""
+    port = _free_port()
+    env = {**os.environ, "LLM_PROVIDER": os.getenv("LLM_PROVIDER", "fake")}
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", args.app, "--port", str(port), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    marks: dict[str, float | None] = {"health_s": None, "ready_s": None, "first_request_s": None}
+    payload = json.loads(open(args.payload).read()) if args.payload else default_payload(0)
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=args.timeout) as client:
+            deadline = started + args.timeout
+            while time.perf_counter() < deadline and process.poll() is None:
+                if marks["health_s"] is None and _ok(client, "GET", "/health"):
+                    marks["health_s"] = time.perf_counter() - started
+                if marks["health_s"] is not None and marks["ready_s"] is None and _ok(client, "GET", "/health/ready"):
+                    marks["ready_s"] = time.perf_counter() - started
+                if marks["ready_s"] is not None:
+                    if not args.request_path or _ok(client, "POST", args.request_path, payload):
+                        if args.request_path:
+                            marks["first_request_s"] = time.perf_counter() - started
+                        break
+                time.sleep(0.02)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return {name: round(value, 3) if value is not None else None for name, value in marks.items()}
+
+
+def _ok(client: httpx.Client, method: str, path: str, payload: Any = None) -> bool:
+    try:
+        return client.request(method, path, json=payload).status_code == 200
+    except httpx.HTTPError:
+        return False
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default="agent_api.main:app", help="uvicorn app to start.")
+    parser.add_argument("--request-path", default="/agent/offer_analysis", help="POST endpoint of the first request ('' to skip).")
+    parser.add_argument("--payload", help="JSON file sent as the first request body (defaults to a sample offer).")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--top", type=int, default=8, help="Packages listed in the import profile.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args()
+
+    profile = import_profile(args.app.split(":")[0], args.top)
+    runs = [cold_start(args) for _ in range(args.runs)]
+    report = {"imports": profile, "runs": runs}
+    for mark in ("health_s", "ready_s", "first_request_s"):
+        values = [run[mark] for run in runs if run[mark] is not None]
+        report[f"median_{mark}"] = round(statistics.median(values), 3) if values else None
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"import {profile['module']}: {profile['total_ms']} ms")
+    for name, ms in profile["packages_ms"].items():
+        print(f"  {name:<24} {ms:>8.1f} ms")
+    for mark in ("health_s", "ready_s", "first_request_s"):
+        print(f"median {mark:<16} {report[f'median_{mark}']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Drive an Agent API endpoint at a fixed concurrency and report latency.
+
+Usage (from ``python_services/``)::
+
+    # In-process app with the fake LLM (no Anthropic quota used)
+    python -m agent_api.benchmarks.load_test --concurrency 32 --requests 500
+
+    # Against a running server (start it with LLM_PROVIDER=fake to stay offline)
+    python -m agent_api.benchmarks.load_test --url http://localhost:8001 --concurrency 32
+
+Reports throughput, p50/p95/p99 latency, status codes and event-loop lag.
+In-process runs share the event loop with the app, so the lag reflects time
+the server spends blocking the loop; against ``--url`` it only covers the
+load generator itself.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import statistics
+import time
+from collections import Counter
+from typing import Any
+
+import httpx
+
+LAG_INTERVAL_S = 0.01
+
+SAMPLE_DESCRIPTION = (
+    "Nous recherchons un développeur Ruby on Rails pour rejoindre une équipe produit de 8 personnes. "
+    "Stack : Rails 7, Hotwire, PostgreSQL, Redis, Sidekiq, Docker et AWS. Méthodes agiles, TDD, revue de code. "
+    "Vous participerez à la conception de nouvelles fonctionnalités et au mentorat des profils juniors."
+)
+
+
+def default_payload(index: int) -> dict[str, Any]:
+    return {
+        "job_offer": {
+            "id": index,
+            "title": "Développeur Ruby on Rails",
+            "company_name": "Acme",
+            "location": "Paris",
+            "description": f"{SAMPLE_DESCRIPTION} Référence {index}.",
+        }
+    }
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+async def monitor_loop_lag(samples: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL_S)
+        samples.append(max(0.0, time.perf_counter() - started - LAG_INTERVAL_S))
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float) -> None:
+    """Poll ``/health/ready`` so warm-up is not counted in the measured latencies."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        with contextlib.suppress(httpx.HTTPError):
+            if (await client.get("/health/ready")).status_code == 200:
+                return
+        await asyncio.sleep(0.05)
+    raise SystemExit(f"Agent API not ready after {timeout:.0f}s")
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+        lifespan: contextlib.AbstractAsyncContextManager = contextlib.nullcontext()
+    else:
+        os.environ.setdefault("LLM_PROVIDER", "fake")
+        from agent_api.main import app
+
+        # ASGITransport does not send lifespan events; run the warm-up ourselves.
+        lifespan = app.router.lifespan_context(app)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://agent", timeout=args.timeout)
+
+    template = json.loads(open(args.payload).read()) if args.payload else None
+    latencies: list[float] = []
+    statuses: Counter[str] = Counter()
+    lag: list[float] = []
+    counter = iter(range(args.requests))
+    stop = asyncio.Event()
+
+    async def worker() -> None:
+        for index in counter:
+            payload = template if template is not None else default_payload(index)
+            started = time.perf_counter()
+            try:
+                response = await client.post(args.path, json=payload)
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as exc:
+                statuses[type(exc).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+
+    async with lifespan, client:
+        await wait_until_ready(client, args.timeout)
+        lag_task = asyncio.create_task(monitor_loop_lag(lag, stop))
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await lag_task
+
+    return {
+        "requests": len(latencies),
+        "concurrency": args.concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 1),
+            "p95": round(percentile(latencies, 0.95) * 1000, 1),
+            "p99": round(percentile(latencies, 0.99) * 1000, 1),
+            "mean": round(statistics.fmean(latencies) * 1000, 1) if latencies else 0.0,
+        },
+        "loop_lag_ms": {
+            "p50": round(percentile(lag, 0.50) * 1000, 1),
+            "p99": round(percentile(lag, 0.99) * 1000, 1),
+            "max": round(max(lag, default=0.0) * 1000, 1),
+        },
+        "statuses": dict(statuses),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Base URL of a running Agent API; defaults to the in-process app.")
+    parser.add_argument("--path", default="/agent/offer_analysis")
+    parser.add_argument("--payload", help="JSON file sent as the request body (defaults to a sample offer).")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    latency, lag = report["latency_ms"], report["loop_lag_ms"]
+    print(f"requests     {report['requests']} @ concurrency {report['concurrency']} in {report['elapsed_s']}s")
+    print(f"throughput   {report['throughput_rps']} req/s")
+    print(f"latency ms   p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}  mean {latency['mean']}")
+    print(f"loop lag ms  p50 {lag['p50']}  p99 {lag['p99']}  max {lag['max']}")
+    print(f"statuses     {report['statuses']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+"""Map-reduce CV analysis: per-section notes merged into one ``Ai::CvAnalyzer`` payload.
+
+The CV is split on its section headings. Each section is analysed on its own
+(map, fast tier, bounded concurrency), then the section notes are merged by a
+single call on the large tier (reduce). A CV with a single section skips the
+map step and is analysed in one call.
+
+A section whose map call fails is left out of the merge and reported in
+``failed_sections``; when more than ``MAX_FAILED_SHARE`` of the sections fail
+the whole analysis fails instead of returning a result built from a few of
+them.
+
+Map and reduce results are cached in process by a hash of their input, so
+re-analysing a CV after editing one section costs one map call and the
+reduce call. With ``AGENT_SHARED_STATE_DB`` the cache is also shared by the
+workers of the host (see ``shared_state``).
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from textwrap import dedent
+
+from langchain_core.exceptions import OutputParserException
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel
+
+from ..schemas import CvAnalysisData, CvChunkInsight, ProfilePayload
+from .llm import build_chat_model, structured_output_enabled
+from .model_routing import FAST_TIER, LARGE_TIER, RoutingDecision, escalate, large_model_name, route_chunk
+from .shared_state import cached_model
+from .structured_output import build_structured_chain
+from .telemetry import track_llm_call
+
+logger = logging.getLogger(__name__)
+
+PROMPT_VERSION = "1"
+MIN_SECTION_CHARS = 150
+MAX_SECTION_CHARS = 4000
+MAX_SECTIONS = 16
+MAX_ITEMS = 5
+MAX_FAILED_SHARE = 0.5
+DEFAULT_CONCURRENCY = 4
+DEFAULT_CACHE_SIZE = 2048
+
+HEADING_KEYWORDS = (
+    "profil",
+    "résumé",
+    "summary",
+    "à propos",
+    "about",
+    "expérience",
+    "experience",
+    "parcours",
+    "formation",
+    "éducation",
+    "education",
+    "diplômes",
+    "compétences",
+    "skills",
+    "technologies",
+    "stack",
+    "projets",
+    "projects",
+    "réalisations",
+    "langues",
+    "languages",
+    "certifications",
+    "publications",
+    "bénévolat",
+    "centres d'intérêt",
+    "intérêts",
+    "hobbies",
+)
+
+MAP_SYSTEM_PROMPT = dedent(
+    """
+    Tu es un assistant spécialisé dans l'analyse de CV de développeurs. Tu reçois UNE section
+    d'un CV ; d'autres sections sont analysées séparément.
+
+    Tu dois impérativement respecter les instructions de format JSON suivantes :
+    {format_instructions}
+
+    Consignes :
+    - summary : une phrase sur ce que cette section apporte à la candidature.
+    - strengths, weaknesses, suggestions : 0 à 3 éléments chacun, propres à cette section.
+    - Chaque élément est une phrase courte, précise et orientée candidature technique.
+    - Liste vide plutôt que du contenu inventé. N'ajoute jamais de texte hors du JSON.
+    """
+)
+
+REDUCE_SYSTEM_PROMPT = dedent(
+    """
+    Tu es un assistant spécialisé dans l'analyse de CV de développeurs.
+
+    Tu dois impérativement respecter les instructions de format JSON suivantes :
+    {format_instructions}
+
+    Contenu attendu :
+    - summary : résumé concis en 2 à 3 phrases (en français) des points clés du CV
+    - strengths : liste (3 à 5 éléments) des forces principales
+    - weaknesses : liste (3 à 5 éléments) des axes d'amélioration
+    - suggestions : liste (3 à 5 recommandations actionnables) pour optimiser le CV
+    Chaque élément doit être une phrase courte, précise et orientée candidature technique.
+    Quand tu reçois des notes par section, fusionne les doublons et garde les points les plus
+    importants pour l'ensemble du CV. N'ajoute jamais de texte hors du JSON.
+    """
+)
+
+
+@dataclass(frozen=True)
+class CvSection:
+    """A heading and the text below it."""
+
+    title: str
+    text: str
+
+
+@dataclass(frozen=True)
+class CvAnalysisResult:
+    """Merged analysis, how much of it came from the cache and which sections are missing."""
+
+    data: CvAnalysisData
+    sections: int
+    cached_sections: int
+    failed_sections: tuple[str, ...] = ()
+
+
+class _ResultCache:
+    """Thread-safe LRU of parsed model outputs keyed by input hash."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: OrderedDict[str, BaseModel] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> BaseModel | None:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: BaseModel) -> None:
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+
+_CACHE = _ResultCache(int(os.getenv("CV_ANALYSIS_CACHE_SIZE") or DEFAULT_CACHE_SIZE))
+
+
+async def analyze_cv(content: str, profile: ProfilePayload | None = None) -> CvAnalysisResult:
+    """Analyse a CV section by section and merge the notes."""
+
+    sections = split_sections(content)
+    if not sections:
+        return CvAnalysisResult(CvAnalysisData(summary="Aucun contenu de CV à analyser."), 0, 0)
+
+    if len(sections) == 1:
+        data, cached = await _reduce(_full_cv_input(sections[0].text, profile))
+        return CvAnalysisResult(data, 1, int(cached))
+
+    semaphore = asyncio.Semaphore(_concurrency())
+    outcomes = await asyncio.gather(
+        *(_map_section(section, semaphore) for section in sections),
+        return_exceptions=True,
+    )
+
+    notes: list[tuple[CvSection, CvChunkInsight]] = []
+    failed: list[str] = []
+    cached_sections = 0
+    for section, outcome in zip(sections, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error("CV section %r could not be analysed: %s", section.title, outcome)
+            failed.append(section.title)
+            continue
+        insight, cached = outcome
+        notes.append((section, insight))
+        cached_sections += int(cached)
+    if not notes or len(failed) > len(sections) * MAX_FAILED_SHARE:
+        raise RuntimeError(f"{len(failed)} section(s) du CV sur {len(sections)} n'ont pas pu être analysées.")
+
+    try:
+        data, _ = await _reduce(_notes_input(notes, profile))
+    except OutputParserException:
+        logger.warning("CV analysis reduce step returned unusable output; merging section notes locally")
+        data = _merge_locally([insight for _, insight in notes])
+    return CvAnalysisResult(data, len(sections), cached_sections, tuple(failed))
+
+
+def split_sections(content: str) -> list[CvSection]:
+    """Split a CV on its headings, merging tiny sections and splitting huge ones."""
+
+    sections: list[CvSection] = []
+    title, lines = "Introduction", []
+    for line in (content or "").splitlines():
+        if _is_heading(line):
+            if "".join(lines).strip():
+                sections.append(CvSection(title, "\n".join(lines).strip()))
+            title, lines = line.strip(" #*:-\t"), []
+        else:
+            lines.append(line)
+    if "".join(lines).strip():
+        sections.append(CvSection(title, "\n".join(lines).strip()))
+
+    merged: list[CvSection] = []
+    for section in sections:
+        if merged and len(section.text) < MIN_SECTION_CHARS:
+            previous = merged.pop()
+            section = CvSection(previous.title, f"{previous.text}\n\n{section.title}\n{section.text}")
+        merged.extend(_split_long(section))
+    if len(merged) > 1 and len(merged[0].text) < MIN_SECTION_CHARS:
+        first, second = merged[0], merged[1]
+        merged[:2] = [CvSection(second.title, f"{first.text}\n\n{second.title}\n{second.text}")]
+
+    if len(merged) > MAX_SECTIONS:
+        tail = merged[MAX_SECTIONS - 1 :]
+        merged = merged[: MAX_SECTIONS - 1] + [
+            CvSection(tail[0].title, "\n\n".join(f"{section.title}\n{section.text}" for section in tail))
+        ]
+    return merged
+
+
+async def _map_section(section: CvSection, semaphore: asyncio.Semaphore) -> tuple[CvChunkInsight, bool]:
+    decision = route_chunk()
+    key = _cache_key("map", decision.model, section.title, section.text)
+    cached = _CACHE.get(key)
+    if cached is not None:
+        return cached, True
+
+    async def compute() -> CvChunkInsight:
+        analysis_input = f"Section du CV : {section.title}\n\n{section.text}"
+        async with semaphore:
+            try:
+                return await _invoke("cv_analysis_map", decision, _map_chain, _map_parser, analysis_input)
+            except OutputParserException:
+                if decision.tier != FAST_TIER:
+                    raise
+                return await _invoke("cv_analysis_map", escalate(decision), _map_chain, _map_parser, analysis_input)
+
+    insight, shared_hit = await cached_model(key, CvChunkInsight, compute)
+    _CACHE.put(key, insight)
+    return insight, shared_hit
+
+
+async def _reduce(analysis_input: str) -> tuple[CvAnalysisData, bool]:
+    decision = RoutingDecision(tier=LARGE_TIER, model=large_model_name(), reason="cv_reduce")
+    key = _cache_key("reduce", decision.model, analysis_input)
+    cached = _CACHE.get(key)
+    if cached is not None:
+        return cached, True
+
+    async def compute() -> CvAnalysisData:
+        data = await _invoke("cv_analysis_reduce", decision, _reduce_chain, _reduce_parser, analysis_input)
+        return CvAnalysisData(
+            summary=data.summary,
+            strengths=data.strengths[:MAX_ITEMS],
+            weaknesses=data.weaknesses[:MAX_ITEMS],
+            suggestions=data.suggestions[:MAX_ITEMS],
+        )
+
+    data, shared_hit = await cached_model(key, CvAnalysisData, compute)
+    _CACHE.put(key, data)
+    return data, shared_hit
+
+
+async def _invoke(operation: str, decision: RoutingDecision, chain_factory, parser_factory, analysis_input: str):
+    with track_llm_call(operation, tier=decision.tier) as telemetry:
+        return await chain_factory(decision.model).ainvoke(
+            {
+                "analysis_input": analysis_input,
+                "format_instructions": parser_factory().get_format_instructions(),
+            },
+            config={"callbacks": [telemetry]},
+        )
+
+
+def _full_cv_input(text: str, profile: ProfilePayload | None) -> str:
+    return "\n".join(["Analyse le CV suivant et remplis le schéma demandé.", *_profile_lines(profile), "", "CV:", text])
+
+
+def _notes_input(notes: list[tuple[CvSection, CvChunkInsight]], profile: ProfilePayload | None) -> str:
+    segments = ["Notes d'analyse par section du CV, à fusionner en une analyse globale.", *_profile_lines(profile)]
+    for section, insight in notes:
+        segments.append(f"\n## {section.title}")
+        if insight.summary:
+            segments.append(f"Résumé : {insight.summary}")
+        for label, items in (
+            ("Forces", insight.strengths),
+            ("Faiblesses", insight.weaknesses),
+            ("Suggestions", insight.suggestions),
+        ):
+            segments.extend(f"{label} : {item}" for item in items)
+    return "\n".join(segments)
+
+
+def _profile_lines(profile: ProfilePayload | None) -> list[str]:
+    if profile is None:
+        return []
+    lines = []
+    if profile.experience_level:
+        lines.append(f"Niveau d'expérience déclaré : {profile.experience_level}")
+    if profile.summary:
+        lines.append(f"Profil du candidat : {profile.summary}")
+    return lines
+
+
+def _merge_locally(insights: list[CvChunkInsight]) -> CvAnalysisData:
+    def merged(lists: list[list[str]]) -> list[str]:
+        seen: dict[str, str] = {}
+        for items in lists:
+            for item in items:
+                seen.setdefault(item.strip().lower(), item.strip())
+        return list(seen.values())[:MAX_ITEMS]
+
+    return CvAnalysisData(
+        summary=" ".join(insight.summary for insight in insights if insight.summary)[:600],
+        strengths=merged([insight.strengths for insight in insights]),
+        weaknesses=merged([insight.weaknesses for insight in insights]),
+        suggestions=merged([insight.suggestions for insight in insights]),
+    )
+
+
+def _is_heading(line: str) -> bool:
+    stripped = line.strip()
+    if not stripped or len(stripped) > 60 or stripped.endswith((".", ",", ";")):
+        return False
+    if stripped.startswith("#"):
+        return True
+    words = len(stripped.split())
+    letters = [char for char in stripped if char.isalpha()]
+    if letters and all(char.isupper() for char in letters) and words <= 5:
+        return True
+    normalized = stripped.strip(" #*:-\t").lower()
+    return words <= 5 and normalized.startswith(HEADING_KEYWORDS)
+
+
+def _split_long(section: CvSection) -> list[CvSection]:
+    if len(section.text) <= MAX_SECTION_CHARS:
+        return [section]
+
+    parts: list[str] = []
+    current = ""
+    for paragraph in re.split(r"\n\s*\n", section.text):
+        while len(paragraph) > MAX_SECTION_CHARS:
+            parts.append(paragraph[:MAX_SECTION_CHARS])
+            paragraph = paragraph[MAX_SECTION_CHARS:]
+        if current and len(current) + len(paragraph) + 2 > MAX_SECTION_CHARS:
+            parts.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        parts.append(current)
+    return [CvSection(f"{section.title} ({index}/{len(parts)})", part) for index, part in enumerate(parts, 1)]
+
+
+def _cache_key(*parts: str) -> str:
+    digest = hashlib.sha256(PROMPT_VERSION.encode("utf-8"))
+    for part in parts:
+        digest.update(b"\0" + part.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _concurrency() -> int:
+    try:
+        return max(1, int(os.getenv("CV_ANALYSIS_CONCURRENCY") or DEFAULT_CONCURRENCY))
+    except ValueError:
+        return DEFAULT_CONCURRENCY
+
+
+@lru_cache(maxsize=4)
+def _map_chain(model_name: str):
+    prompt = ChatPromptTemplate.from_messages([("system", MAP_SYSTEM_PROMPT), ("human", "{analysis_input}")])
+    return build_structured_chain(
+        prompt,
+        build_chat_model(model_name, max_tokens=500),
+        CvChunkInsight,
+        operation="cv_analysis_map",
+        native=structured_output_enabled(),
+    )
+
+
+@lru_cache(maxsize=4)
+def _reduce_chain(model_name: str):
+    prompt = ChatPromptTemplate.from_messages([("system", REDUCE_SYSTEM_PROMPT), ("human", "{analysis_input}")])
+    return build_structured_chain(
+        prompt,
+        build_chat_model(model_name, max_tokens=900),
+        CvAnalysisData,
+        operation="cv_analysis_reduce",
+        native=structured_output_enabled(),
+    )
+
+
+@lru_cache(maxsize=1)
+def _map_parser() -> PydanticOutputParser:
+    return PydanticOutputParser(pydantic_object=CvChunkInsight)
+
+
+@lru_cache(maxsize=1)
+def _reduce_parser() -> PydanticOutputParser:
+    return PydanticOutputParser(pydantic_object=CvAnalysisData)
@@ -0,0 +1,220 @@
+"""Deterministic stand-in for the Anthropic chat model, used for load tests.
+
+Enable it with ``LLM_PROVIDER=fake``. The fake reads the JSON schema that
+chains embed through ``{format_instructions}`` and answers with a JSON object
+matching it, after a configurable latency and token-by-token streaming. It
+can also inject provider errors and malformed replies at a given rate.
+
+Replies are deterministic for a given seed, prompt and call number, so two
+runs of the same load test see the same sequence of errors and payloads.
+
+Environment variables (all optional):
+
+- ``FAKE_LLM_LATENCY_MS`` (default ``800``): median time before the first token;
+- ``FAKE_LLM_LATENCY_DIST`` (``constant``, ``uniform`` or ``lognormal``, default
+  ``lognormal``) and ``FAKE_LLM_LATENCY_SPREAD`` (default ``0.4``: sigma for
+  lognormal, relative half-width for uniform);
+- ``FAKE_LLM_TOKEN_DELAY_MS`` (default ``5``): delay between streamed tokens;
+- ``FAKE_LLM_ERROR_RATE`` / ``FAKE_LLM_MALFORMED_RATE`` (default ``0``);
+- ``FAKE_LLM_SEED`` (default ``42``).
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterator
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import Field, PrivateAttr
+
+_SCHEMA_RE = re.compile(r"```\s*(\{.*?\})\s*```", re.DOTALL)
+_TOKEN_RE = re.compile(r"\s*\S{1,4}|\s+")
+
+MALFORMATIONS = ("fenced", "trailing_text", "truncated", "not_json")
+
+
+class FakeLLMError(RuntimeError):
+    """Injected provider failure (stands in for rate limits and overloads)."""
+
+
+@dataclass(frozen=True)
+class _Plan:
+    text: str
+    first_token_delay_s: float
+    error: bool
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model returning schema-shaped JSON after simulated latency."""
+
+    model: str = "fake-llm"
+    latency_ms: float = 800.0
+    latency_dist: str = "lognormal"
+    latency_spread: float = 0.4
+    token_delay_ms: float = 5.0
+    error_rate: float = 0.0
+    malformed_rate: float = 0.0
+    seed: int = 42
+    max_tokens: int | None = Field(default=None)
+
+    _calls: Counter = PrivateAttr(default_factory=Counter)
+    _calls_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @classmethod
+    def from_env(cls, model: str = "fake-llm", **kwargs: Any) -> "FakeChatModel":
+        return cls(
+            model=model,
+            latency_ms=float(os.getenv("FAKE_LLM_LATENCY_MS", "800")),
+            latency_dist=os.getenv("FAKE_LLM_LATENCY_DIST", "lognormal"),
+            latency_spread=float(os.getenv("FAKE_LLM_LATENCY_SPREAD", "0.4")),
+            token_delay_ms=float(os.getenv("FAKE_LLM_TOKEN_DELAY_MS", "5")),
+            error_rate=float(os.getenv("FAKE_LLM_ERROR_RATE", "0")),
+            malformed_rate=float(os.getenv("FAKE_LLM_MALFORMED_RATE", "0")),
+            seed=int(os.getenv("FAKE_LLM_SEED", "42")),
+            **kwargs,
+        )
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"model": self.model}
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        chunks = list(self._stream(messages, stop, run_manager, **kwargs))
+        return self._result(messages, "".join(chunk.text for chunk in chunks))
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        chunks = [chunk async for chunk in self._astream(messages, stop, run_manager, **kwargs)]
+        return self._result(messages, "".join(chunk.text for chunk in chunks))
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        plan = self._plan(messages)
+        time.sleep(plan.first_token_delay_s)
+        if plan.error:
+            raise FakeLLMError("Injected fake LLM failure (overloaded).")
+        for index, token in enumerate(_TOKEN_RE.findall(plan.text)):
+            if index:
+                time.sleep(self.token_delay_ms / 1000)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        plan = self._plan(messages)
+        await asyncio.sleep(plan.first_token_delay_s)
+        if plan.error:
+            raise FakeLLMError("Injected fake LLM failure (overloaded).")
+        for index, token in enumerate(_TOKEN_RE.findall(plan.text)):
+            if index:
+                await asyncio.sleep(self.token_delay_ms / 1000)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    def _result(self, messages: list[BaseMessage], text: str) -> ChatResult:
+        input_tokens = sum(len(str(message.content)) for message in messages) // 4
+        usage = {"input_tokens": input_tokens, "output_tokens": len(text) // 4, "total_tokens": input_tokens + len(text) // 4}
+        message = AIMessage(content=text, usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)], llm_output={"usage": usage, "model": self.model})
+
+    def _plan(self, messages: list[BaseMessage]) -> _Plan:
+        prompt = "\n".join(str(message.content) for message in messages)
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        with self._calls_lock:
+            self._calls[digest] += 1
+            call_number = self._calls[digest]
+        rng = random.Random(f"{self.seed}:{self.model}:{digest}:{call_number}")
+
+        text = json.dumps(_payload_for(prompt), ensure_ascii=False)
+        if rng.random() < self.malformed_rate:
+            text = _malform(text, rng.choice(MALFORMATIONS))
+
+        return _Plan(text=text, first_token_delay_s=self._latency(rng), error=rng.random() < self.error_rate)
+
+    def _latency(self, rng: random.Random) -> float:
+        median = max(self.latency_ms, 0.0) / 1000
+        if self.latency_dist == "constant" or median == 0:
+            return median
+        if self.latency_dist == "uniform":
+            return max(0.0, rng.uniform(median * (1 - self.latency_spread), median * (1 + self.latency_spread)))
+        return rng.lognormvariate(0.0, self.latency_spread) * median
+
+
+def _payload_for(prompt: str) -> dict[str, Any]:
+    """Build a JSON object matching the schema embedded in the prompt."""
+
+    properties: dict[str, Any] = {}
+    for candidate in _SCHEMA_RE.findall(prompt):
+        try:
+            schema = json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(schema, dict) and isinstance(schema.get("properties"), dict):
+            properties = schema["properties"]
+            break
+
+    if not properties:
+        return {"summary": "Réponse simulée par le faux modèle."}
+
+    payload: dict[str, Any] = {}
+    for name, spec in properties.items():
+        kind = spec.get("type") if isinstance(spec, dict) else None
+        if kind == "array":
+            payload[name] = [f"{name} simulé {index}" for index in range(1, 4)]
+        elif kind in ("integer", "number"):
+            payload[name] = 50
+        elif kind == "boolean":
+            payload[name] = True
+        else:
+            payload[name] = f"Valeur simulée pour {name}."
+    return payload
+
+
+def _malform(text: str, kind: str) -> str:
+    if kind == "fenced":
+        return f"Voici l'analyse demandée :\n```json\n{text}\n```"
+    if kind == "trailing_text":
+        return f"{text}\nN'hésitez pas si vous avez d'autres questions."
+    if kind == "truncated":
+        return text[: max(1, len(text) * 2 // 3)]
+    return "Je ne peux pas produire ce JSON pour le moment."
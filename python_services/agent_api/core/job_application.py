@@ -0,0 +1,327 @@
+"""Template-driven application letters: the model only writes the personalised slots.
+
+Templates are plain text with ``{{slot}}`` placeholders, optionally carrying an
+instruction: ``{{motivation: pourquoi cette entreprise, 2 phrases}}``.
+
+- Slots named after offer or candidate fields (``company``, ``job_title``,
+  ``location``, ``date``...) are filled locally.
+- Every other slot is personalised: all of them are written by the model in
+  one structured call whose schema has one string field per slot.
+
+A template is compiled once into fixed text and slots and cached by template
+id and content hash. The letter is then rendered locally, so the model only
+produces a few sentences instead of the whole letter.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from textwrap import dedent
+from typing import Any, AsyncIterator, Type
+
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel, ConfigDict, Field, create_model
+
+from ..schemas import JobApplicationRequest
+from .llm import build_chat_model, structured_output_enabled
+from .model_routing import LARGE_TIER, large_model_name
+from .structured_output import build_structured_chain, parse_with_repair
+from .telemetry import track_llm_call
+
+logger = logging.getLogger(__name__)
+
+MAX_COMPILED_TEMPLATES = 256
+SLOT_CONTEXT_CHARS = 160
+MAX_TOKENS_PER_SLOT = 200
+MAX_CV_CHARS = 3000
+MAX_DESCRIPTION_CHARS = 4000
+
+LOCAL_SLOTS = frozenset({"company", "entreprise", "job_title", "poste", "location", "date"})
+
+_SLOT_RE = re.compile(r"\{\{\s*([A-Za-z_][\w]*)\s*(?::\s*(.*?))?\s*\}\}", re.DOTALL)
+
+SYSTEM_PROMPT = dedent(
+    """
+    Tu rédiges des candidatures (lettres de motivation, e-mails) en français pour un candidat
+    développeur. Le modèle de lettre de l'utilisateur est déjà rédigé : tu complètes uniquement
+    les emplacements demandés, dans le ton et le registre du texte qui les entoure.
+
+    Tu dois impérativement respecter les instructions de format JSON suivantes :
+    {format_instructions}
+
+    Consignes :
+    - Chaque valeur est un texte prêt à insérer tel quel à l'emplacement, sans répéter le texte
+      qui l'entoure.
+    - Appuie-toi sur l'offre et le CV ; n'invente ni expérience ni compétence.
+    - N'ajoute jamais de texte en dehors du JSON demandé.
+    """
+)
+
+
+@dataclass(frozen=True)
+class Slot:
+    """A named placeholder in a template."""
+
+    name: str
+    instruction: str | None
+    before: str
+    after: str
+
+    @property
+    def local(self) -> bool:
+        return self.name.lower() in LOCAL_SLOTS
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """Template split into fixed text and slots; ``parts`` alternates text and slot names."""
+
+    key: tuple[str, str]
+    parts: tuple[str, ...]
+    slots: tuple[Slot, ...]
+
+    @property
+    def personalized_slots(self) -> tuple[Slot, ...]:
+        return tuple(slot for slot in self.slots if not slot.local)
+
+    def render(self, values: dict[str, str]) -> str:
+        rendered = []
+        for index, part in enumerate(self.parts):
+            rendered.append(values.get(part, "") if index % 2 else part)
+        return "".join(rendered)
+
+
+@dataclass(frozen=True)
+class GeneratedApplication:
+    """Rendered letter, slot values and generation statistics."""
+
+    content: str
+    slots: dict[str, str]
+    personalized_slots: int
+    generated_chars: int
+    template_cached: bool
+
+
+_COMPILED: dict[tuple[str, str], CompiledTemplate] = {}
+_COMPILED_LOCK = threading.Lock()
+
+
+def compile_template(template_id: int | str | None, body: str) -> tuple[CompiledTemplate, bool]:
+    """Return the compiled template and whether it came from the cache."""
+
+    key = (str(template_id) if template_id is not None else "inline", hashlib.sha256(body.encode("utf-8")).hexdigest())
+    with _COMPILED_LOCK:
+        compiled = _COMPILED.get(key)
+    if compiled is not None:
+        return compiled, True
+
+    parts: list[str] = []
+    slots: dict[str, Slot] = {}
+    cursor = 0
+    for match in _SLOT_RE.finditer(body):
+        name = match.group(1)
+        parts.extend([body[cursor : match.start()], name])
+        if name not in slots:
+            slots[name] = Slot(
+                name=name,
+                instruction=(match.group(2) or "").strip() or None,
+                before=body[max(0, match.start() - SLOT_CONTEXT_CHARS) : match.start()],
+                after=body[match.end() : match.end() + SLOT_CONTEXT_CHARS],
+            )
+        cursor = match.end()
+    parts.append(body[cursor:])
+
+    compiled = CompiledTemplate(key=key, parts=tuple(parts), slots=tuple(slots.values()))
+    with _COMPILED_LOCK:
+        if len(_COMPILED) >= MAX_COMPILED_TEMPLATES:
+            _COMPILED.pop(next(iter(_COMPILED)))
+        _COMPILED[key] = compiled
+    return compiled, False
+
+
+def local_values(compiled: CompiledTemplate, payload: JobApplicationRequest) -> dict[str, str]:
+    job = payload.job_offer
+    known = {
+        "company": job.company_name,
+        "entreprise": job.company_name,
+        "job_title": job.title,
+        "poste": job.title,
+        "location": job.location,
+        "date": date.today().strftime("%d/%m/%Y"),
+    }
+    return {slot.name: known.get(slot.name.lower()) or "" for slot in compiled.slots if slot.local}
+
+
+async def generate_application(payload: JobApplicationRequest) -> GeneratedApplication:
+    """Fill the personalised slots in one structured call and render the letter."""
+
+    compiled, cached = compile_template(payload.template.id, payload.template.body or "")
+    values = local_values(compiled, payload)
+    personalized = compiled.personalized_slots
+    if personalized:
+        with track_llm_call("job_application", tier=LARGE_TIER) as telemetry:
+            result = await _slot_chain(compiled, large_model_name()).ainvoke(
+                {
+                    "generation_input": _build_user_message(payload, personalized),
+                    "format_instructions": _slot_parser(compiled).get_format_instructions(),
+                },
+                config={"callbacks": [telemetry]},
+            )
+        values.update(_clean(result.model_dump(by_alias=True), personalized))
+
+    return GeneratedApplication(
+        content=compiled.render(values),
+        slots=values,
+        personalized_slots=len(personalized),
+        generated_chars=sum(len(values[slot.name]) for slot in personalized),
+        template_cached=cached,
+    )
+
+
+async def stream_application(payload: JobApplicationRequest) -> AsyncIterator[dict[str, Any]]:
+    """Yield ``slot`` events as each personalised value completes, then ``done``.
+
+    Streaming parses the model's JSON text as it arrives, so it always uses
+    the text (non tool-call) mode of the chain.
+    """
+
+    started = time.perf_counter()
+    compiled, cached = compile_template(payload.template.id, payload.template.body or "")
+    values = local_values(compiled, payload)
+    for name, value in values.items():
+        yield {"event": "slot", "name": name, "text": value, "local": True}
+
+    personalized = compiled.personalized_slots
+    if personalized:
+        names = {slot.name for slot in personalized}
+        buffer = ""
+        emitted: set[str] = set()
+        llm = build_chat_model(large_model_name(), max_tokens=_max_tokens(personalized))
+        messages = _prompt().format_messages(
+            generation_input=_build_user_message(payload, personalized),
+            format_instructions=_slot_parser(compiled).get_format_instructions(),
+        )
+        with track_llm_call("job_application", tier=LARGE_TIER) as telemetry:
+            async for chunk in llm.astream(messages, config={"callbacks": [telemetry]}):
+                content = chunk.content
+                buffer += content if isinstance(content, str) else "".join(
+                    part.get("text", "") for part in content if isinstance(part, dict)
+                )
+                for name, text in _completed_values(buffer, names - emitted):
+                    emitted.add(name)
+                    yield {"event": "slot", "name": name, "text": text.strip(), "local": False}
+
+        parsed = parse_with_repair(buffer, _slot_schema(compiled), operation="job_application")
+        final = _clean(parsed.model_dump(by_alias=True), personalized)
+        for slot in personalized:
+            if slot.name not in emitted:
+                yield {"event": "slot", "name": slot.name, "text": final[slot.name], "local": False}
+        values.update(final)
+
+    yield {
+        "event": "done",
+        "content": compiled.render(values),
+        "personalized_slots": len(personalized),
+        "template_cached": cached,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def _completed_values(buffer: str, pending: set[str]) -> list[tuple[str, str]]:
+    completed = []
+    for name in pending:
+        match = re.search(rf'"{re.escape(name)}"\s*:\s*"((?:[^"\\]|\\.)*)"', buffer)
+        if match:
+            completed.append((name, json.loads(f'"{match.group(1)}"', strict=False)))
+    return completed
+
+
+def _clean(raw: dict[str, Any], slots: tuple[Slot, ...]) -> dict[str, str]:
+    return {slot.name: str(raw.get(slot.name) or "").strip() for slot in slots}
+
+
+def _build_user_message(payload: JobApplicationRequest, slots: tuple[Slot, ...]) -> str:
+    job = payload.job_offer
+    segments = ["Offre visée :"]
+    if job.title:
+        segments.append(f"Titre du poste : {job.title}")
+    if job.company_name:
+        segments.append(f"Entreprise : {job.company_name}")
+    if job.location:
+        segments.append(f"Localisation : {job.location}")
+    if job.description:
+        segments.append(f"Description :\n{job.description.strip()[:MAX_DESCRIPTION_CHARS]}")
+
+    if payload.profile and (payload.profile.summary or payload.profile.experience_level):
+        segments.append("Profil du candidat :")
+        if payload.profile.summary:
+            segments.append(payload.profile.summary)
+        if payload.profile.experience_level:
+            segments.append(f"Niveau d'expérience : {payload.profile.experience_level}")
+    if payload.cv and payload.cv.content:
+        segments.append(f"CV du candidat :\n{payload.cv.content.strip()[:MAX_CV_CHARS]}")
+
+    segments.append("\nEmplacements à compléter dans le modèle :")
+    for slot in slots:
+        segments.append(f"\n- {slot.name}" + (f" (consigne : {slot.instruction})" if slot.instruction else ""))
+        segments.append(f"  Texte avant : «{_local_context(slot.before)}»")
+        segments.append(f"  Texte après : «{_local_context(slot.after)}»")
+    return "\n".join(segments)
+
+
+def _local_context(text: str) -> str:
+    """Surrounding template text with other placeholders shown by name."""
+
+    return _SLOT_RE.sub(lambda match: f"[{match.group(1)}]", text).strip()
+
+
+def _max_tokens(slots: tuple[Slot, ...]) -> int:
+    return MAX_TOKENS_PER_SLOT * len(slots) + 50
+
+
+def _prompt() -> ChatPromptTemplate:
+    return ChatPromptTemplate.from_messages([("system", SYSTEM_PROMPT), ("human", "{generation_input}")])
+
+
+@lru_cache(maxsize=MAX_COMPILED_TEMPLATES)
+def _slot_schema(compiled: CompiledTemplate) -> Type[BaseModel]:
+    """One string field per personalised slot.
+
+    Slot names come from the user's template and may clash with what Pydantic
+    allows as field names (``_private``, ``model_config``...): fields get
+    positional names and the slot name is their alias, which is what the model
+    sees and returns.
+    """
+
+    fields = {
+        f"slot_{index}": (
+            str,
+            Field(default="", alias=slot.name, description=slot.instruction or f"Texte personnalisé pour {slot.name}"),
+        )
+        for index, slot in enumerate(compiled.personalized_slots)
+    }
+    return create_model("ApplicationSlots", __config__=ConfigDict(populate_by_name=True), **fields)
+
+
+@lru_cache(maxsize=MAX_COMPILED_TEMPLATES)
+def _slot_parser(compiled: CompiledTemplate) -> PydanticOutputParser:
+    return PydanticOutputParser(pydantic_object=_slot_schema(compiled))
+
+
+@lru_cache(maxsize=MAX_COMPILED_TEMPLATES)
+def _slot_chain(compiled: CompiledTemplate, model_name: str):
+    return build_structured_chain(
+        _prompt(),
+        build_chat_model(model_name, max_tokens=_max_tokens(compiled.personalized_slots)),
+        _slot_schema(compiled),
+        operation="job_application",
+        native=structured_output_enabled(),
+    )
@@ -0,0 +1,224 @@
+"""Curated technology and skill lexicon used by the local term extractor.
+
+Each entry maps a canonical label (as it should appear in ``tech_stack`` or
+``keywords``) to the aliases found in job descriptions. Aliases are matched
+case-insensitively on word boundaries unless the entry is flagged
+``case_sensitive`` (used for short, ambiguous names such as ``Go``).
+
+Plain words that also have a non-technical meaning ("node", "spring",
+"remote", "performance"...) are only listed in a qualified form
+("spring boot", "full remote", "optimisation des performances"); entries whose
+canonical label is such a word set ``match_canonical=False`` so the label
+itself is never matched. Technology names that are also common words ("Go",
+"Swift", "Spark", "Phoenix") are listed in ``contextual``: they only count
+when another technology is mentioned next to them ("Go, Kubernetes"), while
+their qualified forms ("golang", "apache spark") always count.
+
+Bump ``LEXICON_VERSION`` whenever entries are added, removed or renamed so
+downstream consumers can tell which vocabulary produced a result.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+LEXICON_VERSION = "2026.10.3"
+
+TECH = "tech"
+KEYWORD = "keyword"
+
+
+@dataclass(frozen=True)
+class LexiconEntry:
+    """A canonical term and the surface forms that should resolve to it."""
+
+    canonical: str
+    category: str
+    aliases: tuple[str, ...] = field(default_factory=tuple)
+    case_sensitive: bool = False
+    match_canonical: bool = True
+    contextual: tuple[str, ...] = ()
+
+    def surface_forms(self) -> tuple[str, ...]:
+        return (self.canonical, *self.aliases) if self.match_canonical else self.aliases
+
+
+def _tech(
+    canonical: str,
+    *aliases: str,
+    case_sensitive: bool = False,
+    contextual: tuple[str, ...] = (),
+) -> LexiconEntry:
+    return LexiconEntry(canonical, TECH, aliases, case_sensitive, contextual=contextual)
+
+
+def _keyword(canonical: str, *aliases: str, match_canonical: bool = True) -> LexiconEntry:
+    return LexiconEntry(canonical, KEYWORD, aliases, match_canonical=match_canonical)
+
+
+ENTRIES: tuple[LexiconEntry, ...] = (
+    # Languages
+    _tech("Ruby"),
+    _tech("Python", "python3"),
+    _tech("JavaScript", "javascript", "ecmascript", "es6"),
+    _tech("TypeScript"),
+    _tech("Java"),
+    _tech("Kotlin"),
+    _tech("Scala"),
+    _tech("Go", "Golang", "golang", case_sensitive=True, contextual=("Go",)),
+    _tech("Rust"),
+    _tech("C#", "csharp", "c sharp"),
+    _tech("C++", "cpp"),
+    _tech("PHP"),
+    _tech("Elixir"),
+    _tech("Swift", "swiftui", contextual=("Swift",)),
+    _tech("Dart"),
+    _tech("SQL"),
+    _tech("Bash", "shell scripting"),
+    # Web frameworks and runtimes
+    _tech(
+        "Ruby on Rails",
+        "RoR",
+        "ruby-on-rails",
+        "ruby/rails",
+        "ruby / rails",
+        "rails 6",
+        "rails 7",
+        "rails 8",
+    ),
+    _tech("Hotwire", "turbo-rails", "turbo frames", "turbo streams", "stimulus.js", "StimulusJS"),
+    _tech("Sidekiq"),
+    _tech("Django"),
+    _tech("Flask"),
+    _tech("FastAPI"),
+    _tech("Node.js", "nodejs", "node js"),
+    _tech("Express.js", "expressjs"),
+    _tech("NestJS", "nest.js"),
+    _tech("React", "react.js", "reactjs"),
+    _tech("React Native"),
+    _tech("Next.js", "nextjs"),
+    _tech("Vue.js", "vue", "vuejs"),
+    _tech("Nuxt", "nuxt.js", "nuxtjs"),
+    _tech("Angular", "angularjs"),
+    _tech("Svelte", "sveltekit"),
+    _tech("Spring Boot", "springboot", "spring framework", "spring mvc"),
+    _tech(".NET", "dotnet", "asp.net", ".net core"),
+    _tech("Laravel"),
+    _tech("Symfony"),
+    _tech("Phoenix", "phoenix framework", "phoenix liveview", contextual=("Phoenix",)),
+    _tech("Flutter"),
+    _tech("GraphQL"),
+    _tech("gRPC"),
+    _tech("Tailwind CSS", "tailwind", "tailwindcss"),
+    _tech("HTML", "html5"),
+    _tech("CSS", "css3", "sass", "scss"),
+    # Data stores and messaging
+    _tech("PostgreSQL", "postgres", "postgre", "psql"),
+    _tech("MySQL"),
+    _tech("MariaDB"),
+    _tech("SQLite"),
+    _tech("MongoDB", "mongo"),
+    _tech("Redis"),
+    _tech("Elasticsearch", "elastic search", "opensearch"),
+    _tech("Cassandra"),
+    _tech("DynamoDB"),
+    _tech("Kafka", "apache kafka"),
+    _tech("RabbitMQ"),
+    _tech("Snowflake"),
+    _tech("BigQuery"),
+    _tech("dbt"),
+    _tech("Airflow", "apache airflow"),
+    _tech("Spark", "apache spark", "pyspark", contextual=("Spark",)),
+    # Cloud and infrastructure
+    _tech("AWS", "amazon web services"),
+    _tech("GCP", "google cloud", "google cloud platform"),
+    _tech("Azure", "microsoft azure"),
+    _tech("Docker"),
+    _tech("Kubernetes", "k8s"),
+    _tech("Helm"),
+    _tech("Terraform"),
+    _tech("Ansible"),
+    _tech("Linux"),
+    _tech("Nginx"),
+    _tech("Heroku"),
+    _tech("Kamal"),
+    _tech("Datadog"),
+    _tech("Prometheus"),
+    _tech("Grafana"),
+    _tech("Sentry"),
+    # Tooling and testing
+    _tech("Git"),
+    _tech("GitHub Actions", "github actions"),
+    _tech("GitLab CI", "gitlab-ci", "gitlab ci/cd"),
+    _tech("Jenkins"),
+    _tech("CircleCI"),
+    _tech("RSpec"),
+    _tech("Minitest"),
+    _tech("Jest"),
+    _tech("Cypress"),
+    _tech("Playwright"),
+    _tech("Pytest"),
+    _tech("Selenium"),
+    # Data science and AI
+    _tech("Pandas"),
+    _tech("NumPy"),
+    _tech("scikit-learn", "sklearn"),
+    _tech("TensorFlow"),
+    _tech("PyTorch"),
+    _tech("LangChain"),
+    _tech("OpenAI", "openai api"),
+    # Methods, practices and domains
+    _keyword("Agile", "agilité", "méthodes agiles", "méthodologie agile"),
+    _keyword("Scrum"),
+    _keyword("Kanban"),
+    _keyword("TDD", "test driven development", "test-driven development"),
+    _keyword("BDD", "behavior driven development"),
+    _keyword("DDD", "domain driven design", "domain-driven design"),
+    _keyword("CI/CD", "ci / cd", "intégration continue", "continuous integration", "déploiement continu"),
+    _keyword("DevOps"),
+    _keyword("Microservices", "micro-services", "microservice"),
+    _keyword("API REST", "rest api", "restful", "api restful", "apis rest"),
+    _keyword("Clean Code", "code propre"),
+    _keyword("Code review", "revue de code", "revues de code", "code reviews"),
+    _keyword("Pair programming", "pair-programming", "programmation en binôme"),
+    _keyword("Architecture logicielle", "software architecture"),
+    _keyword("Tests automatisés", "automated testing", "tests unitaires", "unit tests"),
+    _keyword(
+        "Performance",
+        "optimisation des performances",
+        "performance optimization",
+        "performance tuning",
+        "web performance",
+        match_canonical=False,
+    ),
+    _keyword("Sécurité", "security", "cybersécurité"),
+    _keyword("Scalabilité", "scalability", "scalable"),
+    _keyword("Observabilité", "observability", "monitoring"),
+    _keyword("Cloud", "cloud computing"),
+    _keyword("Machine Learning", "apprentissage automatique", "ml engineer", "mlops"),
+    _keyword("Data Engineering", "data engineer", "ingénierie des données"),
+    _keyword("IA générative", "generative ai", "genai", "llm", "llms"),
+    _keyword("SaaS"),
+    _keyword("B2B"),
+    _keyword("B2C"),
+    _keyword("Fintech"),
+    _keyword("E-commerce", "ecommerce"),
+    _keyword("Startup", "start-up"),
+    _keyword("Scale-up", "scaleup"),
+    _keyword("Mentorat", "mentoring"),
+    _keyword("Leadership technique", "tech lead", "technical leadership", "lead technique"),
+    _keyword("Product mindset", "sens produit", "culture produit"),
+    _keyword("Télétravail", "full remote", "fully remote", "remote-first", "remote friendly", "teletravail", "hybride"),
+    _keyword("Anglais", "english", "anglais courant", "fluent english"),
+    _keyword("Autonomie", "autonome"),
+    _keyword("Esprit d'équipe", "travail en équipe", "teamwork"),
+    _keyword(
+        "Communication",
+        "communication skills",
+        "compétences en communication",
+        "qualités de communication",
+        "aisance relationnelle",
+        match_canonical=False,
+    ),
+    _keyword("Open source", "open-source"),
+    _keyword("Accessibilité", "accessibility", "a11y"),
+)
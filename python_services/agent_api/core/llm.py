@@ -0,0 +1,42 @@
+"""Chat model factory shared by the Agent API chains."""
+from __future__ import annotations
+
+import os
+
+from langchain_core.language_models import BaseChatModel
+
+
+def build_chat_model(model_name: str, *, max_tokens: int, temperature: float = 0.2) -> BaseChatModel:
+    """Return the chat model configured by ``LLM_PROVIDER`` (``anthropic`` or ``fake``).
+
+    Provider SDKs are imported here rather than at module level: the Anthropic
+    SDK alone accounts for over half of the service's import time, and the
+    lifespan warm-up builds the chains before the service reports ready.
+    """
+
+    if llm_provider() == "fake":
+        from .fake_llm import FakeChatModel
+
+        return FakeChatModel.from_env(model=model_name, max_tokens=max_tokens)
+
+    if not os.getenv("ANTHROPIC_API_KEY"):
+        raise RuntimeError("ANTHROPIC_API_KEY manquant pour l'analyse via Agent API.")
+
+    from langchain_anthropic import ChatAnthropic
+
+    return ChatAnthropic(
+        model=model_name,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        streaming=True,
+    )
+
+
+def llm_provider() -> str:
+    return os.getenv("LLM_PROVIDER", "anthropic").strip().lower() or "anthropic"
+
+
+def structured_output_enabled() -> bool:
+    """Whether chains use the provider's native structured output (``LLM_STRUCTURED_OUTPUT``)."""
+
+    return os.getenv("LLM_STRUCTURED_OUTPUT", "true").lower() not in {"0", "false", "no", "off"}
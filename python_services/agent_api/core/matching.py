@@ -0,0 +1,183 @@
+"""Vectorized CV-to-offer match scoring (BM25 + lexicon skill coverage).
+
+Scoring a CV against thousands of offers is done without any LLM call:
+
+- the CV's distinct terms form the query vocabulary, and every offer becomes
+  one row of a term-frequency matrix over that vocabulary, so BM25 for all
+  offers is a handful of NumPy array operations (terms are 64-bit hashes
+  looked up in the sorted CV hashes: no global vocabulary);
+- lexicon technologies (see ``term_extraction``) form a shared skill
+  vocabulary; a boolean offer × skill matrix against the CV's skill vector
+  gives matched/missing skills and coverage in a couple of array operations.
+
+Per-offer features are cached by content, so re-ranking a user's offer list
+after a CV edit only re-tokenizes the CV.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+
+from .term_extraction import extract_terms
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+SKILL_WEIGHT = 0.6
+MAX_SKILLS_PER_TEXT = 50
+
+_TOKEN_RE = re.compile(r"[\w+#]+(?:\.[\w]+)*")
+STOPWORDS = frozenset(
+    """
+    a au aux avec ce ces dans de des du elle en et eux il je la le les leur lui ma mais me même mes moi mon
+    ne nos notre nous on ou par pas pour qu que qui sa se ses son sur ta te tes toi ton tu un une vos votre
+    vous c d j l m n s t y été être avoir est sont plus très tout tous toute toutes afin chez ainsi
+    the and or of to in for on with at by from as an is are be this that you your we our will have has
+    """.split()
+)
+
+
+@dataclass(frozen=True)
+class OfferText:
+    """Minimal view of an offer used for scoring."""
+
+    id: int | None
+    text: str
+
+
+@dataclass(frozen=True)
+class MatchResult:
+    """Score of one offer against the CV, between 0 and 100."""
+
+    id: int | None
+    score: float
+    text_score: float
+    skill_coverage: float | None
+    matched_skills: list[str]
+    missing_skills: list[str]
+
+
+@dataclass(frozen=True)
+class _Features:
+    term_ids: np.ndarray
+    term_counts: np.ndarray
+    length: int
+    skills: tuple[str, ...]
+
+
+def score_offers(cv_text: str, offers: Sequence[OfferText]) -> list[MatchResult]:
+    """Rank ``offers`` against ``cv_text``, best match first."""
+
+    if not offers:
+        return []
+
+    cv = _features(cv_text or "")
+    features = [_features(offer.text or "") for offer in offers]
+
+    text_scores = _bm25_scores(cv, features)
+    skill_vocab, offer_skills, cv_skills = _skill_matrices(cv, features)
+
+    required = offer_skills.sum(axis=1)
+    matched_matrix = offer_skills & cv_skills
+    matched_counts = matched_matrix.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        coverage = np.where(required > 0, matched_counts / np.maximum(required, 1), np.nan)
+
+    combined = np.where(
+        np.isnan(coverage),
+        text_scores,
+        SKILL_WEIGHT * np.nan_to_num(coverage) + (1 - SKILL_WEIGHT) * text_scores,
+    )
+    order = np.argsort(-combined, kind="stable")
+
+    results = []
+    for index in order:
+        row_skills = features[index].skills
+        matched = [skill for skill in row_skills if cv_skills[skill_vocab[skill]]]
+        missing = [skill for skill in row_skills if not cv_skills[skill_vocab[skill]]]
+        results.append(
+            MatchResult(
+                id=offers[index].id,
+                score=round(float(combined[index]) * 100, 1),
+                text_score=round(float(text_scores[index]), 4),
+                skill_coverage=None if np.isnan(coverage[index]) else round(float(coverage[index]), 4),
+                matched_skills=matched,
+                missing_skills=missing,
+            )
+        )
+    return results
+
+
+def _bm25_scores(cv: _Features, features: list[_Features]) -> np.ndarray:
+    """BM25 of the CV terms against every offer, scaled to [0, 1] by the best offer."""
+
+    if not len(cv.term_ids):
+        return np.zeros(len(features), dtype=np.float32)
+
+    ids = np.concatenate([offer.term_ids for offer in features])
+    counts = np.concatenate([offer.term_counts for offer in features])
+    rows = np.repeat(np.arange(len(features)), [len(offer.term_ids) for offer in features])
+    columns = _columns(cv.term_ids, ids)
+    present = columns >= 0
+
+    tf = np.zeros((len(features), len(cv.term_ids)), dtype=np.float32)
+    tf[rows[present], columns[present]] = counts[present]
+
+    lengths = np.fromiter((offer.length for offer in features), dtype=np.float32, count=len(features))
+    average_length = max(float(lengths.mean()), 1.0)
+    document_frequency = (tf > 0).sum(axis=0)
+    total = len(features)
+    idf = np.log1p((total - document_frequency + 0.5) / (document_frequency + 0.5)).astype(np.float32)
+
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / average_length)
+    scores = (tf * (BM25_K1 + 1) / (tf + norm[:, None])) @ idf
+
+    best = float(scores.max())
+    return scores / best if best > 0 else scores
+
+
+def _columns(vocabulary: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """Index of each of ``ids`` in ``vocabulary``, or -1."""
+
+    order = np.argsort(vocabulary)
+    positions = np.minimum(np.searchsorted(vocabulary[order], ids), len(vocabulary) - 1)
+    return np.where(vocabulary[order][positions] == ids, order[positions], -1)
+
+
+def _skill_matrices(cv: _Features, features: list[_Features]) -> tuple[dict[str, int], np.ndarray, np.ndarray]:
+    vocabulary: dict[str, int] = {}
+    for skills in [cv.skills, *(offer.skills for offer in features)]:
+        for skill in skills:
+            vocabulary.setdefault(skill, len(vocabulary))
+
+    offer_skills = np.zeros((len(features), len(vocabulary)), dtype=bool)
+    for row, offer in enumerate(features):
+        offer_skills[row, [vocabulary[skill] for skill in offer.skills]] = True
+
+    cv_skills = np.zeros(len(vocabulary), dtype=bool)
+    cv_skills[[vocabulary[skill] for skill in cv.skills]] = True
+    return vocabulary, offer_skills, cv_skills
+
+
+@lru_cache(maxsize=10_000)
+def _features(text: str) -> _Features:
+    tokens = [token for token in _TOKEN_RE.findall(text.lower()) if len(token) > 1 and token not in STOPWORDS]
+    counts = Counter(tokens)
+    skills = tuple(extract_terms(text, limit=MAX_SKILLS_PER_TEXT).tech_stack)
+    return _Features(
+        term_ids=np.fromiter((_term_hash(term) for term in counts), dtype=np.int64, count=len(counts)),
+        term_counts=np.fromiter(counts.values(), dtype=np.float32, count=len(counts)),
+        length=len(tokens),
+        skills=skills,
+    )
+
+
+def _term_hash(term: str) -> int:
+    """Stable 64-bit id of a term; collisions are negligible at CV/offer vocabulary sizes."""
+
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little", signed=True)
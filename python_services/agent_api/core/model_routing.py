@@ -0,0 +1,116 @@
+"""Route offers to a fast or a large model depending on their complexity."""
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+from prometheus_client import Counter
+
+from .term_extraction import ExtractedTerms
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "claude-3-5-sonnet-20241022"
+DEFAULT_FAST_MODEL = "claude-3-5-haiku-20241022"
+DEFAULT_FAST_MAX_CHARS = 2500
+DEFAULT_FAST_MAX_TECH_TERMS = 8
+
+FAST_TIER = "fast"
+LARGE_TIER = "large"
+
+ROUTING_DECISIONS = Counter(
+    "agent_llm_routing_decisions_total",
+    "Model tier chosen for each offer analysis.",
+    ["tier", "reason"],
+)
+ROUTING_ESCALATIONS = Counter(
+    "agent_llm_routing_escalations_total",
+    "Fast-tier replies that failed parsing and were re-run on the large tier.",
+    ["from_model", "to_model"],
+)
+
+
+@dataclass(frozen=True)
+class RoutingDecision:
+    """Model selected for a call and why."""
+
+    tier: str
+    model: str
+    reason: str
+
+
+def route_offer(description: str, terms: ExtractedTerms) -> RoutingDecision:
+    """Pick the model tier for an offer and record the decision."""
+
+    decision = _decide(description, terms)
+    ROUTING_DECISIONS.labels(tier=decision.tier, reason=decision.reason).inc()
+    logger.info(
+        "Offer routed to %s tier (%s, model=%s, chars=%s, tech_terms=%s)",
+        decision.tier,
+        decision.reason,
+        decision.model,
+        len(description),
+        len(terms.tech_stack),
+    )
+    return decision
+
+
+def escalate(decision: RoutingDecision) -> RoutingDecision:
+    """Return the large-tier decision used after a fast-tier parsing failure."""
+
+    escalated = RoutingDecision(tier=LARGE_TIER, model=large_model_name(), reason="escalated_parse_failure")
+    ROUTING_DECISIONS.labels(tier=escalated.tier, reason=escalated.reason).inc()
+    ROUTING_ESCALATIONS.labels(from_model=decision.model, to_model=escalated.model).inc()
+    logger.warning("Escalating offer analysis from %s to %s after a parsing failure", decision.model, escalated.model)
+    return escalated
+
+
+def route_chunk() -> RoutingDecision:
+    """Pick the tier for per-chunk map calls (short inputs: fast unless routing is off)."""
+
+    large = large_model_name()
+    fast = fast_model_name()
+    if not _routing_enabled() or fast == large:
+        decision = RoutingDecision(tier=LARGE_TIER, model=large, reason="routing_disabled")
+    else:
+        decision = RoutingDecision(tier=FAST_TIER, model=fast, reason="map_chunk")
+    ROUTING_DECISIONS.labels(tier=decision.tier, reason=decision.reason).inc()
+    return decision
+
+
+def _decide(description: str, terms: ExtractedTerms) -> RoutingDecision:
+    large = large_model_name()
+    fast = fast_model_name()
+
+    if not _routing_enabled() or fast == large:
+        return RoutingDecision(tier=LARGE_TIER, model=large, reason="routing_disabled")
+    if len(description) > _env_int("LLM_FAST_MAX_CHARS", DEFAULT_FAST_MAX_CHARS):
+        return RoutingDecision(tier=LARGE_TIER, model=large, reason="long_description")
+    if len(terms.tech_stack) > _env_int("LLM_FAST_MAX_TECH_TERMS", DEFAULT_FAST_MAX_TECH_TERMS):
+        return RoutingDecision(tier=LARGE_TIER, model=large, reason="many_technologies")
+    return RoutingDecision(tier=FAST_TIER, model=fast, reason="short_offer")
+
+
+@lru_cache(maxsize=1)
+def large_model_name() -> str:
+    model = os.getenv("LLM_MODEL", DEFAULT_MODEL).strip()
+    return model or DEFAULT_MODEL
+
+
+@lru_cache(maxsize=1)
+def fast_model_name() -> str:
+    model = os.getenv("LLM_FAST_MODEL", DEFAULT_FAST_MODEL).strip()
+    return model or DEFAULT_FAST_MODEL
+
+
+def _routing_enabled() -> bool:
+    return os.getenv("LLM_ROUTING", "true").lower() not in {"0", "false", "no", "off"}
+
+
+def _env_int(name: str, fallback: int) -> int:
+    try:
+        return int(os.getenv(name) or fallback)
+    except ValueError:
+        return fallback
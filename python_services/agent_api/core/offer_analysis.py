@@ -1,20 +1,26 @@
 """LangChain-powered offer analysis backed by Anthropic Claude."""
 from __future__ import annotations
 
+import hashlib
 import logging
-import os
 from functools import lru_cache
 from textwrap import dedent
 
-from langchain_anthropic import ChatAnthropic
+from langchain_core.exceptions import OutputParserException
 from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 
-from ..schemas import OfferAnalysisData, OfferAnalysisRequest
+from ..schemas import OfferAnalysisData, OfferAnalysisRequest, OfferInsightData
+from .llm import build_chat_model, structured_output_enabled
+from .model_routing import FAST_TIER, RoutingDecision, escalate, route_offer
+from .shared_state import cached_model_sync
+from .structured_output import build_structured_chain
+from .telemetry import track_llm_call
+from .term_extraction import extract_terms
 
 logger = logging.getLogger(__name__)
 
-DEFAULT_MODEL = "claude-3-5-sonnet-20241022"
+PROMPT_VERSION = "1"
 MAX_DESCRIPTION_CHARS = 6000
 
 SYSTEM_PROMPT = dedent(
@@ -27,9 +33,6 @@ SYSTEM_PROMPT = dedent(
 
     Consignes supplémentaires :
     - Résume l'offre en 2 à 3 phrases concises, sans phrases génériques.
-    - Déduis la liste des technologies réellement mentionnées (5 à 10 éléments max).
-    - Identifie des mots-clés utiles pour un candidat (5 à 10 éléments max), en conservant
-      la casse naturelle des termes métier et méthodes.
     - Donne le niveau de séniorité attendu (Junior, Intermédiaire, Senior, Lead, Staff, etc.).
     - Si une information est absente, renvoie une valeur vide (« » ou liste vide) plutôt
       que d'inventer du contenu.
@@ -38,8 +41,14 @@ SYSTEM_PROMPT = dedent(
 )
 
 
-def generate_offer_analysis(payload: OfferAnalysisRequest) -> OfferAnalysisData:
-    """Invoke the Anthropic model through LangChain and build the structured analysis."""
+def generate_offer_analysis(payload: OfferAnalysisRequest, *, attempt: int = 1) -> OfferAnalysisData:
+    """Build the structured analysis.
+
+    ``tech_stack`` and ``keywords`` come from the local lexicon extractor; the
+    Anthropic model is only asked for the ``summary`` and ``seniority_level``.
+    Short offers go to the fast model first and are escalated to the large
+    model when its reply does not parse.
+    """
 
     description = (payload.job_offer.description or "").strip()
     if not description:
@@ -47,24 +56,52 @@ def generate_offer_analysis(payload: OfferAnalysisRequest) -> OfferAnalysisData:
         logger.info("Offer description missing; returning placeholder analysis for job %s", title)
         return OfferAnalysisData(summary=f"Aucune description disponible pour {title}.")
 
+    terms = extract_terms("\n".join(filter(None, [payload.job_offer.title, description])))
+
     analysis_input = _build_user_message(payload, description)
+    decision = route_offer(description, terms)
+
+    def compute() -> OfferInsightData:
+        try:
+            result = _invoke_analysis(decision, analysis_input, attempt)
+        except OutputParserException:
+            if decision.tier != FAST_TIER:
+                raise
+            result = _invoke_analysis(escalate(decision), analysis_input, attempt)
+        if not isinstance(result, OfferInsightData):
+            # Defensive: parser should already return OfferInsightData, but we coerce if needed.
+            result = OfferInsightData(**result)
+        return result
 
     try:
-        result = _analysis_chain().invoke(
+        result, _ = cached_model_sync(_cache_key(decision.model, analysis_input), OfferInsightData, compute)
+    except Exception as exc:  # pragma: no cover - relies on external service
+        logger.exception("Offer analysis generation failed: %s", exc)
+        raise
+
+    return OfferAnalysisData(
+        summary=result.summary,
+        tech_stack=terms.tech_stack,
+        keywords=terms.keywords,
+        seniority_level=result.seniority_level,
+    )
+
+
+def _invoke_analysis(decision: RoutingDecision, analysis_input: str, attempt: int):
+    with track_llm_call("offer_analysis", attempt=attempt, tier=decision.tier) as telemetry:
+        return _analysis_chain(decision.model).invoke(
             {
                 "analysis_input": analysis_input,
                 "format_instructions": _parser().get_format_instructions(),
-            }
+            },
+            config={"callbacks": [telemetry]},
         )
-    except Exception as exc:  # pragma: no cover - relies on external service
-        logger.exception("Offer analysis generation failed: %s", exc)
-        raise
 
-    if isinstance(result, OfferAnalysisData):
-        return result
 
-    # Defensive: parser should already return OfferAnalysisData, but we coerce if needed.
-    return OfferAnalysisData(**result)
+def _cache_key(model: str, analysis_input: str) -> str:
+    digest = hashlib.sha256(f"offer_analysis\0{PROMPT_VERSION}\0{model}\0".encode("utf-8"))
+    digest.update(analysis_input.encode("utf-8"))
+    return digest.hexdigest()
 
 
 def _build_user_message(payload: OfferAnalysisRequest, description: str) -> str:
@@ -115,11 +152,8 @@ def _build_user_message(payload: OfferAnalysisRequest, description: str) -> str:
     return "\n".join(segment for segment in segments if segment)
 
 
-@lru_cache(maxsize=1)
-def _analysis_chain():
-    if not os.getenv("ANTHROPIC_API_KEY"):
-        raise RuntimeError("ANTHROPIC_API_KEY manquant pour l'analyse via Agent API.")
-
+@lru_cache(maxsize=4)
+def _analysis_chain(model_name: str):
     prompt = ChatPromptTemplate.from_messages(
         [
             ("system", SYSTEM_PROMPT),
@@ -127,21 +161,17 @@ def _analysis_chain():
         ]
     )
 
-    llm = ChatAnthropic(
-        model=_resolve_model_name(),
-        temperature=0.2,
-        max_tokens=800,
-    )
+    llm = build_chat_model(model_name, max_tokens=400)
 
-    return prompt | llm | _parser()
+    return build_structured_chain(
+        prompt,
+        llm,
+        OfferInsightData,
+        operation="offer_analysis",
+        native=structured_output_enabled(),
+    )
 
 
 @lru_cache(maxsize=1)
 def _parser() -> PydanticOutputParser:
-    return PydanticOutputParser(pydantic_object=OfferAnalysisData)
-
-
-@lru_cache(maxsize=1)
-def _resolve_model_name() -> str:
-    model = os.getenv("LLM_MODEL", DEFAULT_MODEL).strip()
-    return model or DEFAULT_MODEL
+    return PydanticOutputParser(pydantic_object=OfferInsightData)
@@ -0,0 +1,65 @@
+"""Async client for the Scraper API, used by the scrape-then-analyze pipeline."""
+from __future__ import annotations
+
+import os
+
+import httpx
+
+from ..schemas import ScrapedOfferData
+
+DEFAULT_TIMEOUT_S = 60.0
+# Leaves the Scraper API time to answer with its own 504 before the client gives up.
+DEADLINE_MARGIN_MS = 500
+
+_client: httpx.AsyncClient | None = None
+
+
+class ScraperClientError(RuntimeError):
+    """Scraping failed; ``status_code`` mirrors the Scraper API's answer."""
+
+    def __init__(self, message: str, status_code: int = 502):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+async def scrape_offer(url: str) -> ScrapedOfferData:
+    """Scrape ``url`` through the Scraper API."""
+
+    client = _get_client()
+    deadline_ms = max(DEADLINE_MARGIN_MS, int(client.timeout.read * 1000) - DEADLINE_MARGIN_MS)
+    try:
+        response = await client.post("/scrape/offer", json={"url": url}, headers={"X-Request-Timeout-Ms": str(deadline_ms)})
+    except httpx.TimeoutException as exc:
+        raise ScraperClientError("Délai dépassé en attendant le Scraper API.", status_code=504) from exc
+    except httpx.HTTPError as exc:
+        raise ScraperClientError(f"Scraper API injoignable : {exc}") from exc
+
+    if response.status_code != 200:
+        try:
+            detail = response.json().get("detail")
+        except ValueError:
+            detail = None
+        status_code = response.status_code if response.status_code in (400, 422, 504) else 502
+        raise ScraperClientError(detail or f"Scraper API a répondu {response.status_code}.", status_code=status_code)
+
+    return ScrapedOfferData.model_validate(response.json())
+
+
+async def close() -> None:
+    """Close the pooled HTTP client (called on application shutdown)."""
+
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        base_url = os.getenv("SCRAPER_API_URL")
+        if not base_url:
+            raise ScraperClientError("SCRAPER_API_URL manquant dans la configuration.", status_code=503)
+        timeout = float(os.getenv("SCRAPER_API_TIMEOUT_S", DEFAULT_TIMEOUT_S))
+        _client = httpx.AsyncClient(base_url=base_url, timeout=timeout)
+    return _client
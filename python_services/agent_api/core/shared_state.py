@@ -0,0 +1,61 @@
+"""State shared by the Agent API workers of one host (see ``shared.coordination``).
+
+Enabled by ``AGENT_SHARED_STATE_DB`` (a SQLite file on local disk):
+
+- ``LLM_SLOTS`` caps the LLM-backed ``/agent/*`` requests in flight across all workers
+  (``AGENT_HOST_MAX_CONCURRENCY``), on top of each worker's own limit;
+- ``cached_model`` / ``cached_model_sync`` keep parsed model outputs in a
+  host-wide cache (``AGENT_RESULT_TTL_S``, ``AGENT_RESULT_CACHE_SIZE``) and
+  make sure only one worker runs the LLM call for a given input at a time.
+
+Chains and parsers stay per worker: they are Python objects, rebuilt by the
+startup warm-up. Without the variable every helper computes directly.
+"""
+from __future__ import annotations
+
+import os
+from typing import Awaitable, Callable, Type, TypeVar
+
+from pydantic import BaseModel
+
+from shared.coordination import SharedCache, SharedSemaphore, SharedStore, SingleFlight
+from shared.env import parse_float, parse_int
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+STORE = SharedStore(os.environ["AGENT_SHARED_STATE_DB"]) if os.getenv("AGENT_SHARED_STATE_DB") else None
+LLM_SLOTS = SharedSemaphore(STORE, "llm", parse_int(os.getenv("AGENT_HOST_MAX_CONCURRENCY"), 64)) if STORE else None
+RESULTS = (
+    SingleFlight(
+        SharedCache(
+            STORE,
+            "agent",
+            ttl_s=parse_float(os.getenv("AGENT_RESULT_TTL_S"), 7 * 24 * 3600.0),
+            max_entries=parse_int(os.getenv("AGENT_RESULT_CACHE_SIZE"), 20000),
+        )
+    )
+    if STORE
+    else None
+)
+
+
+async def cached_model(key: str, schema: Type[ModelT], compute: Callable[[], Awaitable[ModelT]]) -> tuple[ModelT, bool]:
+    """Return ``(value, from_cache)``, running ``compute`` once per key across workers."""
+
+    if RESULTS is None:
+        return await compute(), False
+
+    async def compute_json() -> str:
+        return (await compute()).model_dump_json()
+
+    raw, cached = await RESULTS.run(key, compute_json)
+    return schema.model_validate_json(raw), cached
+
+
+def cached_model_sync(key: str, schema: Type[ModelT], compute: Callable[[], ModelT]) -> tuple[ModelT, bool]:
+    """Blocking variant of ``cached_model`` for the threadpool-bound offer analysis."""
+
+    if RESULTS is None:
+        return compute(), False
+    raw, cached = RESULTS.run_sync(key, lambda: compute().model_dump_json())
+    return schema.model_validate_json(raw), cached
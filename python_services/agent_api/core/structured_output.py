@@ -0,0 +1,226 @@
+"""Structured-output chains with a local repair step for malformed replies.
+
+When the chat model supports tool calling, chains ask for the schema
+natively (``with_structured_output``). Whatever the mode, a reply that does
+not validate goes through a local repair pipeline before anyone considers
+re-calling the model:
+
+1. strip Markdown code fences and surrounding prose,
+2. extract the first complete top-level JSON object,
+3. drop trailing commas,
+4. coerce list/str mismatches and let missing fields fall back to defaults.
+
+A truncated reply is not patched up: the values it would keep can be cut
+mid-sentence, so it raises like a reply with no JSON object at all. Every
+failure is an ``OutputParserException``, so callers keep their existing
+retry and escalation logic.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import typing
+from typing import Any, Type, TypeVar
+
+from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable, RunnableLambda
+from prometheus_client import Counter
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+OUTPUT_PARSING = Counter(
+    "agent_llm_output_parsing_total",
+    "Model replies by parsing outcome (clean, rescued locally, failed) and repair stage.",
+    ["operation", "outcome", "stage"],
+)
+
+_FENCE_RE = re.compile(r"```(?:json)?", re.IGNORECASE)
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_LIST_SPLIT_RE = re.compile(r"\s*(?:\n|;|,)\s*")
+_BULLET_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+
+
+def build_structured_chain(
+    prompt: ChatPromptTemplate,
+    llm: BaseChatModel,
+    schema: Type[ModelT],
+    *,
+    operation: str,
+    native: bool = True,
+) -> Runnable:
+    """Compose ``prompt | llm`` with native structured output or text parsing plus repair."""
+
+    if native and supports_native_structured_output(llm):
+        structured = llm.with_structured_output(schema, include_raw=True)
+        return prompt | structured | RunnableLambda(
+            lambda output: _from_structured_output(output, schema, operation)
+        )
+
+    return prompt | llm | RunnableLambda(lambda message: _from_message(message, schema, operation))
+
+
+def supports_native_structured_output(llm: BaseChatModel) -> bool:
+    """Return True when the chat model implements tool calling."""
+
+    return type(llm).bind_tools is not BaseChatModel.bind_tools
+
+
+def parse_with_repair(raw: str | dict[str, Any], schema: Type[ModelT], *, operation: str) -> ModelT:
+    """Validate ``raw`` against ``schema``, repairing it locally when needed."""
+
+    if isinstance(raw, dict):
+        try:
+            result = schema.model_validate(raw)
+        except ValidationError:
+            return _record(_coerce(raw, schema, operation), operation, "rescued", "coercion")
+        return _record(result, operation, "clean", "none")
+
+    text = raw or ""
+    try:
+        return _record(schema.model_validate_json(text.strip()), operation, "clean", "none")
+    except ValidationError:
+        pass
+
+    stage = "fragment"
+    fragment, complete = _extract_json_fragment(text)
+    if fragment is None:
+        OUTPUT_PARSING.labels(operation=operation, outcome="failed", stage="fragment").inc()
+        raise OutputParserException(f"No JSON object found in model output for {operation}.", llm_output=text)
+    if not complete:
+        OUTPUT_PARSING.labels(operation=operation, outcome="failed", stage="truncated").inc()
+        raise OutputParserException(f"Truncated JSON object in model output for {operation}.", llm_output=text)
+
+    try:
+        data = json.loads(fragment, strict=False)
+    except json.JSONDecodeError:
+        stage = "syntax"
+        try:
+            data = json.loads(_TRAILING_COMMA_RE.sub(r"\1", fragment), strict=False)
+        except json.JSONDecodeError as exc:
+            OUTPUT_PARSING.labels(operation=operation, outcome="failed", stage=stage).inc()
+            raise OutputParserException(f"Unrepairable JSON in model output for {operation}: {exc}", llm_output=text) from exc
+
+    if not isinstance(data, dict):
+        OUTPUT_PARSING.labels(operation=operation, outcome="failed", stage=stage).inc()
+        raise OutputParserException(f"Model output for {operation} is not a JSON object.", llm_output=text)
+
+    try:
+        return _record(schema.model_validate(data), operation, "rescued", stage)
+    except ValidationError:
+        return _record(_coerce(data, schema, operation), operation, "rescued", "coercion")
+
+
+def _from_structured_output(output: dict[str, Any], schema: Type[ModelT], operation: str) -> ModelT:
+    parsed = output.get("parsed")
+    if isinstance(parsed, schema):
+        return _record(parsed, operation, "clean", "none")
+
+    raw: BaseMessage | None = output.get("raw")
+    tool_calls = getattr(raw, "tool_calls", None) or []
+    if tool_calls:
+        return parse_with_repair(tool_calls[0].get("args") or {}, schema, operation=operation)
+    return parse_with_repair(_message_text(raw), schema, operation=operation)
+
+
+def _from_message(message: BaseMessage | str, schema: Type[ModelT], operation: str) -> ModelT:
+    text = message if isinstance(message, str) else _message_text(message)
+    return parse_with_repair(text, schema, operation=operation)
+
+
+def _message_text(message: BaseMessage | None) -> str:
+    if message is None:
+        return ""
+    content = message.content
+    if isinstance(content, str):
+        return content
+    return "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+
+
+def _extract_json_fragment(text: str) -> tuple[str | None, bool]:
+    """Return ``(first top-level JSON object, whether it is closed)``.
+
+    Braces inside string values are skipped, so the object ends at the brace
+    that actually closes it rather than at the last ``}`` of the reply.
+    """
+
+    sanitized = _FENCE_RE.sub("", text)
+    start = sanitized.find("{")
+    if start == -1:
+        return None, False
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for index in range(start, len(sanitized)):
+        char = sanitized[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return sanitized[start : index + 1], True
+    return sanitized[start:], False
+
+
+def _coerce(data: dict[str, Any], schema: Type[ModelT], operation: str) -> ModelT:
+    values: dict[str, Any] = {}
+    for name, field in schema.model_fields.items():
+        value = data.get(name, data.get(field.alias)) if field.alias else data.get(name)
+        if value is None:
+            continue
+        if typing.get_origin(field.annotation) is list:
+            values[name] = _as_list(value)
+        elif field.annotation is str:
+            values[name] = _as_text(value)
+        else:
+            values[name] = value
+
+    try:
+        return schema.model_validate(values)
+    except ValidationError as exc:
+        OUTPUT_PARSING.labels(operation=operation, outcome="failed", stage="coercion").inc()
+        raise OutputParserException(f"Model output for {operation} does not match the schema: {exc}") from exc
+
+
+def _as_list(value: Any) -> list[str]:
+    if isinstance(value, str):
+        items = _LIST_SPLIT_RE.split(value)
+    elif isinstance(value, dict):
+        items = list(value.values())
+    elif isinstance(value, (list, tuple, set)):
+        items = list(value)
+    else:
+        items = [value]
+    cleaned = (_BULLET_RE.sub("", str(item)).strip() for item in items if item is not None)
+    return [item for item in cleaned if item]
+
+
+def _as_text(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(item).strip() for item in value if item)
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def _record(result: ModelT, operation: str, outcome: str, stage: str) -> ModelT:
+    OUTPUT_PARSING.labels(operation=operation, outcome=outcome, stage=stage).inc()
+    if outcome == "rescued":
+        logger.info("Model output for %s repaired locally (stage=%s)", operation, stage)
+    return result
@@ -0,0 +1,142 @@
+"""Per-call instrumentation for the LangChain chains of the Agent API.
+
+``track_llm_call`` hands a callback handler to a chain invocation, then turns
+what it observed (model, token usage, wall time, time-to-first-token, attempt,
+output-parser failures) into Prometheus metrics and one structured log line.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Iterator
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.exceptions import OutputParserException
+from langchain_core.outputs import LLMResult
+from prometheus_client import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+
+LLM_CALLS = Counter(
+    "agent_llm_calls_total",
+    "LLM calls by operation, tier, model, attempt and outcome.",
+    ["operation", "tier", "model", "attempt", "outcome"],
+)
+LLM_TOKENS = Counter(
+    "agent_llm_tokens_total",
+    "Tokens consumed by LLM calls.",
+    ["operation", "tier", "model", "direction"],
+)
+LLM_LATENCY = Histogram(
+    "agent_llm_latency_seconds",
+    "Wall time of a full chain invocation.",
+    ["operation", "tier", "model"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TTFT = Histogram(
+    "agent_llm_time_to_first_token_seconds",
+    "Delay between the model request and its first streamed token.",
+    ["operation", "tier", "model"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_PARSE_FAILURES = Counter(
+    "agent_llm_parse_failures_total",
+    "Model replies rejected by the output parser.",
+    ["operation", "tier", "model"],
+)
+
+
+@dataclass
+class LLMCallRecord:
+    """Everything recorded about a single chain invocation."""
+
+    operation: str
+    attempt: int
+    tier: str = "default"
+    model: str = "unknown"
+    input_tokens: int = 0
+    output_tokens: int = 0
+    wall_time_s: float = 0.0
+    ttft_s: float | None = None
+    outcome: str = "ok"
+
+
+class LLMTelemetryHandler(BaseCallbackHandler):
+    """Callback handler collecting model name, usage and token timings."""
+
+    def __init__(self, record: LLMCallRecord):
+        self.record = record
+        self._model_started_at: float | None = None
+
+    def on_chat_model_start(self, serialized: dict[str, Any], messages: Any, **kwargs: Any) -> None:
+        self._model_started_at = time.perf_counter()
+        params = kwargs.get("invocation_params") or {}
+        metadata = kwargs.get("metadata") or {}
+        model = params.get("model") or params.get("model_name") or metadata.get("ls_model_name")
+        if model:
+            self.record.model = str(model)
+
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        if self.record.ttft_s is None and self._model_started_at is not None:
+            self.record.ttft_s = time.perf_counter() - self._model_started_at
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        input_tokens, output_tokens = _usage_from_result(response)
+        self.record.input_tokens += input_tokens
+        self.record.output_tokens += output_tokens
+
+
+@contextmanager
+def track_llm_call(operation: str, *, attempt: int = 1, tier: str = "default") -> Iterator[LLMTelemetryHandler]:
+    """Yield a callback handler and publish the call record once the block exits."""
+
+    record = LLMCallRecord(operation=operation, attempt=attempt, tier=tier)
+    handler = LLMTelemetryHandler(record)
+    started_at = time.perf_counter()
+    try:
+        yield handler
+    except OutputParserException:
+        record.outcome = "parse_error"
+        raise
+    except Exception:
+        record.outcome = "error"
+        raise
+    finally:
+        record.wall_time_s = time.perf_counter() - started_at
+        publish(record)
+
+
+def publish(record: LLMCallRecord) -> None:
+    """Export ``record`` as Prometheus samples and a structured log line."""
+
+    labels = {"operation": record.operation, "tier": record.tier, "model": record.model}
+    LLM_CALLS.labels(attempt=str(record.attempt), outcome=record.outcome, **labels).inc()
+    LLM_LATENCY.labels(**labels).observe(record.wall_time_s)
+    if record.ttft_s is not None:
+        LLM_TTFT.labels(**labels).observe(record.ttft_s)
+    if record.input_tokens:
+        LLM_TOKENS.labels(direction="input", **labels).inc(record.input_tokens)
+    if record.output_tokens:
+        LLM_TOKENS.labels(direction="output", **labels).inc(record.output_tokens)
+    if record.outcome == "parse_error":
+        LLM_PARSE_FAILURES.labels(**labels).inc()
+
+    logger.info(json.dumps({"event": "llm_call", **asdict(record)}, ensure_ascii=False))
+
+
+def _usage_from_result(response: LLMResult) -> tuple[int, int]:
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                return int(usage.get("input_tokens", 0)), int(usage.get("output_tokens", 0))
+
+    usage = (response.llm_output or {}).get("usage") or {}
+    if isinstance(usage, dict):
+        return int(usage.get("input_tokens", 0)), int(usage.get("output_tokens", 0))
+    return int(getattr(usage, "input_tokens", 0)), int(getattr(usage, "output_tokens", 0))
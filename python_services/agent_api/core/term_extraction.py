@@ -0,0 +1,178 @@
+"""Deterministic tech-stack and keyword extraction backed by the local lexicon.
+
+All lexicon aliases are compiled once into an Aho-Corasick automaton so a
+description is scanned in a single linear pass, whatever the lexicon size.
+Overlapping hits are resolved leftmost-longest ("React Native" wins over
+"React", "Ruby on Rails" over "Ruby") and only matches sitting on word
+boundaries are kept. Contextual surface forms (see ``LexiconEntry.contextual``)
+are then dropped unless another technology sits within ``CONTEXT_CHARS``.
+"""
+from __future__ import annotations
+
+import unicodedata
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterable
+
+from .lexicon import ENTRIES, KEYWORD, LEXICON_VERSION, TECH, LexiconEntry
+
+MAX_TERMS_PER_FIELD = 10
+CONTEXT_CHARS = 40
+
+
+@dataclass(frozen=True)
+class ExtractedTerms:
+    """Canonical terms found in a text, in order of first appearance."""
+
+    tech_stack: list[str] = field(default_factory=list)
+    keywords: list[str] = field(default_factory=list)
+    lexicon_version: str = LEXICON_VERSION
+
+
+class AhoCorasickMatcher:
+    """Multi-pattern matcher returning every ``(start, end, value)`` occurrence."""
+
+    def __init__(self, patterns: Iterable[tuple[str, object]]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._outputs: list[list[tuple[int, object]]] = [[]]
+
+        for pattern, value in patterns:
+            if pattern:
+                self._add(pattern, value)
+        self._build_failure_links()
+
+    def _add(self, pattern: str, value: object) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._outputs[state].append((len(pattern), value))
+
+    def _build_failure_links(self) -> None:
+        queue: deque[int] = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._outputs[child].extend(self._outputs[self._fail[child]])
+
+    def iter_matches(self, text: str) -> Iterable[tuple[int, int, object]]:
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, value in outputs[state]:
+                yield index - length + 1, index + 1, value
+
+
+def extract_terms(text: str | None, *, limit: int = MAX_TERMS_PER_FIELD) -> ExtractedTerms:
+    """Return the canonical tech stack and keywords mentioned in ``text``."""
+
+    if not text or not text.strip():
+        return ExtractedTerms()
+
+    original = unicodedata.normalize("NFC", text)
+    lowered, offsets = _lower(original)
+
+    candidates: list[tuple[int, int, LexiconEntry, str]] = []
+    for start, end, value in _matcher().iter_matches(lowered):
+        entry, surface = value  # type: ignore[misc]
+        if not _on_word_boundary(lowered, start, end):
+            continue
+        if entry.case_sensitive and _original_span(original, offsets, start, end) != surface:
+            continue
+        candidates.append((start, end, entry, surface))
+
+    matches: list[tuple[int, int, LexiconEntry, str]] = []
+    last_end = -1
+    for start, end, entry, surface in sorted(candidates, key=lambda item: (item[0], -(item[1] - item[0]))):
+        if start < last_end:
+            continue
+        last_end = end
+        matches.append((start, end, entry, surface))
+
+    anchors = [
+        (start, end)
+        for start, end, entry, surface in matches
+        if entry.category == TECH and surface not in entry.contextual
+    ]
+    tech_stack: list[str] = []
+    keywords: list[str] = []
+    for start, end, entry, surface in matches:
+        if surface in entry.contextual and not _near(anchors, start, end):
+            continue
+        bucket = tech_stack if entry.category == TECH else keywords
+        if entry.canonical not in bucket and len(bucket) < limit:
+            bucket.append(entry.canonical)
+
+    return ExtractedTerms(tech_stack=tech_stack, keywords=keywords)
+
+
+def extract_terms_bulk(texts: Iterable[str | None], *, limit: int = MAX_TERMS_PER_FIELD) -> list[ExtractedTerms]:
+    """Extract terms for many descriptions; identical texts are scanned once."""
+
+    results: dict[str | None, ExtractedTerms] = {}
+    extracted = []
+    for text in texts:
+        if text not in results:
+            results[text] = extract_terms(text, limit=limit)
+        extracted.append(results[text])
+    return extracted
+
+
+def _near(anchors: list[tuple[int, int]], start: int, end: int) -> bool:
+    return any(
+        anchor_start - CONTEXT_CHARS <= end and start <= anchor_end + CONTEXT_CHARS for anchor_start, anchor_end in anchors
+    )
+
+
+def _lower(text: str) -> tuple[str, list[int] | None]:
+    """Lowercase ``text``; when that changes its length (``İ`` -> ``i̇``), also
+    return the index in ``text`` of every lowered character."""
+
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered, None
+    offsets = [index for index, char in enumerate(text) for _ in char.lower()]
+    return lowered, offsets
+
+
+def _original_span(text: str, offsets: list[int] | None, start: int, end: int) -> str:
+    if offsets is None:
+        return text[start:end]
+    return text[offsets[start] : offsets[end - 1] + 1]
+
+
+def _on_word_boundary(text: str, start: int, end: int) -> bool:
+    before = text[start - 1] if start > 0 else ""
+    after = text[end] if end < len(text) else ""
+    return not _is_word_char(before) and not _is_word_char(after)
+
+
+def _is_word_char(char: str) -> bool:
+    return bool(char) and (char.isalnum() or char == "_")
+
+
+@lru_cache(maxsize=1)
+def _matcher() -> AhoCorasickMatcher:
+    patterns: list[tuple[str, object]] = []
+    for entry in ENTRIES:
+        if entry.category not in (TECH, KEYWORD):
+            continue
+        for surface in entry.surface_forms():
+            patterns.append((unicodedata.normalize("NFC", surface).lower(), (entry, surface)))
+    return AhoCorasickMatcher(patterns)
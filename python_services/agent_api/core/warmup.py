@@ -0,0 +1,61 @@
+"""Startup warm-up and readiness state for the Agent API.
+
+The lifespan hook runs ``warm_up`` in a worker thread right after the app
+starts: it imports the provider SDK, builds every model tier's chain and the
+output parser, and compiles the lexicon matcher. ``/health`` answers as soon
+as the process is up, while ``/health/ready`` only reports OK once this is
+done, so a load balancer never sends the first user to a cold worker.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+
+from .cv_analysis import _map_chain, _map_parser, _reduce_chain, _reduce_parser
+from .model_routing import fast_model_name, large_model_name
+from .offer_analysis import _analysis_chain, _parser
+from .term_extraction import extract_terms
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Readiness:
+    """Warm-up progress exposed by the readiness probe."""
+
+    status: str = "starting"
+    detail: str | None = None
+    warmup_seconds: float | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+
+READINESS = Readiness()
+
+
+def warm_up() -> Readiness:
+    """Build chains, parsers and the lexicon matcher; record the outcome."""
+
+    started = time.perf_counter()
+    READINESS.status = "warming"
+    try:
+        for parser in (_parser, _map_parser, _reduce_parser):
+            parser().get_format_instructions()
+        for model_name in dict.fromkeys([fast_model_name(), large_model_name()]):
+            _analysis_chain(model_name)
+            _map_chain(model_name)
+        _reduce_chain(large_model_name())
+        extract_terms("warm-up")
+    except Exception as exc:  # noqa: BLE001 - readiness must report any failure
+        READINESS.status = "failed"
+        READINESS.detail = str(exc)
+        logger.exception("Agent API warm-up failed")
+    else:
+        READINESS.status = "ready"
+        READINESS.detail = None
+    READINESS.warmup_seconds = round(time.perf_counter() - started, 3)
+    logger.info("Agent API warm-up finished: %s in %ss", READINESS.status, READINESS.warmup_seconds)
+    return READINESS
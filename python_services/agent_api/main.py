@@ -6,20 +6,77 @@ Handles:
 - CV matching and suggestions
 - Email and cover letter generation
 """
+import asyncio
+import os
+import tempfile
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
+from prometheus_client import make_asgi_app
 
+from agent_api.core import scraper_client
+from agent_api.core.shared_state import LLM_SLOTS
+from agent_api.core.warmup import READINESS, warm_up
+from agent_api.routers.cv_analysis import router as cv_analysis_router
+from agent_api.routers.job_application import router as job_application_router
+from agent_api.routers.matching import router as matching_router
 from agent_api.routers.offer_analysis import router as offer_analysis_router
+from agent_api.routers.offer_terms import router as offer_terms_router
+from agent_api.routers.pipeline import router as pipeline_router
+from shared.admission import AdmissionController, AdmissionMiddleware
+from shared.env import parse_float, parse_int
+from shared.profiling import ProfileStore, ProfilingMiddleware, profiles_router, profiling_available
 
 # Load environment variables from root .env
 load_dotenv(dotenv_path="../../.env")
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Warm chains and parsers in the background; readiness flips once done."""
+    warmup = asyncio.create_task(asyncio.to_thread(warm_up))
+    yield
+    if not warmup.done():
+        await asyncio.wait({warmup})
+    await scraper_client.close()
+
+
 app = FastAPI(
     title="Job Hunt Agent API",
     description="AI-powered job application assistance using LangChain",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
+)
+
+# Bounds the LLM-backed requests in flight with a short wait queue. Term extraction
+# and match scoring make no LLM call and are never shed because of LLM load.
+LLM_ROUTES = ("/agent/offer_analysis", "/agent/cv_analysis", "/agent/job_application", "/agent/offer_pipeline")
+ADMISSION = AdmissionController(
+    "agent",
+    limit=parse_int(os.getenv("AGENT_MAX_CONCURRENCY"), 32),
+    queue_size=parse_int(os.getenv("AGENT_QUEUE_SIZE"), 64, minimum=0),
+    queue_timeout_s=parse_float(os.getenv("AGENT_QUEUE_TIMEOUT_MS"), 2000.0) / 1000,
+    shared=LLM_SLOTS,
 )
+app.add_middleware(AdmissionMiddleware, controller=ADMISSION, path_prefix=LLM_ROUTES)
+
+# Opt-in profiling: requests sent with ``X-Profile: $AGENT_PROFILING_TOKEN`` or
+# sampled at AGENT_PROFILING_SAMPLE_RATE are saved as speedscope files.
+PROFILING_TOKEN = os.getenv("AGENT_PROFILING_TOKEN") or None
+PROFILING_SAMPLE_RATE = parse_float(os.getenv("AGENT_PROFILING_SAMPLE_RATE"), 0.0)
+if (PROFILING_TOKEN or PROFILING_SAMPLE_RATE > 0) and profiling_available():
+    PROFILES = ProfileStore(os.getenv("AGENT_PROFILING_DIR", os.path.join(tempfile.gettempdir(), "agent_api_profiles")))
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=PROFILES,
+        admin_token=PROFILING_TOKEN,
+        sample_rate=PROFILING_SAMPLE_RATE,
+        path_prefix="/agent/",
+    )
+    app.include_router(profiles_router(PROFILES, PROFILING_TOKEN))
 
 # CORS middleware for Rails communication
 app.add_middleware(
@@ -47,9 +104,23 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/health/ready")
+async def readiness():
+    """Readiness probe: OK once chains and parsers are warmed up and the service is not saturated."""
+    body = {
+        "status": READINESS.status,
+        "detail": READINESS.detail,
+        "warmup_seconds": READINESS.warmup_seconds,
+        "admission": ADMISSION.status(),
+    }
+    return JSONResponse(body, status_code=200 if READINESS.ready and not ADMISSION.saturated else 503)
+
+
 app.include_router(offer_analysis_router)
+app.include_router(offer_terms_router)
+app.include_router(matching_router)
+app.include_router(pipeline_router)
+app.include_router(cv_analysis_router)
+app.include_router(job_application_router)
+app.mount("/metrics", make_asgi_app())
 
-# TODO: Add routers for:
-# - /agent/job_application (POST)
-# - /agent/cv_analysis (POST)
-# These will be implemented according to the architecture docs
@@ -0,0 +1,30 @@
+"""CV analysis endpoint exposed by the Agent API."""
+import logging
+
+from fastapi import APIRouter, HTTPException, status
+
+from ..core.cv_analysis import analyze_cv
+from ..schemas import CvAnalysisRequest, CvAnalysisResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/agent", tags=["cv_analysis"])
+
+
+@router.post("/cv_analysis", response_model=CvAnalysisResponse, status_code=status.HTTP_200_OK)
+async def post_cv_analysis(payload: CvAnalysisRequest) -> CvAnalysisResponse:
+    """Analyse a CV section by section and return the merged analysis."""
+
+    try:
+        result = await analyze_cv(payload.cv.content or "", payload.profile)
+    except Exception as exc:  # pragma: no cover - relies on external service
+        logger.exception("CV analysis failed for cv %s", payload.cv.id)
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="CV analysis failed.") from exc
+
+    return CvAnalysisResponse(
+        data=result.data,
+        sections=result.sections,
+        cached_sections=result.cached_sections,
+        failed_sections=list(result.failed_sections),
+        partial=bool(result.failed_sections),
+    )
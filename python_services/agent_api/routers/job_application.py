@@ -0,0 +1,51 @@
+"""Job application (cover letter / e-mail) endpoint exposed by the Agent API."""
+import json
+import logging
+from typing import AsyncIterator
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from ..core.job_application import generate_application, stream_application
+from ..schemas import JobApplicationData, JobApplicationRequest, JobApplicationResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/agent", tags=["job_application"])
+
+
+@router.post("/job_application", response_model=JobApplicationResponse, status_code=status.HTTP_200_OK)
+async def post_job_application(payload: JobApplicationRequest):
+    """Personalise the user's template for an offer.
+
+    With ``stream: true`` the response is NDJSON: one ``slot`` line per filled
+    slot as soon as it is known, then a ``done`` line with the full letter.
+    """
+
+    if not (payload.template.body or "").strip():
+        raise HTTPException(status_code=422, detail="Template body is empty.")
+
+    if payload.stream:
+        return StreamingResponse(_ndjson(payload), media_type="application/x-ndjson")
+
+    try:
+        result = await generate_application(payload)
+    except Exception as exc:  # pragma: no cover - relies on external service
+        logger.exception("Job application generation failed for template %s", payload.template.id)
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Job application generation failed.") from exc
+
+    return JobApplicationResponse(
+        data=JobApplicationData(content=result.content, slots=result.slots),
+        personalized_slots=result.personalized_slots,
+        generated_chars=result.generated_chars,
+        template_cached=result.template_cached,
+    )
+
+
+async def _ndjson(payload: JobApplicationRequest) -> AsyncIterator[str]:
+    try:
+        async for event in stream_application(payload):
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+    except Exception:  # pragma: no cover - relies on external service
+        logger.exception("Streaming job application failed for template %s", payload.template.id)
+        yield json.dumps({"event": "error", "detail": "Job application generation failed."}) + "\n"
@@ -0,0 +1,34 @@
+"""CV-to-offer match scoring endpoint exposed by the Agent API."""
+from fastapi import APIRouter, status
+
+from ..core.lexicon import LEXICON_VERSION
+from ..core.matching import OfferText, score_offers
+from ..schemas import MatchScoresRequest, MatchScoresResponse, OfferMatchData
+
+router = APIRouter(prefix="/agent", tags=["matching"])
+
+
+@router.post("/match_scores", response_model=MatchScoresResponse, status_code=status.HTTP_200_OK)
+def post_match_scores(payload: MatchScoresRequest) -> MatchScoresResponse:
+    """Rank offers against the CV with BM25 and lexicon skill coverage."""
+
+    offers = [
+        OfferText(id=offer.id, text="\n".join(filter(None, [offer.title, offer.description])))
+        for offer in payload.offers
+    ]
+    results = score_offers(payload.cv.content or "", offers)
+    if payload.limit:
+        results = results[: payload.limit]
+
+    data = [
+        OfferMatchData(
+            id=result.id,
+            match_score=result.score,
+            text_score=result.text_score,
+            skill_coverage=result.skill_coverage,
+            matched_skills=result.matched_skills,
+            missing_skills=result.missing_skills,
+        )
+        for result in results
+    ]
+    return MatchScoresResponse(data=data, lexicon_version=LEXICON_VERSION)
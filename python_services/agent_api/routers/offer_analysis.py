@@ -1,5 +1,6 @@
 """Offer analysis endpoint exposed by the Agent API."""
 from fastapi import APIRouter, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 import logging
 
 from ..core.offer_analysis import generate_offer_analysis
@@ -20,7 +21,7 @@ async def post_offer_analysis(payload: OfferAnalysisRequest) -> OfferAnalysisRes
 
     for attempt in range(1, MAX_ATTEMPTS + 1):
         try:
-            analysis = generate_offer_analysis(payload)
+            analysis = await run_in_threadpool(generate_offer_analysis, payload, attempt=attempt)
             return OfferAnalysisResponse(data=analysis)
         except Exception as exc:  # pragma: no cover - safeguard for unforeseen runtime failures
             last_error = exc
@@ -0,0 +1,21 @@
+"""Bulk tech-stack and keyword extraction endpoint exposed by the Agent API."""
+from fastapi import APIRouter, status
+
+from ..core.lexicon import LEXICON_VERSION
+from ..core.term_extraction import extract_terms_bulk
+from ..schemas import OfferTermsData, OfferTermsRequest, OfferTermsResponse
+
+router = APIRouter(prefix="/agent", tags=["offer_terms"])
+
+
+@router.post("/offer_terms", response_model=OfferTermsResponse, status_code=status.HTTP_200_OK)
+def post_offer_terms(payload: OfferTermsRequest) -> OfferTermsResponse:
+    """Extract terms for many offers at once without calling the language model."""
+
+    texts = ("\n".join(filter(None, [offer.title, offer.description])) for offer in payload.offers)
+    data = [
+        OfferTermsData(id=offer.id, tech_stack=terms.tech_stack, keywords=terms.keywords)
+        for offer, terms in zip(payload.offers, extract_terms_bulk(texts))
+    ]
+
+    return OfferTermsResponse(data=data, lexicon_version=LEXICON_VERSION)
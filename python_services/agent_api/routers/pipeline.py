@@ -0,0 +1,89 @@
+"""Scrape-then-analyze pipeline endpoint exposed by the Agent API."""
+from __future__ import annotations
+
+import json
+import logging
+import time
+from typing import AsyncIterator
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from ..core.offer_analysis import generate_offer_analysis
+from ..core.scraper_client import ScraperClientError, scrape_offer
+from ..schemas import JobOfferPayload, OfferAnalysisRequest, OfferPipelineRequest, ScrapedOfferData
+from .offer_analysis import MAX_ATTEMPTS
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/agent", tags=["pipeline"])
+
+
+@router.post("/offer_pipeline", status_code=status.HTTP_200_OK)
+async def post_offer_pipeline(payload: OfferPipelineRequest) -> StreamingResponse:
+    """Scrape an offer URL and analyse it, streaming each stage as NDJSON.
+
+    Lines are ``{"event": "scraped" | "analysis" | "error" | "done", ...}``,
+    each with the stage timings known so far. Scraping errors are returned as
+    plain HTTP errors since nothing has been streamed yet.
+    """
+
+    started = time.perf_counter()
+    try:
+        offer = await scrape_offer(str(payload.url))
+    except ScraperClientError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+    timings = {"scrape_ms": _elapsed_ms(started)}
+
+    return StreamingResponse(
+        _stream_analysis(payload, offer, timings, started),
+        media_type="application/x-ndjson",
+    )
+
+
+async def _stream_analysis(
+    payload: OfferPipelineRequest,
+    offer: ScrapedOfferData,
+    timings: dict[str, float],
+    started: float,
+) -> AsyncIterator[str]:
+    yield _line({"event": "scraped", "data": offer.model_dump(), "timings": timings})
+
+    request = OfferAnalysisRequest(
+        job_offer=JobOfferPayload(
+            title=offer.title,
+            company_name=offer.company,
+            location=offer.location,
+            description=offer.description,
+        ),
+        cv=payload.cv,
+        profile=payload.profile,
+        template=payload.template,
+    )
+
+    analysis_started = time.perf_counter()
+    analysis = None
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            analysis = await run_in_threadpool(generate_offer_analysis, request, attempt=attempt)
+            break
+        except Exception:  # pragma: no cover - safeguard for unforeseen runtime failures
+            logger.exception("Pipeline analysis attempt %s failed for %s", attempt, payload.url)
+    timings["analysis_ms"] = _elapsed_ms(analysis_started)
+
+    if analysis is None:
+        yield _line({"event": "error", "stage": "analysis", "detail": "Offer analysis failed after retry.", "timings": timings})
+    else:
+        yield _line({"event": "analysis", "data": analysis.model_dump(), "timings": timings})
+
+    timings["total_ms"] = _elapsed_ms(started)
+    yield _line({"event": "done", "timings": timings})
+
+
+def _line(event: dict) -> str:
+    return json.dumps(event, ensure_ascii=False) + "\n"
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
@@ -1,6 +1,6 @@
 """Pydantic schemas for the Agent API."""
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field, HttpUrl
 
 
 class JobOfferPayload(BaseModel):
@@ -64,7 +64,144 @@ class OfferAnalysisData(BaseModel):
     seniority_level: str = Field(default="")
 
 
+class OfferInsightData(BaseModel):
+    """Part of the analysis the language model is asked to produce."""
+
+    summary: str = Field(default="")
+    seniority_level: str = Field(default="")
+
+
 class OfferAnalysisResponse(BaseModel):
     """Top-level response envelope for the offer analysis endpoint."""
 
     data: OfferAnalysisData
+
+
+class OfferTermsRequest(BaseModel):
+    """Batch of offers whose tech stack and keywords should be extracted locally."""
+
+    offers: List[JobOfferPayload] = Field(default_factory=list, max_length=5000)
+
+
+class OfferTermsData(BaseModel):
+    """Lexicon-based terms extracted for a single offer."""
+
+    id: Optional[int] = Field(default=None)
+    tech_stack: List[str] = Field(default_factory=list)
+    keywords: List[str] = Field(default_factory=list)
+
+
+class OfferTermsResponse(BaseModel):
+    """Response envelope for the bulk term extraction endpoint."""
+
+    data: List[OfferTermsData]
+    lexicon_version: str
+
+
+class MatchScoresRequest(BaseModel):
+    """CV and candidate offers to rank without calling the language model."""
+
+    cv: CvPayload
+    offers: List[JobOfferPayload] = Field(default_factory=list, max_length=5000)
+    limit: Optional[int] = Field(default=None, ge=1)
+
+
+class OfferMatchData(BaseModel):
+    """Match score of a single offer against the CV."""
+
+    id: Optional[int] = Field(default=None)
+    match_score: float
+    text_score: float
+    skill_coverage: Optional[float] = Field(default=None)
+    matched_skills: List[str] = Field(default_factory=list)
+    missing_skills: List[str] = Field(default_factory=list)
+
+
+class MatchScoresResponse(BaseModel):
+    """Offers ranked from best to worst match."""
+
+    data: List[OfferMatchData]
+    lexicon_version: str
+
+
+class ScrapedOfferData(BaseModel):
+    """Offer fields returned by the Scraper API (its ``JobOfferData``)."""
+
+    title: str
+    company: str
+    location: Optional[str] = Field(default=None)
+    description: str
+    platform: str
+
+
+class OfferPipelineRequest(BaseModel):
+    """Offer URL to scrape and the candidate context used to analyse it."""
+
+    url: HttpUrl
+    cv: Optional[CvPayload] = None
+    profile: Optional[ProfilePayload] = None
+    template: Optional[TemplatePayload] = None
+
+
+class CvAnalysisRequest(BaseModel):
+    """CV to analyse, with optional profile context."""
+
+    cv: CvPayload
+    profile: Optional[ProfilePayload] = None
+
+
+class CvChunkInsight(BaseModel):
+    """Notes the language model produces for one section of a CV."""
+
+    summary: str = Field(default="")
+    strengths: List[str] = Field(default_factory=list)
+    weaknesses: List[str] = Field(default_factory=list)
+    suggestions: List[str] = Field(default_factory=list)
+
+
+class CvAnalysisData(BaseModel):
+    """CV analysis in the shape persisted by Rails' ``Ai::CvAnalyzer``."""
+
+    summary: str = Field(default="")
+    strengths: List[str] = Field(default_factory=list)
+    weaknesses: List[str] = Field(default_factory=list)
+    suggestions: List[str] = Field(default_factory=list)
+
+
+class CvAnalysisResponse(BaseModel):
+    """Response envelope for the CV analysis endpoint."""
+
+    data: CvAnalysisData
+    sections: int
+    cached_sections: int
+    failed_sections: List[str] = Field(default_factory=list)
+    partial: bool = False
+
+
+class JobApplicationRequest(BaseModel):
+    """Offer, candidate context and the user's template to personalise."""
+
+    job_offer: JobOfferPayload = Field(alias="job_offer")
+    template: TemplatePayload
+    cv: Optional[CvPayload] = None
+    profile: Optional[ProfilePayload] = None
+    stream: bool = False
+
+    class Config:
+        populate_by_name = True
+
+
+class JobApplicationData(BaseModel):
+    """Rendered letter and the value of each template slot."""
+
+    content: str
+    slots: Dict[str, str] = Field(default_factory=dict)
+
+
+class JobApplicationResponse(BaseModel):
+    """Response envelope for the job application endpoint."""
+
+    data: JobApplicationData
+    personalized_slots: int
+    generated_chars: int
+    template_cached: bool
@@ -0,0 +1 @@
+"""Standalone benchmarks for the scraper service (run with ``python -m``)."""
@@ -0,0 +1,74 @@
+"""Query latency of the offer similarity index at several index sizes.
+
+Usage (from ``python_services/``)::
+
+    python -m scraper_api.benchmarks.index_search --sizes 100000 1000000
+
+Synthetic unit vectors are written straight to the on-disk format, so the
+numbers measure search only (memory-mapped scan + top-k), not embedding.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from ..core.offer_index import DEFAULT_DIMENSION, OfferIndex
+
+WRITE_CHUNK_ROWS = 100_000
+
+
+def build_synthetic_index(directory: Path, size: int, dimension: int, seed: int = 0) -> OfferIndex:
+    rng = np.random.default_rng(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "meta.json").write_text(json.dumps({"dimension": dimension}))
+    with open(directory / "vectors.f32", "wb") as vectors, open(directory / "ids.jsonl", "w") as ids:
+        for start in range(0, size, WRITE_CHUNK_ROWS):
+            rows = min(WRITE_CHUNK_ROWS, size - start)
+            chunk = rng.standard_normal((rows, dimension), dtype=np.float32)
+            chunk /= np.linalg.norm(chunk, axis=1, keepdims=True)
+            vectors.write(chunk.tobytes())
+            ids.write("".join(f'{{"id": "offer-{start + row}"}}\n' for row in range(rows)))
+    return OfferIndex(directory, dimension)
+
+
+def measure(index: OfferIndex, dimension: int, batch: int, repeats: int, k: int) -> list[float]:
+    rng = np.random.default_rng(1)
+    timings = []
+    for _ in range(repeats):
+        queries = rng.standard_normal((batch, dimension), dtype=np.float32)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+        started = time.perf_counter()
+        index.search_vectors(queries, k)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--dimension", type=int, default=DEFAULT_DIMENSION)
+    parser.add_argument("--batches", type=int, nargs="+", default=[1, 32])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'offers':>10} {'batch':>6} {'p50 ms':>9} {'p95 ms':>9} {'ms/query':>9}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            index = build_synthetic_index(Path(tmp), size, args.dimension)
+            measure(index, args.dimension, 1, 2, args.k)  # warm the page cache
+            for batch in args.batches:
+                timings = sorted(measure(index, args.dimension, batch, args.repeats, args.k))
+                p50 = statistics.median(timings)
+                p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                print(f"{size:>10} {batch:>6} {p50:>9.1f} {p95:>9.1f} {p50 / batch:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Requests and load time per page with a blank context versus a saved profile.
+
+Usage (from ``python_services/``, needs Chromium and network access)::
+
+    python -m scraper_api.benchmarks.storage_state \\
+        https://www.welcometothejungle.com/fr/companies/acme/jobs/dev_paris --rounds 5
+
+Each URL is first scraped once from a blank context, whose storage state is
+captured as the platform profile; then ``--rounds`` scrapes run alternately
+from a blank context and from that profile. The same counters feed the
+``scraper_page_requests`` and ``scraper_page_load_seconds`` metrics.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+
+from ..core.browser import BrowserSession, SharedBrowser
+from ..core.exceptions import ScraperError
+from ..core.storage_state import StorageStateStore
+from ..main import BROWSER_CONFIG, PARSER_REGISTRY, detect_platform
+
+
+async def scrape_once(shared: SharedBrowser, url: str, storage_state: dict | None) -> tuple[int, float, bool]:
+    parser = PARSER_REGISTRY[detect_platform(url)]
+    session = BrowserSession(BROWSER_CONFIG, shared, storage_state)
+    started = time.perf_counter()
+    ok = True
+    async with session as page:
+        try:
+            await parser.parse(page, url)
+        except ScraperError:
+            ok = False
+    return session.requests, time.perf_counter() - started, ok
+
+
+async def run(urls: list[str], rounds: int) -> None:
+    shared = SharedBrowser(BROWSER_CONFIG)
+    print(f"{'platform':>9} {'profile':>8} {'pages':>6} {'ok':>4} {'requests p50':>13} {'load p50 s':>11}")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = StorageStateStore(tmp, ttl_s=3600)
+            for url in urls:
+                platform = detect_platform(url)
+                parser = PARSER_REGISTRY[platform]
+                async with BrowserSession(BROWSER_CONFIG, shared) as page:
+                    await parser.parse(page, url)
+                    await store.capture(platform, page.context, parser.cookie_domain)
+                profile = await store.get(platform, parser.cookie_domain)
+
+                samples: dict[str, list[tuple[int, float, bool]]] = {"blank": [], "reused": []}
+                for _ in range(rounds):
+                    samples["blank"].append(await scrape_once(shared, url, None))
+                    samples["reused"].append(await scrape_once(shared, url, profile))
+                for label, runs in samples.items():
+                    requests = statistics.median(run[0] for run in runs)
+                    load = statistics.median(run[1] for run in runs)
+                    ok = sum(run[2] for run in runs)
+                    print(f"{platform:>9} {label:>8} {len(runs):>6} {ok:>4} {requests:>13.0f} {load:>11.2f}")
+    finally:
+        await shared.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.urls, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,17 @@
 """Utilities to bootstrap a Playwright browser session."""
 from __future__ import annotations
 
+import asyncio
+import logging
 from dataclasses import dataclass
 from typing import Any
 
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+
+logger = logging.getLogger(__name__)
+
+# Delays between relaunch attempts of the shared browser; the last one repeats.
+RELAUNCH_BACKOFF_S = (1.0, 2.0, 5.0, 10.0, 30.0)
 
 
 @dataclass
@@ -40,22 +47,116 @@ class BrowserConfig:
         ]
 
 
-class BrowserSession:
-    """Async context manager returning a fresh Playwright page."""
+class SharedBrowser:
+    """One Chromium process reused by every session, relaunched if it dies.
+
+    Launching Chromium costs about a second per scrape; the service starts it
+    once from its lifespan hook and each request only opens a new context.
+    When the browser disconnects (a crash is more likely with
+    ``--single-process``), it is relaunched in the background with backoff
+    rather than on the next scrape: an unready instance gets no scrapes.
+    """
 
     def __init__(self, config: BrowserConfig):
         self._config = config
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+        self._lock = asyncio.Lock()
+        self._closing = False
+        self._relaunch: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    @property
+    def relaunching(self) -> bool:
+        return self._relaunch is not None and not self._relaunch.done()
+
+    def relaunch_soon(self) -> None:
+        """Relaunch in the background unless running, closing or already at it."""
+        if self._closing or self.running or self.relaunching:
+            return
+        self._relaunch = asyncio.get_running_loop().create_task(self._relaunch_until_up())
+
+    async def _relaunch_until_up(self) -> None:
+        attempt = 0
+        while not self._closing:
+            try:
+                await self.get()
+                return
+            except Exception:  # noqa: BLE001 - keep trying, readiness reports the outage
+                delay = RELAUNCH_BACKOFF_S[min(attempt, len(RELAUNCH_BACKOFF_S) - 1)]
+                logger.exception("Shared browser relaunch failed; retrying in %ss", delay)
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    async def get(self) -> Browser:
+        """Return the running browser, launching it first if needed."""
+        if self.running:
+            return self._browser
+        async with self._lock:
+            if not self.running:
+                if self._browser is not None:
+                    logger.warning("Shared browser disconnected; relaunching")
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(
+                    headless=self._config.headless,
+                    args=self._config.get_launch_args(),
+                )
+                self._browser.on("disconnected", lambda _browser: self.relaunch_soon())
+            return self._browser
+
+    async def close(self) -> None:
+        self._closing = True
+        if self._relaunch is not None:
+            self._relaunch.cancel()
+        async with self._lock:
+            try:
+                if self._browser is not None and self._browser.is_connected():
+                    await self._browser.close()
+            finally:
+                self._browser = None
+                if self._playwright is not None:
+                    await self._playwright.stop()
+                    self._playwright = None
+
+
+class BrowserSession:
+    """Async context manager returning a fresh Playwright page.
+
+    With a ``SharedBrowser`` only a new context is opened and closed; without
+    one, a dedicated browser is launched for the session. ``storage_state``
+    seeds the context with saved cookies and localStorage. ``requests``
+    counts the requests the page issued, blocked ones included.
+    """
+
+    def __init__(
+        self,
+        config: BrowserConfig,
+        shared: SharedBrowser | None = None,
+        storage_state: dict[str, Any] | None = None,
+    ):
+        self._config = config
+        self._shared = shared
+        self._storage_state = storage_state
+        self.requests = 0
         self._playwright = None
         self._browser: Browser | None = None
         self._context: BrowserContext | None = None
         self._page: Page | None = None
 
     async def __aenter__(self) -> Page:
-        self._playwright = await async_playwright().start()
-        self._browser = await self._playwright.chromium.launch(
-            headless=self._config.headless,
-            args=self._config.get_launch_args(),
-        )
+        if self._shared is not None:
+            browser = await self._shared.get()
+        else:
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(
+                headless=self._config.headless,
+                args=self._config.get_launch_args(),
+            )
+            browser = self._browser
         context_kwargs: dict[str, Any] = {
             "locale": "fr-FR",
             "viewport": {
@@ -65,11 +166,14 @@ class BrowserSession:
         }
         if self._config.user_agent:
             context_kwargs["user_agent"] = self._config.user_agent
-        self._context = await self._browser.new_context(**context_kwargs)
+        if self._storage_state is not None:
+            context_kwargs["storage_state"] = self._storage_state
+        self._context = await browser.new_context(**context_kwargs)
 
         # Block only heavy resources (images/media) to improve performance
         # Keep CSS/fonts/scripts to avoid bot detection
         async def route_handler(route):
+            self.requests += 1
             if route.request.resource_type in ("image", "media"):
                 await route.abort()
             else:
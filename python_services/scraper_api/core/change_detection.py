@@ -0,0 +1,281 @@
+"""Change detection for tracked offers, without rendering pages.
+
+A refresh probes each offer with a plain HTTP GET instead of Playwright:
+
+- the stored ``ETag``/``Last-Modified`` are sent back, so a ``304`` costs no
+  body at all;
+- ``404``/``410``, a redirect away from the offer, or a platform "closed"
+  marker mean the offer is closed; a redirect that only adds or changes a
+  locale prefix (``/fr/...`` -> ``/en/...``) stays on the offer;
+- anti-bot answers (a login/authwall redirect, HTTP ``999``/``429``) and
+  pages without embedded state are ``unknown``: the probe could not see the
+  offer, so it is neither closed nor changed and keeps its fingerprint;
+- otherwise the offer state embedded in the raw HTML (see
+  ``BaseParser.embedded_state``) is hashed and compared with the stored
+  fingerprint. The rest of the page is never hashed: counters such as
+  "N applicants" would flag every offer as changed.
+
+Fingerprints live in a small SQLite table keyed by canonical URL. Offers
+found changed keep ``needs_reanalysis`` set until the caller acknowledges
+them, so a missed refresh response does not lose the flag.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse, urlunparse
+
+import httpx
+
+from ..parsers.base import BaseParser
+
+UNCHANGED = "unchanged"
+CHANGED = "changed"
+CLOSED = "closed"
+NEW = "new"
+ERROR = "error"
+UNKNOWN = "unknown"
+
+SQL_BATCH_SIZE = 500
+
+BLOCKED_STATUSES = (429, 999)
+BLOCKED_PATH_PREFIXES = ("/authwall", "/login", "/uas/login", "/checkpoint", "/signup")
+
+_LOCALE_PREFIX_RE = re.compile(r"^/[a-z]{2}(?:[-_][a-z]{2})?(?=/|$)", re.IGNORECASE)
+_LINKEDIN_JOB_RE = re.compile(r"/jobs/view/(?:[^/]*-)?(\d+)")
+
+
+@dataclass
+class Fingerprint:
+    """Last known state of a tracked offer."""
+
+    url: str
+    platform: str
+    content_hash: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    status: str = NEW
+    needs_reanalysis: bool = False
+    checked_at: float = 0.0
+    changed_at: float | None = None
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of one cheap probe."""
+
+    status: str
+    content_hash: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    detail: str | None = None
+
+
+def canonical_url(url: str) -> str:
+    """Normalise an offer URL so tracking parameters do not split its history."""
+
+    parsed = urlparse(url.strip())
+    host = parsed.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+
+    if "linkedin." in host:
+        job_id = parse_qs(parsed.query).get("currentJobId", [None])[0]
+        match = _LINKEDIN_JOB_RE.search(parsed.path)
+        job_id = job_id or (match.group(1) if match else None)
+        if job_id:
+            return f"https://www.linkedin.com/jobs/view/{job_id}/"
+
+    path = parsed.path.rstrip("/") or "/"
+    return urlunparse(("https", host, path, "", "", ""))
+
+
+async def probe(client: httpx.AsyncClient, url: str, parser: BaseParser, known: Fingerprint | None) -> ProbeResult:
+    """Check ``url`` with a conditional GET and compare it to ``known``."""
+
+    headers = {}
+    if known is not None and known.etag:
+        headers["If-None-Match"] = known.etag
+    if known is not None and known.last_modified:
+        headers["If-Modified-Since"] = known.last_modified
+
+    try:
+        response = await client.get(url, headers=headers)
+    except httpx.HTTPError as exc:
+        return ProbeResult(status=ERROR, detail=f"{type(exc).__name__}: {exc}")
+
+    if response.status_code == 304 and known is not None:
+        return ProbeResult(UNCHANGED, known.content_hash, known.etag, known.last_modified)
+    if response.status_code in (404, 410):
+        return ProbeResult(CLOSED, detail=f"HTTP {response.status_code}")
+    if response.status_code in BLOCKED_STATUSES:
+        return ProbeResult(UNKNOWN, detail=f"Blocked by the platform (HTTP {response.status_code})")
+    if response.status_code != 200:
+        return ProbeResult(status=ERROR, detail=f"HTTP {response.status_code}")
+    if response.history and _blocked(str(response.url)):
+        return ProbeResult(UNKNOWN, detail=f"Redirected to a login wall ({response.url})")
+    if response.history and _left_offer(url, str(response.url)):
+        return ProbeResult(CLOSED, detail=f"Redirected to {response.url}")
+
+    state = parser.embedded_state(response.text)
+    if state is not None and state.closed:
+        return ProbeResult(CLOSED, detail="Offer marked as closed by the platform")
+    if state is None or not state.fields:
+        return ProbeResult(UNKNOWN, detail="No offer state embedded in the page")
+
+    content_hash = _hash(state.fields)
+    etag, last_modified = response.headers.get("etag"), response.headers.get("last-modified")
+    if known is None or known.content_hash is None:
+        return ProbeResult(NEW, content_hash, etag, last_modified)
+    status = UNCHANGED if content_hash == known.content_hash else CHANGED
+    return ProbeResult(status, content_hash, etag, last_modified)
+
+
+class FingerprintStore:
+    """SQLite table of offer fingerprints keyed by canonical URL."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS offer_fingerprints (
+                url TEXT PRIMARY KEY,
+                platform TEXT NOT NULL,
+                content_hash TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                status TEXT NOT NULL,
+                needs_reanalysis INTEGER NOT NULL DEFAULT 0,
+                checked_at REAL NOT NULL,
+                changed_at REAL
+            )
+            """
+        )
+        self._db.commit()
+
+    def get_many(self, urls: list[str]) -> dict[str, Fingerprint]:
+        rows = []
+        with self._lock:
+            for batch in _batches(urls):
+                rows += self._db.execute(
+                    f"SELECT * FROM offer_fingerprints WHERE url IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+        return {row[0]: _from_row(row) for row in rows}
+
+    def record(self, url: str, platform: str, result: ProbeResult, known: Fingerprint | None) -> Fingerprint:
+        """Merge a probe result into the stored fingerprint and return it."""
+
+        now = time.time()
+        if result.status in (ERROR, UNKNOWN):
+            return known or Fingerprint(url=url, platform=platform, status=result.status, checked_at=now)
+
+        fingerprint = Fingerprint(
+            url=url,
+            platform=platform,
+            content_hash=result.content_hash or (known.content_hash if known else None),
+            etag=result.etag,
+            last_modified=result.last_modified,
+            status=result.status,
+            needs_reanalysis=result.status == CHANGED or bool(known and known.needs_reanalysis),
+            checked_at=now,
+            changed_at=known.changed_at if known else None,
+        )
+        if result.status == CHANGED or (result.status == CLOSED and (known is None or known.status != CLOSED)):
+            fingerprint.changed_at = now
+        with self._lock:
+            self._db.execute(
+                """
+                INSERT INTO offer_fingerprints VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    platform = excluded.platform,
+                    content_hash = excluded.content_hash,
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    status = excluded.status,
+                    needs_reanalysis = excluded.needs_reanalysis,
+                    checked_at = excluded.checked_at,
+                    changed_at = excluded.changed_at
+                """,
+                (
+                    fingerprint.url,
+                    fingerprint.platform,
+                    fingerprint.content_hash,
+                    fingerprint.etag,
+                    fingerprint.last_modified,
+                    fingerprint.status,
+                    int(fingerprint.needs_reanalysis),
+                    fingerprint.checked_at,
+                    fingerprint.changed_at,
+                ),
+            )
+            self._db.commit()
+        return fingerprint
+
+    def acknowledge(self, urls: list[str]) -> int:
+        """Clear ``needs_reanalysis`` once the caller has re-analysed the offers."""
+
+        updated = 0
+        with self._lock:
+            for batch in _batches(urls):
+                updated += self._db.execute(
+                    f"UPDATE offer_fingerprints SET needs_reanalysis = 0 WHERE url IN ({','.join('?' * len(batch))})",
+                    batch,
+                ).rowcount
+            self._db.commit()
+        return updated
+
+
+def _batches(urls: list[str], size: int = SQL_BATCH_SIZE) -> list[list[str]]:
+    return [urls[start : start + size] for start in range(0, len(urls), size)]
+
+
+def _from_row(row: tuple) -> Fingerprint:
+    url, platform, content_hash, etag, last_modified, status, needs_reanalysis, checked_at, changed_at = row
+    return Fingerprint(
+        url=url,
+        platform=platform,
+        content_hash=content_hash,
+        etag=etag,
+        last_modified=last_modified,
+        status=status,
+        needs_reanalysis=bool(needs_reanalysis),
+        checked_at=checked_at,
+        changed_at=changed_at,
+    )
+
+
+def _left_offer(requested: str, final: str) -> bool:
+    """True when a redirect landed outside the offer (search page, company page...).
+
+    Locale prefixes are ignored, so ``/fr/companies/x/jobs/y`` redirecting to
+    ``/en/companies/x/jobs/y`` is still the same offer.
+    """
+
+    return _without_locale(canonical_url(requested)) != _without_locale(canonical_url(final))
+
+
+def _without_locale(url: str) -> str:
+    parsed = urlparse(url)
+    return urlunparse(parsed._replace(path=_LOCALE_PREFIX_RE.sub("", parsed.path) or "/"))
+
+
+def _blocked(url: str) -> bool:
+    """True for login walls served instead of the offer (LinkedIn authwall...)."""
+
+    path = urlparse(url).path.lower()
+    return any(path == prefix or path.startswith(f"{prefix}/") for prefix in BLOCKED_PATH_PREFIXES)
+
+
+def _hash(value: object) -> str:
+    payload = value if isinstance(value, str) else json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -0,0 +1,75 @@
+"""Request deadlines shared by every wait of a scrape.
+
+A ``Deadline`` is installed in a context variable for the duration of a
+request. Parsers ask ``budget_ms(cap)`` for each wait instead of using fixed
+timeouts: they get the smaller of their usual cap and the time left, and
+``DeadlineExceeded`` once nothing is left, so a scrape the caller has given
+up on stops holding a browser context.
+"""
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator
+
+from .exceptions import DeadlineExceeded
+
+# Below this, a wait cannot do anything useful; treat the budget as spent.
+MIN_BUDGET_MS = 50
+
+_CURRENT: ContextVar["Deadline | None"] = ContextVar("scrape_deadline", default=None)
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """Absolute expiry on the monotonic clock, and what set it."""
+
+    expires_at: float
+    source: str
+
+    @classmethod
+    def after_ms(cls, timeout_ms: float, source: str) -> "Deadline":
+        return cls(time.monotonic() + timeout_ms / 1000, source)
+
+    def remaining_ms(self) -> float:
+        return max(0.0, (self.expires_at - time.monotonic()) * 1000)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining_ms() < MIN_BUDGET_MS
+
+
+def earliest(*deadlines: Deadline | None) -> Deadline | None:
+    candidates = [deadline for deadline in deadlines if deadline is not None]
+    return min(candidates, key=lambda deadline: deadline.expires_at) if candidates else None
+
+
+def current_deadline() -> Deadline | None:
+    return _CURRENT.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline | None) -> Iterator[Deadline | None]:
+    token = _CURRENT.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _CURRENT.reset(token)
+
+
+def budget_ms(cap_ms: int | None = None) -> int | None:
+    """Timeout to use for one wait: ``cap_ms`` bounded by the current deadline.
+
+    Without a cap, the time left is returned, or None (the page default
+    timeout) when no deadline is set.
+    """
+
+    deadline = _CURRENT.get()
+    if deadline is None:
+        return cap_ms
+    remaining = deadline.remaining_ms()
+    if remaining < MIN_BUDGET_MS:
+        raise DeadlineExceeded(f"Deadline exceeded ({deadline.source})")
+    return int(remaining if cap_ms is None else min(cap_ms, remaining))
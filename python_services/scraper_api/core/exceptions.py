@@ -19,3 +19,7 @@ class ParsingError(ScraperError):
 
 class AuthenticationError(ScraperError):
     """Raised when the platform requires authentication to view the content."""
+
+
+class DeadlineExceeded(ScraperError):
+    """Raised when the request's time budget is spent before the scrape finished."""
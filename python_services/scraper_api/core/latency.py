@@ -0,0 +1,73 @@
+"""Per-platform scrape latencies and the timeouts derived from them.
+
+Each platform keeps a window of recent scrape durations. Once enough samples
+are in, its time budget is ``p99 x factor``, clamped to ``[min_ms, max_ms]``,
+so a platform that usually answers in 3 s fails after a few seconds instead
+of the static page timeout. Until then the budget is ``default_ms``, the
+configured page timeout: ``max_ms`` only caps the adaptive value, so a cold
+start does not give every scrape the widest budget.
+
+Scrapes cut short by that budget are recorded as censored samples equal to
+the budget: otherwise only fast scrapes would be learned and the budget would
+keep shrinking until the slow-but-valid pages always time out.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class LatencyConfig:
+    """Bounds of the adaptive budget and the budget used before it is known."""
+
+    default_ms: int = 25_000
+    factor: float = 2.0
+    min_ms: int = 5_000
+    max_ms: int = 40_000
+    min_samples: int = 20
+    window: int = 200
+
+
+class LatencyTracker:
+    """Thread-safe sliding windows of scrape durations, one per platform."""
+
+    def __init__(self, config: LatencyConfig):
+        self.config = config
+        self._samples: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, platform: str, duration_ms: float) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(platform, deque(maxlen=self.config.window))
+            samples.append(duration_ms)
+
+    def percentile(self, platform: str, quantile: float = 0.99) -> float | None:
+        with self._lock:
+            samples = sorted(self._samples.get(platform, ()))
+        if len(samples) < self.config.min_samples:
+            return None
+        return samples[min(len(samples) - 1, math.ceil(quantile * len(samples)) - 1)]
+
+    def timeout_ms(self, platform: str) -> int:
+        """Budget for the next scrape of ``platform``; ``default_ms`` until enough samples exist."""
+
+        p99 = self.percentile(platform)
+        if p99 is None:
+            return self.config.default_ms
+        return int(min(self.config.max_ms, max(self.config.min_ms, p99 * self.config.factor)))
+
+    def snapshot(self) -> dict[str, dict[str, float | int | None]]:
+        with self._lock:
+            platforms = {platform: len(samples) for platform, samples in self._samples.items()}
+        return {
+            platform: {
+                "samples": count,
+                "p50_ms": self.percentile(platform, 0.5),
+                "p99_ms": self.percentile(platform),
+                "timeout_ms": self.timeout_ms(platform),
+            }
+            for platform, count in platforms.items()
+        }
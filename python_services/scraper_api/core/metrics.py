@@ -0,0 +1,32 @@
+"""Prometheus metrics of the Scraper API, served on ``/metrics``."""
+from __future__ import annotations
+
+from prometheus_client import Counter, Histogram
+
+LOAD_BUCKETS = (0.5, 1, 2, 3, 5, 8, 12, 20, 30, 45)
+REQUEST_BUCKETS = (5, 10, 20, 40, 60, 80, 120, 160, 240, 320)
+
+# ``storage_state`` is "reused" when the context started from a saved profile,
+# "blank" otherwise; comparing the two series measures what profiles save.
+SCRAPES = Counter(
+    "scraper_scrapes_total",
+    "Scrapes by platform, storage state and outcome.",
+    ["platform", "storage_state", "outcome"],
+)
+PAGE_LOAD_SECONDS = Histogram(
+    "scraper_page_load_seconds",
+    "Time to load and extract one page, context creation included.",
+    ["platform", "storage_state"],
+    buckets=LOAD_BUCKETS,
+)
+PAGE_REQUESTS = Histogram(
+    "scraper_page_requests",
+    "Network requests issued while loading one page, blocked ones included.",
+    ["platform", "storage_state"],
+    buckets=REQUEST_BUCKETS,
+)
+STORAGE_STATE_EVENTS = Counter(
+    "scraper_storage_state_events_total",
+    "Storage state profiles captured or invalidated, by platform.",
+    ["platform", "event"],
+)
@@ -0,0 +1,265 @@
+"""Persistent local similarity index over scraped offers.
+
+Offers are embedded with a signed hashing vectorizer (word unigrams and
+bigrams, no model or vocabulary to ship) and stored on disk as:
+
+- ``vectors.f32``: a row-major float32 matrix, memory-mapped for search and
+  grown by appending rows;
+- ``ids.jsonl``: one JSON line per row with the offer id and display fields;
+- ``meta.json``: the vector dimension, checked when the index is reopened.
+
+The index is append-only: re-indexing an id appends a new row and the older
+rows are masked out of search results. Appends take an ``flock`` so several
+workers can share one directory; readers pick up new rows on their next call.
+Vectors are written before their ids, so an interrupted append can only
+leave vector rows (or a partial id line) without a complete id; the next
+append truncates that tail before writing, so row numbers never shift.
+"""
+from __future__ import annotations
+
+import fcntl
+import json
+import logging
+import math
+import os
+import re
+import threading
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from ..schemas import JobOfferData
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIMENSION = 512
+SEARCH_CHUNK_ROWS = 65_536
+FIELD_WEIGHTS = {"title": 3.0, "company": 1.0, "location": 1.0, "description": 1.0}
+
+_TOKEN_RE = re.compile(r"[\w+#]+(?:\.[\w]+)*")
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """An indexed offer and its cosine similarity to the query."""
+
+    id: str
+    score: float
+    title: str | None = None
+    company: str | None = None
+
+
+class HashingVectorizer:
+    """Stateless text embedding based on the hashing trick."""
+
+    def __init__(self, dimension: int = DEFAULT_DIMENSION):
+        self.dimension = dimension
+
+    def embed_offer(self, offer: JobOfferData) -> np.ndarray:
+        features: Counter[str] = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            for feature, count in _features(getattr(offer, field, None)).items():
+                features[feature] += weight * count
+        return self._project(features)
+
+    def embed_text(self, text: str) -> np.ndarray:
+        return self._project(_features(text))
+
+    def _project(self, features: Counter[str]) -> np.ndarray:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for feature, count in features.items():
+            digest = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if digest & 0x80000000 else -1.0
+            vector[digest % self.dimension] += sign * (1.0 + math.log(count))
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+
+class OfferIndex:
+    """Append-only on-disk matrix of offer embeddings with batched top-k search."""
+
+    def __init__(self, directory: str | os.PathLike[str], dimension: int = DEFAULT_DIMENSION):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.dimension = self._load_dimension(dimension)
+        self.vectorizer = HashingVectorizer(self.dimension)
+
+        self._vectors_path = self.directory / "vectors.f32"
+        self._ids_path = self.directory / "ids.jsonl"
+        self._lock_path = self.directory / ".lock"
+        self._vectors_path.touch(exist_ok=True)
+        self._ids_path.touch(exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._rows: list[dict[str, str | None]] = []
+        self._latest_row: dict[str, int] = {}
+        self._ids_offset = 0
+        self._matrix: np.memmap | None = None
+        self._active = np.zeros(0, dtype=bool)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._latest_row)
+
+    def add(self, items: Iterable[tuple[str, JobOfferData]]) -> int:
+        """Embed and append offers; returns the number of rows written."""
+
+        items = list(items)
+        if not items:
+            return 0
+
+        vectors = np.vstack([self.vectorizer.embed_offer(offer) for _, offer in items]).astype(np.float32)
+        lines = "".join(
+            json.dumps({"id": offer_id, "title": offer.title, "company": offer.company}, ensure_ascii=False) + "\n"
+            for offer_id, offer in items
+        )
+
+        with self._lock, open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                self._truncate_uncommitted()
+                with open(self._vectors_path, "ab") as handle:
+                    handle.write(vectors.tobytes())
+                with open(self._ids_path, "a", encoding="utf-8") as handle:
+                    handle.write(lines)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            self._refresh()
+        return len(items)
+
+    def search(self, query: str, k: int = 10) -> list[SearchHit]:
+        """Free-text search over the indexed offers."""
+
+        return self.search_vectors(self.vectorizer.embed_text(query)[None, :], k)[0]
+
+    def similar(self, offer_id: str, k: int = 10) -> list[SearchHit] | None:
+        """Offers closest to an already indexed one, or None if the id is unknown."""
+
+        with self._lock:
+            self._refresh()
+            row = self._latest_row.get(offer_id)
+            if row is None:
+                return None
+            vector = np.array(self._matrix[row])
+        hits = self.search_vectors(vector[None, :], k + 1)[0]
+        return [hit for hit in hits if hit.id != offer_id][:k]
+
+    def search_vectors(self, queries: np.ndarray, k: int = 10) -> list[list[SearchHit]]:
+        """Top-k cosine search for a batch of L2-normalised query vectors."""
+
+        with self._lock:
+            self._refresh()
+            matrix, active, rows = self._matrix, self._active, self._rows
+
+        if matrix is None or not len(rows) or k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        queries = np.ascontiguousarray(queries, dtype=np.float32)
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+
+        for start in range(0, len(matrix), SEARCH_CHUNK_ROWS):
+            chunk = np.asarray(matrix[start : start + SEARCH_CHUNK_ROWS])
+            scores = queries @ chunk.T
+            scores[:, ~active[start : start + len(chunk)]] = -np.inf
+
+            take = min(k, scores.shape[1])
+            candidates = np.argpartition(-scores, take - 1, axis=1)[:, :take]
+            candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+
+            best_scores = np.concatenate([best_scores, candidate_scores], axis=1)
+            best_rows = np.concatenate([best_rows, candidates + start], axis=1)
+            if best_scores.shape[1] > k:
+                keep = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+
+        results = []
+        for scores, row_ids in zip(best_scores, best_rows):
+            order = np.argsort(-scores)
+            hits = []
+            for position in order:
+                if not np.isfinite(scores[position]):
+                    continue
+                meta = rows[row_ids[position]]
+                hits.append(
+                    SearchHit(
+                        id=str(meta["id"]),
+                        score=round(float(scores[position]), 4),
+                        title=meta.get("title"),
+                        company=meta.get("company"),
+                    )
+                )
+            results.append(hits)
+        return results
+
+    def _refresh(self) -> None:
+        """Pick up rows appended since the last call (by this or another process)."""
+
+        with open(self._ids_path, "r", encoding="utf-8") as handle:
+            handle.seek(self._ids_offset)
+            chunk = handle.read()
+        complete = chunk[: chunk.rfind("\n") + 1]
+        if complete:
+            self._ids_offset += len(complete.encode("utf-8"))
+            for line in complete.splitlines():
+                self._rows.append(json.loads(line))
+
+        row_bytes = self.dimension * 4
+        row_count = min(len(self._rows), os.path.getsize(self._vectors_path) // row_bytes)
+        if self._matrix is not None and len(self._matrix) == row_count:
+            return
+
+        if len(self._rows) > row_count:
+            logger.warning("Offer index has %s ids but only %s vectors; ignoring the tail", len(self._rows), row_count)
+        if row_count == 0:
+            self._matrix = None
+            self._active = np.zeros(0, dtype=bool)
+            return
+
+        self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(row_count, self.dimension))
+        previous = len(self._active)
+        self._active = np.concatenate([self._active, np.ones(row_count - previous, dtype=bool)])
+        for row in range(previous, row_count):
+            offer_id = str(self._rows[row]["id"])
+            superseded = self._latest_row.get(offer_id)
+            if superseded is not None:
+                self._active[superseded] = False
+            self._latest_row[offer_id] = row
+
+    def _truncate_uncommitted(self) -> None:
+        """Drop what a failed append left past the last complete id line; call under the flock."""
+
+        if os.path.getsize(self._ids_path) > self._ids_offset:
+            logger.warning("Offer index %s: dropping a partial id line", self.directory)
+            os.truncate(self._ids_path, self._ids_offset)
+        committed = len(self._rows) * self.dimension * 4
+        size = os.path.getsize(self._vectors_path)
+        if size > committed:
+            logger.warning("Offer index %s: dropping %s bytes of vectors without ids", self.directory, size - committed)
+            os.truncate(self._vectors_path, committed)
+
+    def _load_dimension(self, requested: int) -> int:
+        meta_path = self.directory / "meta.json"
+        if meta_path.exists():
+            stored = int(json.loads(meta_path.read_text())["dimension"])
+            if stored != requested:
+                logger.warning("Offer index at %s uses dimension %s; ignoring requested %s", self.directory, stored, requested)
+            return stored
+        meta_path.write_text(json.dumps({"dimension": requested}))
+        return requested
+
+
+def _features(text: str | None) -> Counter[str]:
+    if not text:
+        return Counter()
+    tokens = _TOKEN_RE.findall(text.lower())
+    features = Counter(tokens)
+    features.update(f"{left} {right}" for left, right in zip(tokens, tokens[1:]))
+    return features
@@ -0,0 +1,144 @@
+"""Per-platform browser storage state (cookies and localStorage) kept on disk.
+
+A blank context makes every page load go through the cookie consent banner
+and the anonymous-session bootstrap of the platform again. The first
+successful scrape of a platform captures its context's storage state (after
+dismissing the consent banner, see ``BaseParser.consent_selectors``); later
+contexts are created from it.
+
+A profile is refreshed, i.e. ignored until the next successful scrape
+captures a new one, once it is older than the TTL, once one of the
+platform's own cookies has expired, or after a scrape that used it failed to
+extract the offer. Files hold session cookies and are written ``0600``.
+
+Profiles are read from disk off the event loop, and at most every
+``RECHECK_INTERVAL_S`` while a platform has no usable one in memory, so
+a profile captured by another worker is picked up without a file read on
+every scrape.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from playwright.async_api import BrowserContext
+
+logger = logging.getLogger(__name__)
+
+# Cookies expiring within this margin already count as expired.
+EXPIRY_MARGIN_S = 300
+# How often a missing or stale profile is looked up on disk again.
+RECHECK_INTERVAL_S = 30.0
+
+
+@dataclass
+class StoredState:
+    """A captured storage state and when it was captured."""
+
+    state: dict[str, Any]
+    captured_at: float
+
+
+class StorageStateStore:
+    """One Playwright ``storage_state`` JSON file per platform."""
+
+    def __init__(self, directory: str | os.PathLike[str], ttl_s: float):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl_s = ttl_s
+        self._states: dict[str, StoredState | None] = {}
+        self._checked_at: dict[str, float] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def get(self, platform: str, cookie_domain: str | None = None) -> dict[str, Any] | None:
+        """Return the platform's storage state, or None when it is missing or stale."""
+
+        stored = self._states.get(platform)
+        if self._usable(stored, cookie_domain):
+            return stored.state
+        if time.monotonic() - self._checked_at.get(platform, float("-inf")) < RECHECK_INTERVAL_S:
+            return None
+        # Another worker may have captured a fresh profile since the last look.
+        stored = await self._reload(platform)
+        return stored.state if self._usable(stored, cookie_domain) else None
+
+    async def needs_capture(self, platform: str, cookie_domain: str | None = None) -> bool:
+        stored = self._states.get(platform)
+        if not self._usable(stored, cookie_domain):
+            stored = await self._reload(platform)
+        return not self._usable(stored, cookie_domain)
+
+    async def capture(self, platform: str, context: BrowserContext, cookie_domain: str | None = None) -> bool:
+        """Save ``context``'s storage state for ``platform`` unless a fresh one already exists."""
+
+        lock = self._locks.setdefault(platform, asyncio.Lock())
+        async with lock:
+            if not await self.needs_capture(platform, cookie_domain):
+                return False
+            state = await context.storage_state()
+            stored = StoredState(state=state, captured_at=time.time())
+            await asyncio.to_thread(self._write, platform, stored)
+            self._states[platform] = stored
+            self._checked_at[platform] = time.monotonic()
+        logger.info("Captured %s storage state (%d cookies)", platform, len(state.get("cookies", [])))
+        return True
+
+    def invalidate(self, platform: str) -> None:
+        """Drop the platform's profile; the next successful scrape captures a new one."""
+
+        self._states[platform] = None
+        self._checked_at[platform] = time.monotonic()
+        self._path(platform).unlink(missing_ok=True)
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        return {
+            platform: {"age_s": round(time.time() - stored.captured_at), "cookies": len(stored.state.get("cookies", []))}
+            for platform, stored in self._states.items()
+            if stored is not None
+        }
+
+    async def _reload(self, platform: str) -> StoredState | None:
+        stored = self._states[platform] = await asyncio.to_thread(self._load, platform)
+        self._checked_at[platform] = time.monotonic()
+        return stored
+
+    def _usable(self, stored: StoredState | None, cookie_domain: str | None) -> bool:
+        return stored is not None and not self._stale(stored, cookie_domain)
+
+    def _stale(self, stored: StoredState, cookie_domain: str | None) -> bool:
+        now = time.time()
+        if now - stored.captured_at > self.ttl_s:
+            return True
+        for cookie in stored.state.get("cookies", []):
+            expires = cookie.get("expires", -1)
+            first_party = cookie_domain is None or cookie.get("domain", "").lstrip(".").endswith(cookie_domain)
+            if first_party and 0 < expires < now + EXPIRY_MARGIN_S:
+                return True
+        return False
+
+    def _load(self, platform: str) -> StoredState | None:
+        try:
+            data = json.loads(self._path(platform).read_text(encoding="utf-8"))
+            return StoredState(state=data["state"], captured_at=float(data["captured_at"]))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning("Ignoring unreadable %s storage state", platform)
+            return None
+
+    def _write(self, platform: str, stored: StoredState) -> None:
+        path = self._path(platform)
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, "w", encoding="utf-8") as handle:
+            json.dump({"state": stored.state, "captured_at": stored.captured_at}, handle)
+        os.replace(temporary, path)
+
+    def _path(self, platform: str) -> Path:
+        return self.directory / f"{platform}.json"
@@ -1,30 +1,117 @@
 """FastAPI application exposing the job offer scraping endpoint."""
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
+import tempfile
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
 from urllib.parse import urlparse
 
+import httpx
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from prometheus_client import make_asgi_app
 
-from .core.browser import BrowserConfig, BrowserSession
-from .core.exceptions import NetworkError, ParsingError, UnsupportedPlatformError
+from shared.admission import AdmissionController, AdmissionRejected, admission_rejected_handler
+from shared.coordination import SharedCache, SharedSemaphore, SharedStore, SingleFlight
+from shared.env import parse_float, parse_int
+from shared.profiling import ProfileStore, ProfilingMiddleware, profiles_router, profiling_available
+
+from .core.browser import BrowserConfig, BrowserSession, SharedBrowser
+from .core.change_detection import CHANGED, ERROR, FingerprintStore, canonical_url, probe
+from .core.deadline import Deadline, deadline_scope, earliest
+from .core.exceptions import DeadlineExceeded, NetworkError, ParsingError, UnsupportedPlatformError
+from .core.latency import LatencyConfig, LatencyTracker
+from .core.metrics import PAGE_LOAD_SECONDS, PAGE_REQUESTS, SCRAPES, STORAGE_STATE_EVENTS
+from .core.storage_state import StorageStateStore
 from .parsers import LinkedinParser, WttjParser
-from .schemas import JobOfferData, ScrapeRequest
+from .schemas import (
+    AcknowledgeOffersRequest,
+    AcknowledgeOffersResponse,
+    IndexOffersRequest,
+    IndexOffersResponse,
+    IndexSearchHit,
+    IndexSearchRequest,
+    IndexSearchResponse,
+    JobOfferData,
+    RefreshedOffer,
+    RefreshOffersRequest,
+    RefreshOffersResponse,
+    ScrapeRequest,
+)
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+    from .core.offer_index import OfferIndex
+    from .core.page_archive import PageArchive
+    from .parsers.base import BaseParser
 
 
 load_dotenv(dotenv_path="../../.env")
 
 logger = logging.getLogger(__name__)
 
+READINESS: dict[str, object] = {"status": "starting", "detail": None, "warmup_seconds": None}
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Launch the shared browser in the background; readiness flips once it is up."""
+    warmup = asyncio.create_task(_warm_up())
+    yield
+    warmup.cancel()
+    if SHARED_BROWSER is not None:
+        await SHARED_BROWSER.close()
+
+
+async def _warm_up() -> None:
+    started = time.perf_counter()
+    READINESS["status"] = "warming"
+    try:
+        if SHARED_BROWSER is not None:
+            await SHARED_BROWSER.get()
+    except Exception as exc:  # noqa: BLE001 - readiness must report any failure
+        READINESS.update(status="failed", detail=str(exc))
+        logger.exception("Scraper API warm-up failed")
+        SHARED_BROWSER.relaunch_soon()
+    else:
+        READINESS.update(status="ready", detail=None)
+    READINESS["warmup_seconds"] = round(time.perf_counter() - started, 3)
+    logger.info("Scraper API warm-up finished: %s in %ss", READINESS["status"], READINESS["warmup_seconds"])
+
+
 app = FastAPI(
     title="Job Hunt Scraper API",
     description="Web scraping service for job offers using Playwright",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+app.mount("/metrics", make_asgi_app())
+app.add_exception_handler(AdmissionRejected, admission_rejected_handler)
+
+# Opt-in profiling: requests sent with ``X-Profile: $SCRAPER_PROFILING_TOKEN`` or
+# sampled at SCRAPER_PROFILING_SAMPLE_RATE are saved as speedscope files.
+PROFILING_TOKEN = os.getenv("SCRAPER_PROFILING_TOKEN") or None
+PROFILING_SAMPLE_RATE = parse_float(os.getenv("SCRAPER_PROFILING_SAMPLE_RATE"), 0.0)
+if (PROFILING_TOKEN or PROFILING_SAMPLE_RATE > 0) and profiling_available():
+    PROFILES = ProfileStore(os.getenv("SCRAPER_PROFILING_DIR", os.path.join(tempfile.gettempdir(), "scraper_api_profiles")))
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=PROFILES,
+        admin_token=PROFILING_TOKEN,
+        sample_rate=PROFILING_SAMPLE_RATE,
+    )
+    app.include_router(profiles_router(PROFILES, PROFILING_TOKEN))
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -66,6 +153,81 @@ BROWSER_CONFIG = BrowserConfig(
     launch_args=list(_parse_launch_args(os.getenv("SCRAPER_LAUNCH_ARGS"))) if os.getenv("SCRAPER_LAUNCH_ARGS") else None,
 )
 
+SHARED_BROWSER = (
+    SharedBrowser(BROWSER_CONFIG)
+    if os.getenv("SCRAPER_SHARED_BROWSER", "true").lower() not in {"0", "false", "no"}
+    else None
+)
+
+
+def _open_offer_index() -> OfferIndex | None:
+    if not os.getenv("SCRAPER_INDEX_DIR"):
+        return None
+    # NumPy is only needed when the index is enabled.
+    from .core.offer_index import DEFAULT_DIMENSION, OfferIndex
+
+    return OfferIndex(os.environ["SCRAPER_INDEX_DIR"], parse_int(os.getenv("SCRAPER_INDEX_DIM"), DEFAULT_DIMENSION))
+
+
+OFFER_INDEX = _open_offer_index()
+
+LATENCY = LatencyTracker(
+    LatencyConfig(
+        default_ms=BROWSER_CONFIG.page_timeout,
+        factor=float(os.getenv("SCRAPER_TIMEOUT_FACTOR", "2.0")),
+        min_ms=_parse_timeout(os.getenv("SCRAPER_TIMEOUT_MIN_MS"), 5_000),
+        max_ms=_parse_timeout(os.getenv("SCRAPER_TIMEOUT_MAX_MS"), 40_000),
+        min_samples=parse_int(os.getenv("SCRAPER_TIMEOUT_MIN_SAMPLES"), 20),
+    )
+)
+# Playwright's own timeouts fire first; this only stops calls that take no timeout.
+DEADLINE_GRACE_S = 1.0
+
+# State shared by the workers of the host: browser slots and scrape results.
+SHARED_STATE = SharedStore(os.environ["SCRAPER_SHARED_STATE_DB"]) if os.getenv("SCRAPER_SHARED_STATE_DB") else None
+
+# Every scrape, refresh re-extractions included, holds one of these browser slots.
+BROWSER_SLOTS = AdmissionController(
+    "browser",
+    limit=parse_int(os.getenv("SCRAPER_MAX_BROWSERS"), 4),
+    queue_size=parse_int(os.getenv("SCRAPER_QUEUE_SIZE"), 8, minimum=0),
+    queue_timeout_s=_parse_timeout(os.getenv("SCRAPER_QUEUE_TIMEOUT_MS"), 5_000) / 1000,
+    shared=(
+        SharedSemaphore(SHARED_STATE, "browser", parse_int(os.getenv("SCRAPER_HOST_MAX_BROWSERS"), 4))
+        if SHARED_STATE is not None
+        else None
+    ),
+)
+
+# Concurrent scrapes of one offer, from any worker, share a single page load.
+SCRAPE_RESULTS = (
+    SingleFlight(SharedCache(SHARED_STATE, "scrape", _parse_timeout(os.getenv("SCRAPER_RESULT_TTL_S"), 600)))
+    if SHARED_STATE is not None
+    else None
+)
+
+STORAGE_STATES = (
+    StorageStateStore(os.environ["SCRAPER_STORAGE_STATE_DIR"], _parse_timeout(os.getenv("SCRAPER_STORAGE_STATE_TTL_S"), 6 * 3600))
+    if os.getenv("SCRAPER_STORAGE_STATE_DIR")
+    else None
+)
+
+
+def _open_page_archive() -> PageArchive | None:
+    if not os.getenv("SCRAPER_ARCHIVE_DIR"):
+        return None
+    # lxml is only needed when pages are archived.
+    from .core.page_archive import PageArchive
+
+    return PageArchive(os.environ["SCRAPER_ARCHIVE_DIR"])
+
+
+PAGE_ARCHIVE = _open_page_archive()
+FINGERPRINT_STORE = FingerprintStore(os.environ["SCRAPER_FINGERPRINT_DB"]) if os.getenv("SCRAPER_FINGERPRINT_DB") else None
+REFRESH_PROBE_CONCURRENCY = parse_int(os.getenv("SCRAPER_REFRESH_CONCURRENCY"), 16)
+REFRESH_SCRAPE_CONCURRENCY = parse_int(os.getenv("SCRAPER_REFRESH_SCRAPE_CONCURRENCY"), 2)
+REFRESH_PROBE_TIMEOUT_MS = _parse_timeout(os.getenv("SCRAPER_PROBE_TIMEOUT_MS"), 10_000)
+
 
 def detect_platform(url: str) -> str:
     host = urlparse(url).netloc.lower()
@@ -92,8 +254,30 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/health/ready")
+async def readiness():
+    """Readiness probe: OK once the shared browser is running and browser slots are not saturated.
+
+    A shared browser found down (after warm-up) is relaunched in the
+    background, so the instance becomes ready again without traffic.
+    """
+    body = {**READINESS, "admission": BROWSER_SLOTS.status(), "timeouts": LATENCY.snapshot()}
+    if SHARED_BROWSER is not None:
+        if not SHARED_BROWSER.running and READINESS["status"] not in ("starting", "warming"):
+            SHARED_BROWSER.relaunch_soon()
+        ready = SHARED_BROWSER.running
+        body["browser"] = "running" if ready else "relaunching" if SHARED_BROWSER.relaunching else "down"
+    else:
+        ready = READINESS["status"] == "ready"
+    ready = ready and not BROWSER_SLOTS.saturated
+    if STORAGE_STATES is not None:
+        body["storage_states"] = STORAGE_STATES.summary()
+    return JSONResponse(body, status_code=200 if ready else 503)
+
+
 @app.post("/scrape/offer", response_model=JobOfferData)
-async def scrape_offer(request: ScrapeRequest):
+async def scrape_offer(request: ScrapeRequest, x_request_timeout_ms: int | None = Header(default=None)):
+    """Scrape one offer; ``X-Request-Timeout-Ms`` is the time the caller is still willing to wait."""
     url = str(request.url)
 
     try:
@@ -101,19 +285,213 @@ async def scrape_offer(request: ScrapeRequest):
     except UnsupportedPlatformError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    parser = PARSER_REGISTRY[platform]
+    caller_deadline = Deadline.after_ms(x_request_timeout_ms, "caller deadline") if x_request_timeout_ms is not None else None
+    if SCRAPE_RESULTS is None:
+        offer, cached = await _scrape(url, platform, caller_deadline), False
+    else:
+        offer, cached = await _scrape_once(url, platform, caller_deadline)
+    if OFFER_INDEX is not None and not cached:
+        try:
+            await run_in_threadpool(OFFER_INDEX.add, [(url, offer)])
+        except OSError:  # pragma: no cover - indexing must never fail a scrape
+            logger.exception("Failed to index scraped offer %s", url)
+
+    return offer
+
+
+async def _scrape_once(url: str, platform: str, caller_deadline: Deadline | None) -> tuple[JobOfferData, bool]:
+    """Scrape through ``SCRAPE_RESULTS``: recent results and in-flight scrapes are shared by URL.
+
+    The shared scrape runs under the platform budget only, in its own task:
+    each caller applies its deadline to its own wait, so a caller giving up
+    early neither cuts the scrape short for the others nor cancels it.
+    """
+
+    async def compute() -> str:
+        return (await _scrape(url, platform)).model_dump_json()
+
+    flight = asyncio.ensure_future(SCRAPE_RESULTS.run(canonical_url(url), compute))
+    _DETACHED_FLIGHTS.add(flight)
+    flight.add_done_callback(_forget_flight)
+    try:
+        async with asyncio.timeout(caller_deadline.remaining_ms() / 1000 if caller_deadline is not None else None):
+            raw, cached = await asyncio.shield(flight)
+    except TimeoutError as exc:
+        raise HTTPException(status_code=504, detail=f"Deadline exceeded ({caller_deadline.source})") from exc
+    return JobOfferData.model_validate_json(raw), cached
+
+
+_DETACHED_FLIGHTS: set[asyncio.Future] = set()
+
+
+def _forget_flight(flight: asyncio.Future) -> None:
+    _DETACHED_FLIGHTS.discard(flight)
+    if not flight.cancelled():
+        flight.exception()  # already raised to the caller, if it was still waiting
+
+
+async def _scrape(url: str, platform: str, caller_deadline: Deadline | None = None) -> JobOfferData:
+    """Render ``url`` and extract it within the caller's and the platform's time budget.
+
+    A browser slot is taken first; queue time counts against the caller's
+    deadline only, the platform budget starts once the slot is held.
+    """
+    if caller_deadline is not None and caller_deadline.expired:
+        raise HTTPException(status_code=504, detail=f"Deadline exceeded ({caller_deadline.source}) before scraping started.")
+    async with BROWSER_SLOTS.slot(timeout_s=caller_deadline.remaining_ms() / 1000 if caller_deadline is not None else None):
+        return await _scrape_in_slot(url, PARSER_REGISTRY[platform], caller_deadline)
+
+
+async def _scrape_in_slot(url: str, parser: BaseParser, caller_deadline: Deadline | None) -> JobOfferData:
+    """Scrape ``url`` while holding a browser slot.
+
+    Scraper errors are mapped to HTTP errors; every wait of the parser is
+    bounded by the earliest of the two deadlines (see ``core.deadline``).
+    """
+    platform = parser.platform
+    budget_ms = LATENCY.timeout_ms(platform)
+    platform_deadline = Deadline.after_ms(budget_ms, f"{platform} timeout of {budget_ms} ms")
+    deadline = earliest(caller_deadline, platform_deadline)
+    if deadline.expired:
+        raise HTTPException(status_code=504, detail=f"Deadline exceeded ({deadline.source}) while waiting for a browser slot.")
+
+    storage_state = await STORAGE_STATES.get(platform, parser.cookie_domain) if STORAGE_STATES is not None else None
+    profile = "reused" if storage_state is not None else "blank"
+    session = BrowserSession(BROWSER_CONFIG, SHARED_BROWSER, storage_state)
+    outcome = "error"
+    started = time.perf_counter()
+    try:
+        with deadline_scope(deadline):
+            async with asyncio.timeout(deadline.remaining_ms() / 1000 + DEADLINE_GRACE_S):
+                async with session as page:
+                    payload = await parser.parse(page, url, archive=PAGE_ARCHIVE)
+                    if STORAGE_STATES is not None and storage_state is None:
+                        await _capture_storage_state(parser, page)
+        outcome = "ok"
+    except UnsupportedPlatformError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except (DeadlineExceeded, NetworkError, TimeoutError) as exc:
+        outcome = "timeout"
+        if deadline is platform_deadline and deadline.expired:
+            # Censored sample: the scrape took at least the whole budget.
+            LATENCY.record(platform, budget_ms)
+        detail = str(exc) if not isinstance(exc, TimeoutError) else f"Deadline exceeded ({deadline.source})"
+        raise HTTPException(status_code=504, detail=detail) from exc
+    except ParsingError as exc:
+        outcome = "parsing_error"
+        if storage_state is not None:
+            # The saved profile may now land on a wall or an interstitial: start blank next time.
+            STORAGE_STATES.invalidate(platform)
+            STORAGE_STATE_EVENTS.labels(platform, "invalidated").inc()
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    except Exception as exc:  # pragma: no cover - safety net for unexpected issues
+        logger.exception("Unexpected error while scraping %s", url)
+        raise HTTPException(status_code=502, detail="Unexpected error while scraping the offer.") from exc
+    finally:
+        elapsed_s = time.perf_counter() - started
+        SCRAPES.labels(platform, profile, outcome).inc()
+        if outcome in ("ok", "parsing_error"):
+            LATENCY.record(platform, elapsed_s * 1000)
+            PAGE_LOAD_SECONDS.labels(platform, profile).observe(elapsed_s)
+            PAGE_REQUESTS.labels(platform, profile).observe(session.requests)
+
+    return JobOfferData(**payload)
+
 
-    async with BrowserSession(BROWSER_CONFIG) as page:
+async def _capture_storage_state(parser: BaseParser, page: Page) -> None:
+    try:
+        if await STORAGE_STATES.capture(parser.platform, page.context, parser.cookie_domain):
+            STORAGE_STATE_EVENTS.labels(parser.platform, "captured").inc()
+    except Exception:  # noqa: BLE001 - a missing profile must never fail a scrape
+        logger.exception("Failed to capture %s storage state", parser.platform)
+
+
+@app.post("/refresh/offers", response_model=RefreshOffersResponse)
+async def refresh_offers(request: RefreshOffersRequest):
+    """Re-check tracked offers with cheap HTTP probes; re-extract only changed ones."""
+    store = _require_fingerprints()
+    targets = [(str(url), canonical_url(str(url))) for url in request.urls]
+    known = await run_in_threadpool(store.get_many, [canonical for _, canonical in targets])
+
+    probe_slots = asyncio.Semaphore(REFRESH_PROBE_CONCURRENCY)
+    scrape_slots = asyncio.Semaphore(REFRESH_SCRAPE_CONCURRENCY)
+    headers = {"User-Agent": BROWSER_CONFIG.user_agent or DEFAULT_USER_AGENT, "Accept-Language": "fr-FR,fr;q=0.9"}
+
+    async def refresh_one(url: str, canonical: str) -> RefreshedOffer:
         try:
-            payload = await parser.parse(page, url)
+            platform = detect_platform(url)
         except UnsupportedPlatformError as exc:
-            raise HTTPException(status_code=400, detail=str(exc)) from exc
-        except NetworkError as exc:
-            raise HTTPException(status_code=504, detail=str(exc)) from exc
-        except ParsingError as exc:
-            raise HTTPException(status_code=422, detail=str(exc)) from exc
-        except Exception as exc:  # pragma: no cover - safety net for unexpected issues
-            logger.exception("Unexpected error while scraping %s", url)
-            raise HTTPException(status_code=502, detail="Unexpected error while scraping the offer.") from exc
+            return RefreshedOffer(url=url, canonical_url=canonical, status=ERROR, detail=str(exc))
 
-    return JobOfferData(**payload)
+        previous = known.get(canonical)
+        async with probe_slots:
+            result = await probe(client, url, PARSER_REGISTRY[platform], previous)
+        fingerprint = await run_in_threadpool(store.record, canonical, platform, result, previous)
+        refreshed = RefreshedOffer(
+            url=url,
+            canonical_url=canonical,
+            status=result.status,
+            needs_reanalysis=fingerprint.needs_reanalysis,
+            detail=result.detail,
+        )
+        if result.status == CHANGED and request.reextract:
+            try:
+                async with scrape_slots:
+                    refreshed.offer = await _scrape(url, platform)
+            except HTTPException as exc:
+                refreshed.detail = f"Re-extraction failed: {exc.detail}"
+            except AdmissionRejected as exc:
+                refreshed.detail = f"Re-extraction skipped: {exc}"
+            except Exception:  # pragma: no cover - one offer must not fail the whole refresh
+                logger.exception("Unexpected error while re-extracting %s", url)
+                refreshed.detail = "Re-extraction failed."
+        return refreshed
+
+    async with httpx.AsyncClient(
+        headers=headers,
+        timeout=REFRESH_PROBE_TIMEOUT_MS / 1000,
+        follow_redirects=True,
+    ) as client:
+        results = await asyncio.gather(*(refresh_one(url, canonical) for url, canonical in targets))
+
+    return RefreshOffersResponse(results=results, counts=dict(Counter(result.status for result in results)))
+
+
+@app.post("/refresh/acknowledge", response_model=AcknowledgeOffersResponse)
+def acknowledge_offers(request: AcknowledgeOffersRequest):
+    """Clear the re-analysis flag of offers the caller has re-analysed."""
+    acknowledged = _require_fingerprints().acknowledge([canonical_url(str(url)) for url in request.urls])
+    return AcknowledgeOffersResponse(acknowledged=acknowledged)
+
+
+@app.post("/index/offers", response_model=IndexOffersResponse)
+def index_offers(request: IndexOffersRequest):
+    index = _require_index()
+    indexed = index.add((item.id, item.offer) for item in request.offers)
+    return IndexOffersResponse(indexed=indexed, size=len(index))
+
+
+@app.post("/index/search", response_model=IndexSearchResponse)
+def search_index(request: IndexSearchRequest):
+    hits = _require_index().search(request.query, request.k)
+    return IndexSearchResponse(results=[IndexSearchHit(**vars(hit)) for hit in hits])
+
+
+@app.get("/index/offers/{offer_id:path}/similar", response_model=IndexSearchResponse)
+def similar_offers(offer_id: str, k: int = 10):
+    hits = _require_index().similar(offer_id, max(1, min(k, 100)))
+    if hits is None:
+        raise HTTPException(status_code=404, detail=f"Offer {offer_id} is not indexed.")
+    return IndexSearchResponse(results=[IndexSearchHit(**vars(hit)) for hit in hits])
+
+
+def _require_fingerprints() -> FingerprintStore:
+    if FINGERPRINT_STORE is None:
+        raise HTTPException(status_code=503, detail="Offer refresh disabled: set SCRAPER_FINGERPRINT_DB.")
+    return FINGERPRINT_STORE
+
+
+def _require_index() -> OfferIndex:
+    if OFFER_INDEX is None:
+        raise HTTPException(status_code=503, detail="Offer index disabled: set SCRAPER_INDEX_DIR.")
+    return OFFER_INDEX
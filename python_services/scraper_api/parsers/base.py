@@ -1,38 +1,85 @@
 """Base helpers for platform-specific parsers."""
 from __future__ import annotations
 
+import asyncio
+import logging
 import re
 from abc import ABC, abstractmethod
-from typing import Iterable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Iterable
 
-from bs4 import BeautifulSoup
 from playwright.async_api import (
     Page,
     TimeoutError as PlaywrightTimeoutError,
     Error as PlaywrightError,
 )
 
+from ..core.deadline import budget_ms
 from ..core.exceptions import NetworkError, ParsingError
 
+if TYPE_CHECKING:
+    from ..core.page_archive import PageArchive, PageSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EmbeddedState:
+    """Offer fields read from the raw (unrendered) HTML, used by refresh probes."""
+
+    fields: dict[str, Any] = field(default_factory=dict)
+    closed: bool = False
+
 
 class BaseParser(ABC):
     """Abstract parser handling the common loading flow."""
 
     platform: str
     page_timeout_ms: int = 25_000
+    # Expression passed to ``page.evaluate`` to read embedded state; its result
+    # is archived with the HTML so ``extract_snapshot`` can replay it.
+    state_script: str | None = None
+    # Cookie banner "accept" buttons, clicked when shown so the storage state
+    # captured from the context (see ``core.storage_state``) remembers consent.
+    consent_selectors: tuple[str, ...] = ()
+    # Domain whose cookies decide when a stored profile has expired.
+    cookie_domain: str | None = None
 
-    async def parse(self, page: Page, url: str) -> dict[str, str | None]:  # noqa: D401
+    async def parse(self, page: Page, url: str, *, archive: PageArchive | None = None) -> dict[str, str | None]:  # noqa: D401
         """Load the page and return a dict containing the scraped fields."""
         await self._load(page, url)
-        data = await self._extract(page, url)
+        try:
+            data = await self._extract(page, url)
+        finally:
+            if archive is not None:
+                await self._archive(page, url, archive)
+        self._validate(data)
+        return data
+
+    async def extract_snapshot(self, snapshot: PageSnapshot, url: str) -> dict[str, str | None]:
+        """Run the extraction logic on an archived page, without browser or network."""
+        from ..core.page_archive import SnapshotPage  # lxml is only needed for archived pages
+
+        data = await self._extract(SnapshotPage(snapshot), url)
         self._validate(data)
         return data
 
+    async def _archive(self, page: Page, url: str, archive: PageArchive) -> None:
+        from ..core.page_archive import PageSnapshot
+
+        try:
+            state = await page.evaluate(self.state_script) if self.state_script else None
+            snapshot = PageSnapshot(html=await page.content(), state=state)
+            await asyncio.to_thread(archive.put, url, self.platform, snapshot)
+        except Exception:  # noqa: BLE001 - archiving must never fail a scrape
+            logger.exception("Failed to archive page %s", url)
+
     async def _load(self, page: Page, url: str) -> None:
         try:
-            await page.goto(url, wait_until="domcontentloaded")
+            await page.goto(url, wait_until="domcontentloaded", timeout=budget_ms())
+            await self._dismiss_consent(page)
             try:
-                await page.wait_for_load_state("networkidle", timeout=5_000)
+                await page.wait_for_load_state("networkidle", timeout=budget_ms(5_000))
             except PlaywrightTimeoutError:
                 # Network idle is best-effort; continue with parsed DOM even if some assets are pending.
                 pass
@@ -41,14 +88,26 @@ class BaseParser(ABC):
         except PlaywrightError as exc:  # pragma: no cover - browser-specific crashes
             raise NetworkError(f"Échec du chargement de la page : {exc}") from exc
 
+    async def _dismiss_consent(self, page: Page) -> None:
+        for selector in self.consent_selectors:
+            button = page.locator(selector).first
+            try:
+                if await button.count() and await button.is_visible():
+                    await button.click(timeout=budget_ms(2_000))
+                    return
+            except PlaywrightError:
+                # Consent is best-effort; a banner left open only costs the profile capture.
+                continue
+
+    def embedded_state(self, html: str) -> EmbeddedState | None:  # noqa: ARG002
+        """Return the offer state embedded in ``html``, or None if the platform has none."""
+        return None
+
     @abstractmethod
     async def _extract(self, page: Page, url: str) -> dict[str, str | None]:
         """Extract the relevant information from the DOM."""
 
     def _validate(self, data: dict[str, str | None]) -> None:
-        import logging
-        logger = logging.getLogger(__name__)
-
         missing = [field for field in ("title", "company", "description") if not self._has_text(data.get(field))]
         if missing:
             logger.warning(
@@ -77,6 +136,8 @@ class BaseParser(ABC):
     def _html_to_text(html: str | None) -> str | None:
         if not html:
             return None
+        from bs4 import BeautifulSoup  # imported on first use: keeps service startup lean
+
         soup = BeautifulSoup(html, "lxml")
         text = soup.get_text(separator="\n")
         return text.strip() if text else None
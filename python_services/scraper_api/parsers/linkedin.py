@@ -1,20 +1,64 @@
 """LinkedIn job offer parser."""
 from __future__ import annotations
 
-from typing import Iterable
+import json
+import re
+from datetime import datetime, timezone
+from typing import Any, Iterable
 
 from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
 
-from .base import BaseParser
+from ..core.deadline import budget_ms
+from .base import BaseParser, EmbeddedState
+
+JSON_LD_RE = re.compile(r'<script[^>]+type="application/ld\+json"[^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE)
+CLOSED_MARKERS = (
+    "No longer accepting applications",
+    "N’accepte plus de candidatures",
+    "N'accepte plus de candidatures",
+    'class="closed-job',
+)
 
 
 class LinkedinParser(BaseParser):
     """Parser for LinkedIn job pages."""
 
     platform = "linkedin"
+    state_script = "() => window.__PRELOADED_STATE__?.jobPostings ?? null"
+    consent_selectors = ('button[action-type="ACCEPT"]', "button[data-control-name='ga-cookie.consent.accept.v4']")
+    cookie_domain = "linkedin.com"
+
+    def embedded_state(self, html: str) -> EmbeddedState | None:
+        closed = any(marker in html for marker in CLOSED_MARKERS)
+        posting = self._job_posting_ld(html)
+        if posting is None:
+            return EmbeddedState(closed=True) if closed else None
+
+        organization = posting.get("hiringOrganization") or {}
+        fields = {
+            "title": posting.get("title"),
+            "description": posting.get("description"),
+            "company": organization.get("name") if isinstance(organization, dict) else None,
+            "location": posting.get("jobLocation"),
+            "employment_type": posting.get("employmentType"),
+            "valid_through": posting.get("validThrough"),
+        }
+        return EmbeddedState(fields=fields, closed=closed or _expired(posting.get("validThrough")))
+
+    @staticmethod
+    def _job_posting_ld(html: str) -> dict[str, Any] | None:
+        for block in JSON_LD_RE.findall(html):
+            try:
+                data = json.loads(block)
+            except json.JSONDecodeError:
+                continue
+            for item in data if isinstance(data, list) else [data]:
+                if isinstance(item, dict) and item.get("@type") == "JobPosting":
+                    return item
+        return None
 
     async def _extract(self, page: Page, url: str) -> dict[str, str | None]:  # noqa: ARG002
-        await page.wait_for_timeout(800)
+        await page.wait_for_timeout(budget_ms(800))
         job_from_state = await self._extract_from_state(page)
 
         title = self._first_non_empty(
@@ -72,33 +116,19 @@ class LinkedinParser(BaseParser):
         }
 
     async def _extract_from_state(self, page: Page) -> dict[str, str | None] | None:
-        payload = await page.evaluate(
-            """
-            () => {
-                const state = window.__PRELOADED_STATE__;
-                if (!state || !state.jobPostings) {
-                    return null;
-                }
-                const ids = Object.keys(state.jobPostings);
-                if (!ids.length) {
-                    return null;
-                }
-                const job = state.jobPostings[ids[0]];
-                if (!job) {
-                    return null;
-                }
-                const description = job.description?.text || job.description?.rawText || null;
-                return {
-                    title: job.title || null,
-                    company: job.companyName || job.formattedCompanyName || null,
-                    location: job.formattedLocation || job.formattedLocationName || null,
-                    description,
-                };
-            }
-            """
-        )
-        if not payload:
+        postings = await page.evaluate(self.state_script)
+        if not isinstance(postings, dict) or not postings:
+            return None
+        job = next(iter(postings.values()))
+        if not isinstance(job, dict):
             return None
+        description = job.get("description") or {}
+        payload = {
+            "title": job.get("title"),
+            "company": job.get("companyName") or job.get("formattedCompanyName"),
+            "location": job.get("formattedLocation") or job.get("formattedLocationName"),
+            "description": (description.get("text") or description.get("rawText")) if isinstance(description, dict) else None,
+        }
         return {key: value for key, value in payload.items() if value}
 
     async def _first_selector_text(self, page: Page, selectors: Iterable[str]) -> str | None:
@@ -107,7 +137,7 @@ class LinkedinParser(BaseParser):
             try:
                 if await locator.count() == 0:
                     continue
-                value = await locator.first.inner_text(timeout=1_000)
+                value = await locator.first.inner_text(timeout=budget_ms(1_000))
             except PlaywrightTimeoutError:
                 continue
             if value and value.strip():
@@ -120,9 +150,21 @@ class LinkedinParser(BaseParser):
             try:
                 if await locator.count() == 0:
                     continue
-                value = await locator.first.inner_html(timeout=1_000)
+                value = await locator.first.inner_html(timeout=budget_ms(1_000))
             except PlaywrightTimeoutError:
                 continue
             if value and value.strip():
                 return value
         return None
+
+
+def _expired(valid_through: Any) -> bool:
+    if not isinstance(valid_through, str):
+        return False
+    try:
+        deadline = datetime.fromisoformat(valid_through.replace("Z", "+00:00"))
+    except ValueError:
+        return False
+    if deadline.tzinfo is None:
+        deadline = deadline.replace(tzinfo=timezone.utc)
+    return deadline < datetime.now(timezone.utc)
@@ -8,21 +8,62 @@ from typing import Iterable
 
 from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
 
-from .base import BaseParser
+from ..core.deadline import budget_ms
+from .base import BaseParser, EmbeddedState
 
 logger = logging.getLogger(__name__)
 
+INITIAL_DATA_RE = re.compile(r'window\.__INITIAL_DATA__\s*=\s*"((?:[^"\\]|\\.)*)"\s*(?:;|$)', re.MULTILINE)
+CLOSED_STATUSES = {"archived", "closed", "unpublished"}
+STATE_FIELDS = (
+    "name",
+    "description",
+    "profile",
+    "recruitment_process",
+    "contract_type_names",
+    "experience_level_minimum_name",
+    "remote_name",
+    "salary_min",
+    "salary_max",
+    "salary_currency",
+    "salary_period",
+)
+
 
 class WttjParser(BaseParser):
     """Parser for Welcome to the Jungle job pages."""
 
     platform = "wttj"
+    consent_selectors = ("#axeptio_btn_acceptAll", "button[data-testid='cookie-banner-accept']")
+    cookie_domain = "welcometothejungle.com"
+
+    def embedded_state(self, html: str) -> EmbeddedState | None:
+        match = INITIAL_DATA_RE.search(html)
+        if not match:
+            return None
+        try:
+            data = json.loads(json.loads(f'"{match.group(1)}"'))
+        except json.JSONDecodeError:
+            return None
+
+        for query in data.get("queries", []) if isinstance(data, dict) else []:
+            job_data = query.get("state", {}).get("data", {})
+            if not isinstance(job_data, dict) or not job_data.get("name"):
+                continue
+            fields = {key: job_data.get(key) for key in STATE_FIELDS}
+            organization = job_data.get("organization") or {}
+            office = job_data.get("office") or {}
+            fields["company"] = organization.get("name") if isinstance(organization, dict) else None
+            fields["office"] = [office.get("city"), office.get("country_code")] if isinstance(office, dict) else None
+            closed = str(job_data.get("status") or "").lower() in CLOSED_STATUSES or bool(job_data.get("archived_at"))
+            return EmbeddedState(fields=fields, closed=closed)
+        return None
 
     async def _extract(self, page: Page, url: str) -> dict[str, str | None]:  # noqa: ARG002
         # Wait for the job description content to be rendered
         # WTTJ is a SPA, so we need to wait for React to render the content
         try:
-            await page.wait_for_selector("[data-testid='job-section-description']", timeout=10_000)
+            await page.wait_for_selector("[data-testid='job-section-description']", timeout=budget_ms(10_000))
             logger.debug("WTTJ job description section found")
         except (TimeoutError, PlaywrightTimeoutError) as exc:
             logger.warning("WTTJ job description section not found after 10s, continuing anyway...")
@@ -99,7 +140,7 @@ class WttjParser(BaseParser):
 
         # Try to extract __INITIAL_DATA__ from script tag (new WTTJ format)
         # Match the entire line: window.__INITIAL_DATA__ = "..." up to the closing quote
-        initial_data_match = re.search(r'window\.__INITIAL_DATA__\s*=\s*"((?:[^"\\]|\\.)*)"\s*(?:;|$)', html_content, re.MULTILINE)
+        initial_data_match = INITIAL_DATA_RE.search(html_content)
         if initial_data_match:
             try:
                 # The data is JSON-stringified: it's a JSON string containing another JSON string
@@ -274,7 +315,7 @@ class WttjParser(BaseParser):
             try:
                 if await locator.count() == 0:
                     continue
-                value = await locator.first.inner_text(timeout=1_000)
+                value = await locator.first.inner_text(timeout=budget_ms(1_000))
             except PlaywrightTimeoutError:
                 continue
             if not value:
@@ -293,7 +334,7 @@ class WttjParser(BaseParser):
             try:
                 if await locator.count() == 0:
                     continue
-                value = await locator.first.inner_html(timeout=1_000)
+                value = await locator.first.inner_html(timeout=budget_ms(1_000))
             except PlaywrightTimeoutError:
                 continue
             if value and value.strip():
@@ -0,0 +1,100 @@
+"""Re-run the current parsers over the page archive, without browser or network.
+
+Usage (from ``python_services/``)::
+
+    python -m scraper_api.reextract --archive /var/lib/scraper/archive --output offers.jsonl
+
+Only the latest capture of each URL is re-extracted unless ``--all-captures``
+is given. Pages are processed in batches across ``--workers`` processes
+(default: one per CPU core). Each output line is
+``{"url", "platform", "digest", "ok", "offer" | "error"}``; a summary with
+the throughput is printed at the end.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any
+
+from .core.page_archive import PageArchive
+from .parsers import LinkedinParser, WttjParser
+from .schemas import JobOfferData
+
+PARSERS = {parser.platform: parser for parser in (LinkedinParser(), WttjParser())}
+
+
+def extract_batch(directory: str, batch: list[tuple[str, str, str]]) -> list[dict[str, Any]]:
+    """Re-extract ``(url, platform, digest)`` items; runs inside a worker process."""
+
+    archive = PageArchive(directory)
+    return asyncio.run(_extract_all(archive, batch))
+
+
+async def _extract_all(archive: PageArchive, batch: list[tuple[str, str, str]]) -> list[dict[str, Any]]:
+    results = []
+    for url, platform, digest in batch:
+        result: dict[str, Any] = {"url": url, "platform": platform, "digest": digest, "ok": False}
+        try:
+            data = await PARSERS[platform].extract_snapshot(archive.get(digest), url)
+            result.update(ok=True, offer=JobOfferData(**data).model_dump())
+        except Exception as exc:  # noqa: BLE001 - one bad snapshot must not abort the run
+            result["error"] = f"{type(exc).__name__}: {exc}"
+        results.append(result)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--archive", default=os.getenv("SCRAPER_ARCHIVE_DIR"), help="Archive directory (default: SCRAPER_ARCHIVE_DIR).")
+    parser.add_argument("--platform", choices=sorted(PARSERS), help="Only re-extract pages of this platform.")
+    parser.add_argument("--all-captures", action="store_true", help="Re-extract every capture, not only the latest per URL.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--output", help="JSONL file for the results (default: stdout).")
+    args = parser.parse_args()
+    if not args.archive:
+        parser.error("--archive or SCRAPER_ARCHIVE_DIR is required")
+
+    archive = PageArchive(args.archive)
+    items = [
+        (entry.url, entry.platform, entry.digest)
+        for entry in archive.entries(latest_only=not args.all_captures, platform=args.platform)
+        if entry.platform in PARSERS
+    ]
+    batches = [items[start : start + args.batch_size] for start in range(0, len(items), args.batch_size)]
+
+    outcomes: Counter[str] = Counter()
+    started = time.perf_counter()
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            futures = [pool.submit(extract_batch, args.archive, batch) for batch in batches]
+            for future in as_completed(futures):
+                for result in future.result():
+                    outcomes["ok" if result["ok"] else "failed"] += 1
+                    output.write(json.dumps(result, ensure_ascii=False) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - started
+    pages = sum(outcomes.values())
+    summary = {
+        "pages": pages,
+        "ok": outcomes["ok"],
+        "failed": outcomes["failed"],
+        "workers": args.workers,
+        "elapsed_s": round(elapsed, 2),
+        "pages_per_minute": round(pages / elapsed * 60) if elapsed else 0,
+    }
+    print(json.dumps(summary), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 """Pydantic schemas used by the scraper API."""
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl
 
 
 class ScrapeRequest(BaseModel):
@@ -16,3 +16,82 @@ class JobOfferData(BaseModel):
     location: str | None = None
     description: str
     platform: str
+
+
+class IndexedOffer(BaseModel):
+    """Offer to add to the similarity index under a caller-chosen id."""
+
+    id: str
+    offer: JobOfferData
+
+
+class IndexOffersRequest(BaseModel):
+    """Batch of offers appended to the similarity index."""
+
+    offers: list[IndexedOffer] = Field(default_factory=list, max_length=10_000)
+
+
+class IndexOffersResponse(BaseModel):
+    """Result of an indexing call."""
+
+    indexed: int
+    size: int
+
+
+class IndexSearchRequest(BaseModel):
+    """Free-text query against the similarity index."""
+
+    query: str = Field(min_length=1)
+    k: int = Field(default=10, ge=1, le=100)
+
+
+class IndexSearchHit(BaseModel):
+    """Indexed offer returned by a search."""
+
+    id: str
+    score: float
+    title: str | None = None
+    company: str | None = None
+
+
+class IndexSearchResponse(BaseModel):
+    """Search results, most similar first."""
+
+    results: list[IndexSearchHit]
+
+
+class RefreshOffersRequest(BaseModel):
+    """Tracked offers to re-check for changes."""
+
+    urls: list[HttpUrl] = Field(default_factory=list, max_length=10_000)
+    reextract: bool = True
+
+
+class RefreshedOffer(BaseModel):
+    """Refresh outcome of one offer."""
+
+    url: str
+    canonical_url: str
+    status: str
+    needs_reanalysis: bool = False
+    offer: JobOfferData | None = None
+    detail: str | None = None
+
+
+class RefreshOffersResponse(BaseModel):
+    """Per-offer refresh results and a count per status."""
+
+    results: list[RefreshedOffer]
+    counts: dict[str, int]
+
+
+class AcknowledgeOffersRequest(BaseModel):
+    """Offers whose re-analysis is done."""
+
+    urls: list[HttpUrl] = Field(default_factory=list, max_length=10_000)
+
+
+class AcknowledgeOffersResponse(BaseModel):
+    """Number of fingerprints whose re-analysis flag was cleared."""
+
+    acknowledged: int
@@ -0,0 +1 @@
+"""Helpers shared by the Agent API and the Scraper API."""
@@ -0,0 +1,215 @@
+"""Admission control: a bounded number of requests in flight and a short wait queue.
+
+A request first takes a free slot. When all slots are busy it waits in a
+queue of at most ``queue_size`` requests for up to ``queue_timeout_s``.
+Beyond that it is shed straight away instead of piling up work the process
+cannot finish: ``429`` when the queue is full, ``503`` when the wait timed
+out, both with a ``Retry-After`` header.
+
+``saturated`` is what the readiness probes report: every slot is busy and
+the queue is at least half full, so the load balancer routes elsewhere
+before requests start being rejected.
+
+With several workers per host, ``shared`` adds a host-wide limit (see
+``shared.coordination.SharedSemaphore``) on top of the per-worker one; a
+request that gets a local slot but no host slot within its wait is shed with
+``503``.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from prometheus_client import Counter, Gauge, Histogram
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+if TYPE_CHECKING:
+    from .coordination import SharedSemaphore
+
+QUEUE_WAIT = Histogram(
+    "admission_queue_wait_seconds",
+    "Time admitted requests spent waiting for a slot.",
+    ["pool"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10),
+)
+REJECTIONS = Counter(
+    "admission_rejections_total",
+    "Requests shed by admission control.",
+    ["pool", "reason"],
+)
+IN_FLIGHT = Gauge("admission_in_flight", "Requests holding a slot.", ["pool"])
+QUEUED = Gauge("admission_queued", "Requests waiting for a slot.", ["pool"])
+
+
+class AdmissionRejected(Exception):
+    """No slot could be granted; carries the HTTP status and ``Retry-After``."""
+
+    def __init__(self, pool: str, reason: str, status_code: int, retry_after_s: int):
+        super().__init__(f"{pool} saturated ({reason}), retry in {retry_after_s}s")
+        self.pool = pool
+        self.reason = reason
+        self.status_code = status_code
+        self.retry_after_s = retry_after_s
+
+
+class AdmissionController:
+    """Semaphore of ``limit`` slots fronted by a queue of ``queue_size`` waiters."""
+
+    def __init__(
+        self,
+        pool: str,
+        limit: int,
+        queue_size: int,
+        queue_timeout_s: float,
+        shared: SharedSemaphore | None = None,
+    ):
+        self.pool = pool
+        self.shared = shared
+        self.limit = max(1, limit)
+        self.queue_size = max(0, queue_size)
+        self.queue_timeout_s = queue_timeout_s
+        self.in_flight = 0
+        self.waiting = 0
+        self.host_waiting = 0
+        self._semaphore = asyncio.Semaphore(self.limit)
+
+    @property
+    def retry_after_s(self) -> int:
+        return max(1, math.ceil(self.queue_timeout_s))
+
+    @property
+    def saturated(self) -> bool:
+        if self.shared is not None and self.host_waiting and self.shared.held() >= self.shared.limit:
+            return True
+        return self.in_flight >= self.limit and self.waiting >= max(1, self.queue_size // 2)
+
+    def status(self) -> dict[str, object]:
+        status: dict[str, object] = {
+            "pool": self.pool,
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": self.waiting,
+            "queue_size": self.queue_size,
+            "saturated": self.saturated,
+        }
+        if self.shared is not None:
+            status.update(host_limit=self.shared.limit, host_in_flight=self.shared.held())
+        return status
+
+    async def acquire(self, timeout_s: float | None = None) -> str | None:
+        """Take a slot, waiting at most ``timeout_s`` (default: the queue timeout).
+
+        Returns the host lease token to hand back to ``release``.
+        """
+
+        started = time.perf_counter()
+        timeout_s = self.queue_timeout_s if timeout_s is None else min(timeout_s, self.queue_timeout_s)
+        await self._acquire_local(timeout_s)
+        if self.shared is None:
+            return None
+        self.host_waiting += 1
+        try:
+            token = await self.shared.acquire(max(0.0, timeout_s - (time.perf_counter() - started)))
+        except BaseException:
+            self._release_local()
+            raise
+        finally:
+            self.host_waiting -= 1
+        if token is None:
+            self._release_local()
+            self._reject("host_saturated", 503)
+        return token
+
+    async def _acquire_local(self, timeout_s: float) -> None:
+        if self._semaphore.locked():
+            if self.waiting >= self.queue_size:
+                self._reject("queue_full", 429)
+            self.waiting += 1
+            QUEUED.labels(self.pool).inc()
+            started = time.perf_counter()
+            try:
+                async with asyncio.timeout(timeout_s):
+                    await self._semaphore.acquire()
+            except TimeoutError:
+                self._reject("queue_timeout", 503)
+            finally:
+                self.waiting -= 1
+                QUEUED.labels(self.pool).dec()
+            QUEUE_WAIT.labels(self.pool).observe(time.perf_counter() - started)
+        else:
+            await self._semaphore.acquire()
+            QUEUE_WAIT.labels(self.pool).observe(0)
+        self.in_flight += 1
+        IN_FLIGHT.labels(self.pool).inc()
+
+    async def release(self, token: str | None = None) -> None:
+        try:
+            if token is not None:
+                await self.shared.release(token)
+        finally:
+            # An unreleased host lease expires on its own; a local slot would not.
+            self._release_local()
+
+    def _release_local(self) -> None:
+        self.in_flight -= 1
+        IN_FLIGHT.labels(self.pool).dec()
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(self, timeout_s: float | None = None) -> AsyncIterator[None]:
+        token = await self.acquire(timeout_s)
+        try:
+            yield
+        finally:
+            await self.release(token)
+
+    def _reject(self, reason: str, status_code: int) -> None:
+        REJECTIONS.labels(self.pool, reason).inc()
+        raise AdmissionRejected(self.pool, reason, status_code, self.retry_after_s)
+
+
+class AdmissionMiddleware:
+    """Hold a slot of ``controller`` for the whole response of matching requests.
+
+    ``path_prefix`` is one prefix or a tuple of them, so a service can
+    restrict the limit to its expensive routes. Implemented at the ASGI level so streamed responses keep their slot until
+    the last chunk is sent.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController, path_prefix: str | tuple[str, ...] = "/"):
+        self.app = app
+        self.controller = controller
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+        try:
+            token = await self.controller.acquire()
+        except AdmissionRejected as exc:
+            await rejection_response(exc)(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await self.controller.release(token)
+
+
+def rejection_response(exc: AdmissionRejected) -> JSONResponse:
+    return JSONResponse(
+        {"detail": str(exc)},
+        status_code=exc.status_code,
+        headers={"Retry-After": str(exc.retry_after_s)},
+    )
+
+
+async def admission_rejected_handler(_request: Request, exc: AdmissionRejected) -> JSONResponse:
+    """FastAPI exception handler for rejections raised inside endpoints."""
+
+    return rejection_response(exc)
@@ -0,0 +1,581 @@
+"""State shared by the uvicorn workers of one host, in a SQLite (WAL) file.
+
+Three building blocks, all keyed in one database file:
+
+- ``SharedSemaphore``: host-wide slots (browser, LLM). A slot is a lease row
+  tagged with the worker's pid and process start time; leases of dead or
+  restarted workers, or past their TTL, are reclaimed, so a crashed worker
+  cannot leak capacity. Waiters take a ticket and are served in arrival order
+  whichever worker they are on.
+- ``SharedCache``: JSON results with a TTL, trimmed to ``max_entries``.
+- ``SingleFlight``: one worker computes a missing key while the others (and
+  concurrent callers of the same worker) wait for its result in the cache.
+  If the owner dies or fails, its claim expires or is released and a waiter
+  takes over.
+
+Checks are plain reads, which WAL serves without blocking writers; the write
+lock is only taken to grant, queue or release. Async callers run every
+statement in a thread. A released slot is handed to the next ticket by
+ringing its worker (``_Doorbell``) rather than by having waiters poll.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+import os
+import secrets
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+POLL_INITIAL_S = 0.01
+POLL_MAX_S = 0.05
+# Waiters still re-check this often when rung, in case a ring was lost.
+WAKE_POLL_S = 0.5
+# Minimum time between two liveness sweeps of a pool by one worker.
+SWEEP_INTERVAL_S = 1.0
+PRUNE_EVERY = 200
+
+SCHEMA_VERSION = 2
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS leases (
+        token TEXT PRIMARY KEY,
+        pool TEXT NOT NULL,
+        pid INTEGER NOT NULL,
+        started INTEGER NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS leases_pool ON leases (pool, expires_at)",
+    """
+    CREATE TABLE IF NOT EXISTS waiters (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ticket TEXT UNIQUE NOT NULL,
+        pool TEXT NOT NULL,
+        pid INTEGER NOT NULL,
+        started INTEGER NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS waiters_pool ON waiters (pool, id)",
+    """
+    CREATE TABLE IF NOT EXISTS cache (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS cache_expiry ON cache (expires_at)",
+    """
+    CREATE TABLE IF NOT EXISTS flights (
+        key TEXT PRIMARY KEY,
+        token TEXT NOT NULL,
+        pid INTEGER NOT NULL,
+        started INTEGER NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+)
+
+
+class SharedStore:
+    """SQLite database in WAL mode with one connection per thread."""
+
+    def __init__(self, path: str | os.PathLike[str]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self.doorbell = _Doorbell(self.path)
+        with self.transaction() as db:
+            if db.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                # Leases, tickets and claims are transient: drop the old layout.
+                for table in ("leases", "waiters", "flights"):
+                    db.execute(f"DROP TABLE IF EXISTS {table}")
+            for statement in SCHEMA:
+                db.execute(statement)
+            db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def connection(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def transaction(self) -> "_Transaction":
+        return _Transaction(self.connection())
+
+
+class _Transaction:
+    """``BEGIN IMMEDIATE`` ... ``COMMIT``: takes the write lock up front."""
+
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.db.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+class _Doorbell:
+    """Per-worker datagram socket that other workers ring with a waiter's ticket.
+
+    Bound in the Linux abstract namespace under a name derived from the
+    database path, so nothing is left on disk when a worker dies. Where that
+    is unavailable ``bound`` is False and waiters fall back to polling.
+    """
+
+    def __init__(self, path: Path):
+        self.name = "job-hunt-" + hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:16]
+        self._lock = threading.Lock()
+        self._pid = 0
+        self._socket: socket.socket | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._waiters: dict[str, asyncio.Event] = {}
+
+    @property
+    def bound(self) -> bool:
+        return self._bind() is not None
+
+    def expect(self, ticket: str) -> asyncio.Event:
+        """Event set when ``ticket`` is rung; call from the event loop."""
+
+        loop = asyncio.get_running_loop()
+        sock = self._bind()
+        if sock is not None and self._loop is not loop:
+            loop.add_reader(sock.fileno(), self._drain)
+            self._loop = loop
+        event = self._waiters[ticket] = asyncio.Event()
+        return event
+
+    def forget(self, ticket: str) -> None:
+        self._waiters.pop(ticket, None)
+
+    def ring(self, pid: int, ticket: str) -> None:
+        if pid == os.getpid():
+            event = self._waiters.get(ticket)
+            if event is not None:
+                event.set()
+            return
+        sock = self._bind()
+        if sock is not None:
+            with contextlib.suppress(OSError):  # worker gone or its buffer full: it polls anyway
+                sock.sendto(ticket.encode("ascii"), self._address(pid))
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                ticket = self._socket.recv(64).decode("ascii")
+            except (OSError, AttributeError, UnicodeDecodeError):
+                return
+            event = self._waiters.get(ticket)
+            if event is not None:
+                event.set()
+
+    def _bind(self) -> socket.socket | None:
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid, self._socket, self._loop = os.getpid(), None, None
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+                try:
+                    sock.bind(self._address(self._pid))
+                    sock.setblocking(False)
+                    self._socket = sock
+                except OSError:
+                    sock.close()
+            return self._socket
+
+    def _address(self, pid: int) -> str:
+        return f"\0{self.name}-{pid}"
+
+
+class SharedSemaphore:
+    """At most ``limit`` leases of ``pool`` across every worker of the host."""
+
+    def __init__(self, store: SharedStore, pool: str, limit: int, lease_s: float = 300.0):
+        self.store = store
+        self.pool = pool
+        self.limit = max(1, limit)
+        self.lease_s = lease_s
+        self._swept_at = 0.0
+
+    def try_acquire(self) -> str | None:
+        """Return a lease token, or None when no slot is free for a newcomer."""
+
+        return self._attempt(None, enqueue_for_s=None)[0]
+
+    async def acquire(self, timeout_s: float) -> str | None:
+        """Wait in line for a slot for up to ``timeout_s``; None if none freed up."""
+
+        deadline = time.monotonic() + timeout_s
+        doorbell = self.store.doorbell
+        poll_s = WAKE_POLL_S if doorbell.bound else POLL_MAX_S
+        ticket = secrets.token_hex(8)
+        rung = doorbell.expect(ticket)
+        queued = False
+        try:
+            while True:
+                rung.clear()
+                token, queued = await asyncio.to_thread(self._attempt, ticket, timeout_s + WAKE_POLL_S)
+                remaining = deadline - time.monotonic()
+                if token is not None or remaining <= 0:
+                    return token
+                with contextlib.suppress(TimeoutError):
+                    async with asyncio.timeout(min(remaining, poll_s)):
+                        await rung.wait()
+        finally:
+            doorbell.forget(ticket)
+            if queued:
+                for pid, head in await asyncio.to_thread(self._leave, ticket):
+                    doorbell.ring(pid, head)
+
+    async def release(self, token: str) -> None:
+        for pid, ticket in await asyncio.to_thread(self._release, token):
+            self.store.doorbell.ring(pid, ticket)
+
+    def held(self) -> int:
+        rows = self.store.connection().execute(
+            "SELECT pid, started FROM leases WHERE pool = ? AND expires_at >= ?", (self.pool, time.time())
+        ).fetchall()
+        return sum(1 for pid, started in rows if _alive(pid, started))
+
+    def _attempt(self, ticket: str | None, enqueue_for_s: float | None) -> tuple[str | None, bool]:
+        """One try: ``(lease token, ticket still queued)``.
+
+        The write lock is only taken when the read says a slot is ours, to
+        queue the ticket the first time, or for the periodic liveness sweep.
+        """
+
+        free, ahead, queued = self._position(self.store.connection(), ticket)
+        enqueue = ticket is not None and not queued and enqueue_for_s is not None
+        if ahead < free or enqueue:
+            token, queued = self._grant(ticket, enqueue_for_s if enqueue else None)
+            if token is not None:
+                return token, False
+        if time.monotonic() - self._swept_at >= SWEEP_INTERVAL_S:
+            self._swept_at = time.monotonic()
+            if self._sweep():
+                token, queued = self._grant(ticket, None)
+                if token is not None:
+                    return token, False
+        return None, queued
+
+    def _position(self, db: sqlite3.Connection, ticket: str | None) -> tuple[int, int, bool]:
+        """``(free slots, live tickets ahead of ticket, ticket queued)``."""
+
+        now = time.time()
+        held, ahead, queued = db.execute(
+            """
+            SELECT
+                (SELECT COUNT(*) FROM leases WHERE pool = :pool AND expires_at >= :now),
+                (SELECT COUNT(*) FROM waiters WHERE pool = :pool AND expires_at >= :now AND id < COALESCE(
+                    (SELECT id FROM waiters WHERE ticket = :ticket AND expires_at >= :now), 1 << 62)),
+                (SELECT COUNT(*) FROM waiters WHERE ticket = :ticket AND expires_at >= :now)
+            """,
+            {"pool": self.pool, "now": now, "ticket": ticket},
+        ).fetchone()
+        return self.limit - held, ahead, bool(queued)
+
+    def _grant(self, ticket: str | None, enqueue_for_s: float | None) -> tuple[str | None, bool]:
+        """Under the write lock: queue ``ticket`` if asked, then lease a slot if it is its turn.
+
+        Queueing and checking in one transaction means a release either sees
+        the ticket (and rings it) or happened before the check.
+        """
+
+        with self.store.transaction() as db:
+            if enqueue_for_s is not None:
+                db.execute(
+                    "INSERT OR REPLACE INTO waiters (ticket, pool, pid, started, expires_at) VALUES (?, ?, ?, ?, ?)",
+                    (ticket, self.pool, os.getpid(), _process_tag(), time.time() + enqueue_for_s),
+                )
+            free, ahead, queued = self._position(db, ticket)
+            if ahead >= free:
+                return None, queued
+            token = secrets.token_hex(8)
+            db.execute(
+                "INSERT INTO leases VALUES (?, ?, ?, ?, ?)",
+                (token, self.pool, os.getpid(), _process_tag(), time.time() + self.lease_s),
+            )
+            if ticket is not None:
+                db.execute("DELETE FROM waiters WHERE ticket = ?", (ticket,))
+            return token, False
+
+    def _release(self, token: str) -> list[tuple[int, str]]:
+        """Drop the lease; return the ``(pid, ticket)`` now first in line."""
+
+        with self.store.transaction() as db:
+            db.execute("DELETE FROM leases WHERE token = ?", (token,))
+            return self._next_in_line(db)
+
+    def _leave(self, ticket: str) -> list[tuple[int, str]]:
+        """Give up ``ticket``; return the ``(pid, ticket)`` now first in line."""
+
+        with self.store.transaction() as db:
+            db.execute("DELETE FROM waiters WHERE ticket = ?", (ticket,))
+            return self._next_in_line(db)
+
+    def _next_in_line(self, db: sqlite3.Connection) -> list[tuple[int, str]]:
+        free, _, _ = self._position(db, None)
+        if free <= 0:
+            return []
+        return db.execute(
+            "SELECT pid, ticket FROM waiters WHERE pool = ? AND expires_at >= ? ORDER BY id LIMIT ?",
+            (self.pool, time.time(), free),
+        ).fetchall()
+
+    def _sweep(self) -> bool:
+        """Delete expired leases and tickets, and those of dead workers; True if any."""
+
+        now = time.time()
+        with self.store.transaction() as db:
+            removed = 0
+            for table, key in (("leases", "token"), ("waiters", "ticket")):
+                rows = db.execute(
+                    f"SELECT {key}, pid, started, expires_at FROM {table} WHERE pool = ?", (self.pool,)
+                ).fetchall()
+                stale = [(row[0],) for row in rows if row[3] < now or not _alive(row[1], row[2])]
+                db.executemany(f"DELETE FROM {table} WHERE {key} = ?", stale)
+                removed += len(stale)
+        return removed > 0
+
+
+class SharedCache:
+    """JSON values with a TTL under a key namespace."""
+
+    def __init__(self, store: SharedStore, namespace: str, ttl_s: float, max_entries: int = 10_000):
+        self.store = store
+        self.namespace = namespace
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._puts = 0
+
+    def get(self, key: str) -> str | None:
+        row = self.store.connection().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at >= ?", (self.qualified(key), time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, value: str) -> None:
+        with self.store.transaction() as db:
+            self.write(db, key, value)
+        self.written()
+
+    def write(self, db: sqlite3.Connection, key: str, value: str) -> None:
+        """Store ``value`` inside a transaction already open; call ``written`` after it commits."""
+
+        db.execute(
+            "INSERT OR REPLACE INTO cache VALUES (?, ?, ?)",
+            (self.qualified(key), value, time.time() + self.ttl_s),
+        )
+
+    def written(self) -> None:
+        self._puts += 1
+        if self._puts % PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self) -> None:
+        """Drop expired entries, then the soonest-expiring beyond ``max_entries``."""
+
+        with self.store.transaction() as db:
+            db.execute("DELETE FROM cache WHERE expires_at < ?", (time.time(),))
+            db.execute(
+                """
+                DELETE FROM cache WHERE key IN (
+                    SELECT key FROM cache WHERE key LIKE ? ORDER BY expires_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (f"{self.namespace}:%", self.max_entries),
+            )
+
+    def qualified(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+
+class SingleFlight:
+    """Compute each missing cache key once across workers and concurrent callers."""
+
+    def __init__(self, cache: SharedCache, lease_s: float = 120.0):
+        self.cache = cache
+        self.lease_s = lease_s
+        self._pending: dict[str, asyncio.Future[str]] = {}
+        self._pending_lock = threading.Lock()
+        self._pending_events: dict[str, threading.Event] = {}
+
+    async def run(self, key: str, compute: Callable[[], Awaitable[str]]) -> tuple[str, bool]:
+        """Return ``(value, from_cache)``; ``compute`` runs only in the winning caller."""
+
+        value = await asyncio.to_thread(self.cache.get, key)
+        if value is not None:
+            return value, True
+
+        while (pending := self._pending.get(key)) is not None:
+            try:
+                return await asyncio.shield(pending), True
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The caller computing the value was cancelled: take over.
+
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value, cached = await self._run_shared(key, compute)
+            future.set_result(value)
+            return value, cached
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # waiters re-raise it; do not warn when there are none
+            raise
+        finally:
+            del self._pending[key]
+
+    def run_sync(self, key: str, compute: Callable[[], str]) -> tuple[str, bool]:
+        """Blocking variant of ``run`` for code already running in a worker thread."""
+
+        value = self.cache.get(key)
+        if value is not None:
+            return value, True
+        with self._pending_lock:
+            event = self._pending_events.get(key)
+            owner = event is None
+            if owner:
+                event = self._pending_events[key] = threading.Event()
+        if not owner:
+            event.wait(self.lease_s)
+            value = self.cache.get(key)
+            if value is not None:
+                return value, True
+        try:
+            delay = POLL_INITIAL_S
+            while True:
+                token = self._claim(key)
+                if token is not None:
+                    try:
+                        value = compute()
+                    except BaseException:
+                        self._settle(key, token, None)
+                        raise
+                    self._settle(key, token, value)
+                    return value, False
+                time.sleep(delay)
+                delay = min(delay * 2, POLL_MAX_S)
+                value = self.cache.get(key)
+                if value is not None:
+                    return value, True
+        finally:
+            if owner:
+                with self._pending_lock:
+                    self._pending_events.pop(key).set()
+
+    async def _run_shared(self, key: str, compute: Callable[[], Awaitable[str]]) -> tuple[str, bool]:
+        delay = POLL_INITIAL_S
+        while True:
+            token = await asyncio.to_thread(self._claim, key)
+            if token is not None:
+                try:
+                    value = await compute()
+                except BaseException:
+                    await asyncio.to_thread(self._settle, key, token, None)
+                    raise
+                await asyncio.to_thread(self._settle, key, token, value)
+                return value, False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, POLL_MAX_S)
+            value = await asyncio.to_thread(self.cache.get, key)
+            if value is not None:
+                return value, True
+
+    def _claim(self, key: str) -> str | None:
+        flight_key = self.cache.qualified(key)
+        row = self.cache.store.connection().execute(
+            "SELECT pid, started, expires_at FROM flights WHERE key = ?", (flight_key,)
+        ).fetchone()
+        if row is not None and row[2] >= time.time() and _alive(row[0], row[1]):
+            return None
+        with self.cache.store.transaction() as db:
+            row = db.execute("SELECT pid, started, expires_at FROM flights WHERE key = ?", (flight_key,)).fetchone()
+            now = time.time()
+            if row is not None and row[2] >= now and _alive(row[0], row[1]):
+                return None
+            token = secrets.token_hex(8)
+            db.execute(
+                "INSERT OR REPLACE INTO flights VALUES (?, ?, ?, ?, ?)",
+                (flight_key, token, os.getpid(), _process_tag(), now + self.lease_s),
+            )
+            return token
+
+    def _settle(self, key: str, token: str, value: str | None) -> None:
+        """Store ``value`` (if any) and drop the claim in one transaction.
+
+        Never raises: the caller already has its value or its error, and an
+        unreleased claim only delays the other workers until it expires.
+        """
+
+        try:
+            with self.cache.store.transaction() as db:
+                if value is not None:
+                    self.cache.write(db, key, value)
+                db.execute("DELETE FROM flights WHERE key = ? AND token = ?", (self.cache.qualified(key), token))
+            if value is not None:
+                self.cache.written()
+        except sqlite3.Error:
+            logger.warning("Could not settle shared flight %s", self.cache.qualified(key), exc_info=True)
+
+
+_PROCESS_TAG: tuple[int, int] = (0, 0)
+
+
+def _process_tag() -> int:
+    """Start time of this process (Linux), or a random tag elsewhere.
+
+    Stored next to the pid so that a worker restarted with the same pid (as
+    after a container restart) does not mistake its predecessor's leases for
+    its own.
+    """
+
+    global _PROCESS_TAG
+    pid = os.getpid()
+    if _PROCESS_TAG[0] != pid:
+        _PROCESS_TAG = (pid, _start_time(pid) or -secrets.randbits(31))
+    return _PROCESS_TAG[1]
+
+
+def _start_time(pid: int) -> int | None:
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as stat:
+            # Field 22 (starttime), counted after the parenthesised command name.
+            return int(stat.read().rsplit(b")", 1)[1].split()[19])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _alive(pid: int, started: int) -> bool:
+    if pid == os.getpid():
+        return started == _process_tag()
+    current = _start_time(pid)
+    if current is not None:
+        return current == started
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,34 @@
+"""Tolerant parsing of numeric settings read from the environment.
+
+A bad value is logged and replaced by its default instead of raising at
+import time, which would take the whole service down.
+"""
+from __future__ import annotations
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def parse_int(value: str | None, fallback: int, minimum: int = 1) -> int:
+    try:
+        parsed = int(value) if value else fallback
+    except (TypeError, ValueError):
+        logger.warning("Ignoring invalid integer %r, using %s", value, fallback)
+        return fallback
+    if parsed < minimum:
+        logger.warning("Ignoring %s (below %s), using %s", parsed, minimum, fallback)
+        return fallback
+    return parsed
+
+
+def parse_float(value: str | None, fallback: float, minimum: float = 0.0) -> float:
+    try:
+        parsed = float(value) if value else fallback
+    except (TypeError, ValueError):
+        logger.warning("Ignoring invalid number %r, using %s", value, fallback)
+        return fallback
+    if not parsed >= minimum:
+        logger.warning("Ignoring %s (below %s), using %s", parsed, minimum, fallback)
+        return fallback
+    return parsed
@@ -0,0 +1,160 @@
+"""Opt-in per-request profiling with pyinstrument, saved as speedscope files.
+
+A request is profiled when it carries ``X-Profile: <admin token>`` or is
+drawn by the sampling rate. pyinstrument samples the request's task every
+millisecond in async mode, so time spent awaiting (LLM calls, page loads)
+shows up as ``[await]`` frames next to CPU time. The profile is written as a
+speedscope JSON file (open it in https://www.speedscope.app) and its id is
+returned in the ``X-Profile-Id`` response header; the debug router lists and
+serves the files to holders of the admin token. Only the event-loop thread
+is sampled: work handed to the threadpool appears as the await on it.
+
+pyinstrument is an optional dev dependency: ``profiling_available`` checks
+at startup that it is installed, and the services skip the middleware with a
+warning when it is not, instead of failing the first profiled request.
+Requests that are not profiled only pay for one header lookup, and nothing
+at all when profiling is not configured since the middleware is not added.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import random
+import re
+import secrets
+import time
+from pathlib import Path
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_SUFFIX = ".speedscope.json"
+SAMPLING_INTERVAL_S = 0.001
+
+_SLUG_RE = re.compile(r"[^A-Za-z0-9]+")
+_PROFILE_ID_RE = re.compile(r"^[\w.-]+$")
+
+
+def profiling_available() -> bool:
+    """True when pyinstrument is installed; logs a warning otherwise."""
+
+    if importlib.util.find_spec("pyinstrument") is not None:
+        return True
+    logger.warning("Profiling is configured but pyinstrument is not installed (requirements-dev.txt): disabled")
+    return False
+
+
+class ProfileStore:
+    """Directory of speedscope files, pruned to the ``max_files`` most recent."""
+
+    def __init__(self, directory: str | Path, max_files: int = 50):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_files = max_files
+
+    def new_id(self, method: str, path: str) -> str:
+        slug = _SLUG_RE.sub("-", path).strip("-")[:60] or "root"
+        return f"{time.strftime('%Y%m%dT%H%M%S')}-{method.lower()}-{slug}-{secrets.token_hex(3)}"
+
+    def save(self, profile_id: str, content: str) -> None:
+        (self.directory / f"{profile_id}{PROFILE_SUFFIX}").write_text(content, encoding="utf-8")
+        profiles = sorted(self.directory.glob(f"*{PROFILE_SUFFIX}"), key=lambda path: path.stat().st_mtime)
+        for stale in profiles[: max(0, len(profiles) - self.max_files)]:
+            stale.unlink(missing_ok=True)
+
+    def list(self) -> list[dict[str, object]]:
+        profiles = sorted(self.directory.glob(f"*{PROFILE_SUFFIX}"), key=lambda path: path.stat().st_mtime, reverse=True)
+        return [{"id": path.name[: -len(PROFILE_SUFFIX)], "bytes": path.stat().st_size} for path in profiles]
+
+    def path(self, profile_id: str) -> Path | None:
+        if not _PROFILE_ID_RE.match(profile_id):
+            return None
+        path = self.directory / f"{profile_id}{PROFILE_SUFFIX}"
+        return path if path.is_file() else None
+
+
+class ProfilingMiddleware:
+    """Profile the requests selected by the admin header or the sampling rate."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: ProfileStore,
+        admin_token: str | None = None,
+        sample_rate: float = 0.0,
+        path_prefix: str = "/",
+    ):
+        self.app = app
+        self.store = store
+        self.admin_token = admin_token
+        self.sample_rate = sample_rate
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._selected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        from pyinstrument import Profiler  # optional dependency, checked by ``profiling_available``
+        from pyinstrument.renderers import SpeedscopeRenderer
+
+        profile_id = self.store.new_id(scope["method"], scope["path"])
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile-Id"] = profile_id
+            await send(message)
+
+        profiler = Profiler(interval=SAMPLING_INTERVAL_S, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profiler.stop()
+            try:
+                content = profiler.output(SpeedscopeRenderer())
+                await asyncio.to_thread(self.store.save, profile_id, content)
+                logger.info("Saved profile %s (%.0f ms)", profile_id, profiler.last_session.duration * 1000)
+            except Exception:  # noqa: BLE001 - profiling must never fail the request
+                logger.exception("Failed to save profile %s", profile_id)
+
+    def _selected(self, scope: Scope) -> bool:
+        path = scope["path"]
+        if not path.startswith(self.path_prefix) or path.startswith("/debug/"):
+            return False
+        if self.admin_token:
+            requested = Headers(scope=scope).get(PROFILE_HEADER)
+            if requested is not None and secrets.compare_digest(requested, self.admin_token):
+                return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+
+def profiles_router(store: ProfileStore, admin_token: str | None) -> APIRouter:
+    """``GET /debug/profiles`` and ``GET /debug/profiles/{id}``, for the admin token only."""
+
+    router = APIRouter(prefix="/debug/profiles", tags=["debug"])
+
+    def authorize(token: str | None) -> None:
+        if not admin_token or token is None or not secrets.compare_digest(token, admin_token):
+            raise HTTPException(status_code=403, detail="Admin token required (X-Profile header).")
+
+    @router.get("")
+    def list_profiles(x_profile: str | None = Header(default=None)):
+        authorize(x_profile)
+        return {"profiles": store.list()}
+
+    @router.get("/{profile_id}")
+    def get_profile(profile_id: str, x_profile: str | None = Header(default=None)):
+        authorize(x_profile)
+        path = store.path(profile_id)
+        if path is None:
+            raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found.")
+        return FileResponse(path, media_type="application/json", filename=path.name)
+
+    return router
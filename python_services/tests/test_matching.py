@@ -0,0 +1,23 @@
+import numpy as np
+
+from agent_api.core.matching import OfferText, _columns, score_offers
+
+
+def test_columns_maps_ids_to_vocabulary_positions():
+    vocabulary = np.array([42, -7, 2**62, 0], dtype=np.int64)
+    ids = np.array([0, 5, 42, 2**62, -7, -8], dtype=np.int64)
+    assert _columns(vocabulary, ids).tolist() == [3, -1, 0, 2, 1, -1]
+
+
+def test_offers_sharing_cv_terms_and_skills_rank_first():
+    cv = "Développeur Python, Django et PostgreSQL, API REST et tests automatisés."
+    offers = [
+        OfferText(id=1, text="Commercial terrain, prospection et négociation."),
+        OfferText(id=2, text="Développeur Python / Django, PostgreSQL, API REST."),
+        OfferText(id=3, text="Développeur Java, Spring Boot et Kafka."),
+    ]
+    results = score_offers(cv, offers)
+    assert [result.id for result in results][0] == 2
+    best = results[0]
+    assert best.matched_skills == ["Python", "Django", "PostgreSQL"]
+    assert best.missing_skills == []
@@ -0,0 +1,57 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from scraper_api.core.page_archive import PageSnapshot, SnapshotPage
+from scraper_api.parsers.wttj import WttjParser
+
+FIXTURE = Path(__file__).parent / "fixtures" / "wttj_offer.html"
+URL = "https://www.welcometothejungle.com/fr/companies/acme/jobs/developpeur-rails"
+
+
+def _inner_text(html: str, selector: str) -> str:
+    return asyncio.run(SnapshotPage(PageSnapshot(html)).locator(selector).first.inner_text())
+
+
+def test_inner_text_follows_rendered_text():
+    html = """
+    <div id="offer">
+      <h1>Développeur <b>Rails</b> <span>senior</span><script>track()</script></h1>
+      <p>Premier   paragraphe avec <a href="#">un lien</a>.</p><p>Second<br>ligne</p>
+      <ul><li>Un</li><li>Deux <i>points</i></li></ul><style>.a {}</style><noscript>JS</noscript>
+      <span>Paris</span>, <span>France</span><template>caché</template>
+    </div>
+    """
+    assert _inner_text(html, "#offer") == (
+        "Développeur Rails senior\n\nPremier paragraphe avec un lien.\n\nSecond\nligne\n\nUn\nDeux points\nParis, France"
+    )
+
+
+def test_archived_fixture_gives_the_live_fields():
+    data = asyncio.run(WttjParser().extract_snapshot(PageSnapshot(FIXTURE.read_text(encoding="utf-8")), URL))
+    assert data["title"] == "Développeur Ruby on Rails senior"
+    assert data["company"] == "Acme SAS"
+    assert data["location"] == "Paris, Télétravail partiel"
+
+
+def test_archived_fixture_matches_the_live_parser():
+    playwright_api = pytest.importorskip("playwright.async_api")
+    html = FIXTURE.read_text(encoding="utf-8")
+
+    async def live() -> dict:
+        async with playwright_api.async_playwright() as playwright:
+            try:
+                browser = await playwright.chromium.launch()
+            except playwright_api.Error as exc:
+                pytest.skip(f"Chromium unavailable: {exc}")
+            try:
+                page = await browser.new_page()
+                await page.set_content(html)
+                return await WttjParser()._extract(page, URL)
+            finally:
+                await browser.close()
+
+    live_data = asyncio.run(live())
+    archived = asyncio.run(WttjParser().extract_snapshot(PageSnapshot(html), URL))
+    assert archived == live_data
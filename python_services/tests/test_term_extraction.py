@@ -0,0 +1,44 @@
+import pytest
+
+from agent_api.core.term_extraction import extract_terms, extract_terms_bulk
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Go ahead and apply… Swift processes… ts files",
+        "Rails de sécurité, Phoenix, Spark",
+        "Le node du réseau, spring cleaning, js, remote control",
+    ],
+)
+def test_common_words_are_not_technologies(text):
+    assert extract_terms(text).tech_stack == []
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("Stack : Go, Kubernetes, PostgreSQL", ["Go", "Kubernetes", "PostgreSQL"]),
+        ("Nous utilisons Golang.", ["Go"]),
+        ("Apps iOS en Swift et Kotlin", ["Swift", "Kotlin"]),
+        ("Elixir / Phoenix LiveView", ["Elixir", "Phoenix"]),
+        ("Apache Spark et Airflow", ["Spark", "Airflow"]),
+        ("Ruby on Rails 7, Hotwire et Node.js", ["Ruby on Rails", "Hotwire", "Node.js"]),
+    ],
+)
+def test_qualified_or_surrounded_technologies_are_found(text, expected):
+    assert extract_terms(text).tech_stack == expected
+
+
+def test_case_sensitive_terms_survive_length_changing_lowercase():
+    assert extract_terms("Poste à İstanbul, stack Go et Kubernetes").tech_stack == ["Go", "Kubernetes"]
+
+
+def test_ambiguous_keywords_need_a_qualified_form():
+    assert extract_terms("Performance et Communication, remote ok, mentor").keywords == []
+    assert extract_terms("Full remote, optimisation des performances").keywords == ["Télétravail", "Performance"]
+
+
+def test_bulk_extraction_matches_single_extraction():
+    texts = ["Python et Django", None, "Python et Django", "React Native"]
+    assert extract_terms_bulk(texts) == [extract_terms(text) for text in texts]
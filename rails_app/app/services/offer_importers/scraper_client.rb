@@ -5,14 +5,20 @@ module OfferImporters
   class ScraperClient
     class Error < StandardError; end
 
-    def initialize(base_url: default_base_url, connection: nil)
+    DEFAULT_TIMEOUT_SECONDS = 30
+    # Leaves the scraper time to answer with its own 504 before Faraday gives up.
+    DEADLINE_MARGIN_MS = 500
+
+    def initialize(base_url: default_base_url, connection: nil, timeout: default_timeout)
       @base_url = base_url
       @connection = connection
+      @timeout = timeout
     end
 
     def fetch(url)
       response = connection.post("/scrape/offer") do |req|
         req.headers["Content-Type"] = "application/json"
+        req.headers["X-Request-Timeout-Ms"] = request_deadline_ms.to_s
         req.body = { url: url }.to_json
       end
 
@@ -23,10 +29,11 @@ module OfferImporters
 
     private
 
-    attr_reader :base_url
+    attr_reader :base_url, :timeout
 
     def connection
       @connection ||= Faraday.new(url: base_url) do |faraday|
+        faraday.options.timeout = timeout
         faraday.response :raise_error
         faraday.adapter Faraday.default_adapter
       end
@@ -59,6 +66,14 @@ module OfferImporters
       raise Error, "Réponse illisible du Scraper API"
     end
 
+    def request_deadline_ms
+      [ (timeout * 1000).to_i - DEADLINE_MARGIN_MS, DEADLINE_MARGIN_MS ].max
+    end
+
+    def default_timeout
+      ENV.fetch("SCRAPER_API_TIMEOUT", DEFAULT_TIMEOUT_SECONDS).to_f
+    end
+
     def default_base_url
       ENV.fetch("SCRAPER_API_URL") do
         raise Error, "SCRAPER_API_URL manquant dans la configuration"
@@ -0,0 +1,44 @@
+require "rails_helper"
+
+RSpec.describe OfferImporters::ScraperClient do
+  let(:stubs) { Faraday::Adapter::Test::Stubs.new }
+  let(:connection) do
+    Faraday.new(url: "http://scraper.test") do |faraday|
+      faraday.response :raise_error
+      faraday.adapter :test, stubs
+    end
+  end
+  let(:url) { "https://www.linkedin.com/jobs/view/123" }
+  let(:body) do
+    {
+      "title" => "Senior Ruby Developer",
+      "company" => "ACME",
+      "location" => "Paris",
+      "description" => "Développer des applications Ruby",
+      "platform" => "linkedin"
+    }
+  end
+
+  describe "#fetch" do
+    it "sends the remaining time budget to the scraper" do
+      received_headers = nil
+      stubs.post("/scrape/offer") do |env|
+        received_headers = env.request_headers
+        [ 200, { "Content-Type" => "application/json" }, body.to_json ]
+      end
+
+      result = described_class.new(base_url: "http://scraper.test", connection: connection, timeout: 20).fetch(url)
+
+      expect(result).to include(title: "Senior Ruby Developer", company: "ACME", platform: "linkedin")
+      expect(received_headers["X-Request-Timeout-Ms"]).to eq("19500")
+    end
+
+    it "wraps scraper timeouts" do
+      stubs.post("/scrape/offer") { [ 504, {}, { detail: "Deadline exceeded" }.to_json ] }
+
+      expect {
+        described_class.new(base_url: "http://scraper.test", connection: connection).fetch(url)
+      }.to raise_error(described_class::Error, include("Scraper API indisponible"))
+    end
+  end
+end